@@ -1,9 +1,14 @@
 import streamlit as st
-import plotly.graph_objects as go
 import numpy as np
 import pandas as pd
-import plotly.express as px
 
+from climate_finance.charts import MAP_MAX_POINTS, beta_map
+from climate_finance.portfolio import value_portfolio
+from climate_finance.prefetch import warm_up
+from climate_finance.profiling import page_profiler, show_profile
+
+
+profiler = page_profiler("Introduction")
 
 st.title('Climate Change and Asset Pricing')
 
@@ -52,6 +57,7 @@ st.write("""
          we are going to progressively modify the initial equation to address these limitations, and arrive at a more comprehensive framework for asset pricing under climate risk.
          """)
 
+profiler.section("Probabilistic climate scenarios")
 st.subheader('The Need for Probabilistic Climate Scenarios')
 
 st.write("""Prices reflect **expected discounted cash flows**:""")
@@ -91,17 +97,28 @@ st.write("""We assume 90% probability of the scenario with physical damages and
 
 st.write("""The relative contribution of each source of climate risk to the unconditional price of the asset is given by the following equation:""")
 
-st.latex(r'''
-         \text{Impact Physical Damages} = 0.9 \cdot \frac{100 - 90}{1 + 0.05} = 9.52
+# One asset, two scenarios: physical damages and abatement
+climate_groups = ["Physical Damages", "Abatement"]
+impact_physical, impact_abatement = value_portfolio(
+    probabilities=[0.9, 0.1],
+    discount_factors=[1 / 1.05, 1 / 1.05],
+    cashflows=np.array([[90.0, 90.0]]),
+    baseline=[100.0],
+    groups=climate_groups,
+).impacts[0]
+
+st.latex(rf'''
+         \text{{Impact Physical Damages}} = 0.9 \cdot \frac{{100 - 90}}{{1 + 0.05}} = {impact_physical:.2f}
          ''')
 
-st.latex(r'''
-         \text{Impact Abatement} = 0.1 \cdot \frac{100 - 90}{1 + 0.05} = 0.95
+st.latex(rf'''
+         \text{{Impact Abatement}} = 0.1 \cdot \frac{{100 - 90}}{{1 + 0.05}} = {impact_abatement:.2f}
          ''')
 
 st.write("""Therefore, **most of the impact on the price of the asset comes from the scenario with high physical damages**, 
          which is the scenario with the highest probability. This highlights the importance of considering the probabilities of different scenarios when valuing assets under climate risk.""")
 
+profiler.section("State-dependent discount factor")
 st.subheader("The Need for a State-Dependent Discount Factor")
 
 st.write("""The price today should be **discounted by a state-dependent discount factor**, which reflects the risk associated with the cash flows in each scenario:""")
@@ -138,19 +155,27 @@ st.write(r"""We assume a 50/50 probability of the scenario with physical damages
 
 st.write(r"""The relative contribution of each source of climate risk to the unconditional price of the asset is given by the following equation:""")
 
-st.latex(r'''
-            \text{Impact Physical Damages} = 0.5 \cdot 1.10 \cdot(100 - 90) = 5.50
+impact_physical, impact_abatement = value_portfolio(
+    probabilities=[0.5, 0.5],
+    discount_factors=[1.10, 0.90],
+    cashflows=np.array([[90.0, 90.0]]),
+    baseline=[100.0],
+    groups=climate_groups,
+).impacts[0]
+
+st.latex(rf'''
+            \text{{Impact Physical Damages}} = 0.5 \cdot 1.10 \cdot(100 - 90) = {impact_physical:.2f}
             ''')
 
-st.latex(r'''
-            \text{Impact Abatement} = 0.5 \cdot 0.
-90 \cdot (100 - 90)= 4.50
+st.latex(rf'''
+            \text{{Impact Abatement}} = 0.5 \cdot 0.90 \cdot (100 - 90)= {impact_abatement:.2f}
             ''')
 
 st.write(r"""Therefore, **most of the impact on the price of the asset comes from the scenario with high physical damages**,
          which is the scenario with the highest stochastic discount factor. This highlights the importance of considering the
             stochastic discount factor when valuing assets under climate risk.""")
 
+profiler.section("Spatial finance")
 st.subheader("The Need for Spatial Finance")
 
 st.write("""
@@ -197,20 +222,13 @@ geo_data = pd.DataFrame({
 })
 
 
-fig = px.scatter_mapbox(
-    geo_data,
-    lat="lat",
-    lon="lon",
-    color="Beta Sensitivity",
-    size="Beta Sensitivity",
-    hover_name="City",
-    color_continuous_scale="YlOrRd",
-    size_max=30,
-    zoom=1,
-    height=500
-)
+# Large asset universes are aggregated on a grid that follows the zoom level
+map_zoom = st.slider("Map zoom", 1, 8, 1) if len(geo_data) > MAP_MAX_POINTS else 1
+fig = beta_map(geo_data, zoom=map_zoom)
+
+st.plotly_chart(profiler.figure(fig), use_container_width=True)
 
-fig.update_layout(mapbox_style="carto-positron")
-fig.update_layout(margin={"r":0,"t":0,"l":0,"b":0})
+show_profile(profiler)
 
-st.plotly_chart(fig, use_container_width=True)
\ No newline at end of file
+# The page is on screen; build what the other pages need in the meantime
+warm_up()
@@ -0,0 +1,56 @@
+"""Server time and bytes sent per widget interaction, full vs fragment rerun.
+
+Each widget below lives in an ``st.fragment``, so in the app moving it only
+reruns its fragment. The script drives Streamlit's script runner directly,
+outside a server: it renders the page once, then replays the same
+interaction as a full-page rerun (the behaviour before fragments) and as a
+fragment-scoped rerun, timing the script run and summing the serialized
+size of the ForwardMsgs it emits.
+
+    python benchmarks/fragment_reruns.py
+"""
+
+import os
+import statistics
+import sys
+
+from harness import ROOT, PageSession
+
+# (page, widget label, values to cycle through)
+INTERACTIONS = [
+    ("pages/01_Assigning_Probabilities_to_Climate_Scenarios.py", "Probability of State A", [0.2, 0.4, 0.6, 0.8]),
+    ("pages/01_Assigning_Probabilities_to_Climate_Scenarios.py", "Expected warming by 2100 (°C)", [2.0, 2.5, 3.5, 4.0]),
+    ("pages/02_State-Dependent_Discount_Factor.py", "Consumption growth (Δcₜ₊₁)", [-0.05, -0.01, 0.03, 0.07]),
+    ("pages/02_State-Dependent_Discount_Factor.py", "Choose the asset type:", ["Pays more in bad times", "Pays more in good times"] * 2),
+]
+
+
+def measure(page, label, values):
+    results = {}
+    for fragment in (False, True):
+        session = PageSession(ROOT / page)
+        session.run()
+        timings, sizes = [], []
+        for value in values:
+            seconds, size = session.interact(label, value, fragment)
+            timings.append(seconds)
+            sizes.append(size)
+            if fragment:
+                # A real client keeps its widget tree; only refresh ours.
+                session.widget(label).set_value(value)
+        results["fragment" if fragment else "full"] = (statistics.median(timings), statistics.median(sizes))
+    return results
+
+
+def main():
+    os.chdir(ROOT)
+    sys.path.insert(0, str(ROOT))
+    print(f"{'widget':<32} {'full ms':>9} {'full KB':>9} {'frag ms':>9} {'frag KB':>9}")
+    for page, label, values in INTERACTIONS:
+        results = measure(page, label, values)
+        (full_s, full_b), (frag_s, frag_b) = results["full"], results["fragment"]
+        print(f"{label:<32} {full_s * 1e3:9.1f} {full_b / 1e3:9.1f} {frag_s * 1e3:9.1f} {frag_b / 1e3:9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""Headless page sessions for the benchmarks.
+
+``PageSession`` drives Streamlit's script runner directly, as AppTest
+does, but keeps the fragment storage and script cache between reruns like
+the server, so fragment-scoped reruns can be replayed too. Every rerun
+reports its wall time and the serialized size of the ForwardMsgs it would
+send to the browser.
+
+AppTest cannot replay fragment-scoped reruns, so the harness reaches into
+private attributes of the script runner, the runtime and the element tree.
+streamlit is pinned to a minor version in the ``bench`` dependency group
+of pyproject.toml (``uv sync --group bench``). ``_replace`` raises
+``RuntimeError`` as soon as one of those attributes no longer exists,
+rather than setting a new one nobody reads.
+"""
+
+import time
+from pathlib import Path
+from unittest.mock import MagicMock
+
+from streamlit.runtime import Runtime
+from streamlit.runtime.caching.storage.dummy_cache_storage import MemoryCacheStorageManager
+from streamlit.runtime.fragment import MemoryFragmentStorage
+from streamlit.runtime.media_file_manager import MediaFileManager
+from streamlit.runtime.memory_media_file_storage import MemoryMediaFileStorage
+from streamlit.runtime.pages_manager import PagesManager
+from streamlit.runtime.scriptrunner import RerunData
+from streamlit.runtime.scriptrunner.script_cache import ScriptCache
+from streamlit.runtime.state.safe_session_state import SafeSessionState
+from streamlit.runtime.state.session_state import SessionState
+from streamlit.testing.v1.element_tree import parse_tree_from_messages
+from streamlit.testing.v1.local_script_runner import LocalScriptRunner, require_widgets_deltas
+from streamlit.testing.v1.util import patch_config_options
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def _replace(obj, name, value):
+    # Assigning a missing attribute would silently create it.
+    if not hasattr(obj, name):
+        raise RuntimeError(
+            f"{type(obj).__name__} has no attribute {name!r}: the benchmark harness does not support "
+            f"this streamlit version, install the bench dependency group of pyproject.toml"
+        )
+    setattr(obj, name, value)
+
+
+class PageSession:
+    """One browser session on one page, rerun as many times as needed."""
+
+    def __init__(self, script_path, timeout=60):
+        self.script_path = str(script_path)
+        self.timeout = timeout
+        self.session_state = SafeSessionState(SessionState(), lambda: None)
+        # Shared across runs, as the server does, so fragment reruns find
+        # the fragments registered by the previous full run.
+        self.fragment_storage = MemoryFragmentStorage()
+        self.script_cache = ScriptCache()
+        self.pages_manager = PagesManager(self.script_path, self.script_cache, setup_watcher=False)
+        self.tree = None
+
+    def run(self, rerun_data=None):
+        """Execute one rerun; returns ``(seconds, bytes sent)``."""
+        runtime = MagicMock(spec=Runtime)
+        runtime.media_file_mgr = MediaFileManager(MemoryMediaFileStorage("/mock/media"))
+        runtime.cache_storage_manager = MemoryCacheStorageManager()
+        _replace(Runtime, "_instance", runtime)
+        try:
+            runner = LocalScriptRunner(self.script_path, self.session_state, self.pages_manager)
+            _replace(runner, "_fragment_storage", self.fragment_storage)
+            _replace(runner, "_script_cache", self.script_cache)
+            with patch_config_options({"global.appTest": True}):
+                start = time.perf_counter()
+                runner.request_rerun(rerun_data or RerunData())
+                runner.start()
+                require_widgets_deltas(runner, self.timeout)
+                elapsed = time.perf_counter() - start
+        finally:
+            Runtime._instance = None
+
+        messages = runner.forward_msgs()
+        if not (rerun_data and rerun_data.is_fragment_scoped_rerun):
+            self.tree = parse_tree_from_messages(messages)
+            # The tree reads unchanged widget values from our session state.
+            _replace(self.tree, "_runner", self)
+            self.messages = list(messages)
+        return elapsed, sum(msg.ByteSize() for msg in messages)
+
+    def widget(self, label):
+        return next(w for w in [*self.tree.slider, *self.tree.radio] if w.label == label)
+
+    def fragment_id(self, label):
+        # Deltas emitted inside a fragment carry its id.
+        for msg in self.messages:
+            if msg.WhichOneof("type") != "delta" or msg.delta.WhichOneof("type") != "new_element":
+                continue
+            element = msg.delta.new_element
+            if getattr(getattr(element, element.WhichOneof("type")), "label", None) == label:
+                return msg.delta.fragment_id
+        raise LookupError(f"no widget labelled {label!r}")
+
+    def interact(self, label, value, fragment):
+        widget = self.widget(label)
+        widget.set_value(value)
+        states = self.tree.get_widget_states()
+        if fragment:
+            return self.run(RerunData(widget_states=states, fragment_id_queue=[self.fragment_id(label)],
+                                      is_fragment_scoped_rerun=True))
+        return self.run(RerunData(widget_states=states))
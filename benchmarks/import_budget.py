@@ -0,0 +1,112 @@
+"""Import time of a cold render of every page against a per-page budget.
+
+A new server process or worker pays for the imports of each page the first
+time it renders it: the page's own import statements, and the modules its
+figures and widgets import inside functions (polars and scipy for the SCC
+figures, pandas and pyarrow behind ``st.dataframe``...). For every page,
+the script renders the page once through the benchmark harness in a fresh
+interpreter under ``python -X importtime``, keeps the fastest of a few
+runs, and prints the time spent per top-level package during the render,
+self time included the way ``-X importtime`` reports it. It exits with
+status 1 if any page is over its budget, so it can gate a container build.
+
+    python benchmarks/import_budget.py [--repeat 3] [--top 8]
+
+streamlit itself and the harness are imported before the render starts,
+as a running server has them already. Imports made by the introduction's
+background warm-up while the page renders are counted: they hold the same
+interpreter.
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+from collections import Counter
+
+from harness import ROOT
+
+# Milliseconds, with headroom over the cold render imports this script
+# measures (Introduction 0.55-0.7 s, page 01 0.45-0.65 s, page 02
+# 0.45-0.55 s; pandas, ~0.2 s on every page, and pyarrow come with
+# st.dataframe and st.table).
+#
+# The introduction's 800 ms deliberately includes polars (~0.1 s), which
+# warm_up() imports in the page's thread. Importing it in a warm-up worker
+# instead would be free here but racy: plotly looks polars up in
+# sys.modules, so any session building a figure while a worker is still
+# importing it fails on the half-initialised module.
+BUDGETS_MS = {
+    "Introduction.py": 800,
+    "pages/01_Assigning_Probabilities_to_Climate_Scenarios.py": 900,
+    "pages/02_State-Dependent_Discount_Factor.py": 600,
+}
+
+# Written to stderr around the render, between the -X importtime lines.
+_START = "import budget: render start"
+_END = "import budget: render end"
+
+
+def render(page):
+    """Render ``page`` once, marking the start and end on stderr; call in a fresh process."""
+    from harness import PageSession
+
+    os.chdir(ROOT)
+    sys.path.insert(0, str(ROOT))
+    session = PageSession(ROOT / page)
+    sys.stderr.write(f"{_START}\n")
+    session.run()
+    sys.stderr.write(f"{_END}\n")
+
+
+def import_times(page):
+    """Self time in microseconds per top-level package imported while ``page`` renders."""
+    child = subprocess.run(
+        [sys.executable, "-W", "ignore", "-X", "importtime", __file__, "--render", page],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    output = child.stderr
+    start, end = output.find(_START), output.find(_END)
+    if start < 0 or end < 0:
+        raise RuntimeError(f"{page} did not render:\n{output[-2000:]}")
+    packages = Counter()
+    for line in output[start + len(_START):end].splitlines():
+        # import time: <self us> | <cumulative us> | <indented module name>
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, _, module = line.removeprefix("import time:").split("|")
+        packages[module.strip().split(".")[0]] += int(self_us)
+    return packages
+
+
+def measure(page, repeat):
+    return min((import_times(page) for _ in range(repeat)), key=lambda packages: packages.total())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=3, help="runs per page; the fastest is kept")
+    parser.add_argument("--top", type=int, default=8, help="packages to list per page")
+    parser.add_argument("--render", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.render:
+        render(args.render)
+        return
+
+    over = []
+    for page, budget in BUDGETS_MS.items():
+        packages = measure(page, args.repeat)
+        total = packages.total() / 1e3
+        status = "ok" if total <= budget else "OVER BUDGET"
+        print(f"{page}: {total:.0f} ms (budget {budget} ms) {status}")
+        for package, us in packages.most_common(args.top):
+            print(f"  {package:<24} {us / 1e3:8.1f} ms")
+        if total > budget:
+            over.append(page)
+    if over:
+        sys.exit(f"import budget exceeded: {', '.join(over)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""Cold-start and rerun latency, memory and payload size of every page.
+
+Each page is measured in a fresh interpreter, so the cold start includes
+the page's imports and empty process-wide caches. The first run is the
+cold start; the page is then rerun unchanged (warm) and each of its
+widgets is moved through a few values, both as a full rerun and as the
+fragment-scoped rerun the app actually performs. Times are medians over
+the reruns; sizes are serialized ForwardMsg bytes.
+
+    python benchmarks/page_latency.py [-o results.json] [--compare baseline.json]
+
+Results are written as JSON (by default under ``benchmarks/results/``),
+and ``--compare`` prints the relative change of every metric against a
+previous results file.
+"""
+
+import argparse
+import json
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import streamlit
+
+from harness import ROOT, PageSession
+
+PAGES = [
+    "Introduction.py",
+    "pages/01_Assigning_Probabilities_to_Climate_Scenarios.py",
+    "pages/02_State-Dependent_Discount_Factor.py",
+]
+
+# page -> {name: (widget label, values to cycle through)}
+WIDGETS = {
+    "pages/01_Assigning_Probabilities_to_Climate_Scenarios.py": {
+        "prob_a": ("Probability of State A", [0.2, 0.4, 0.6, 0.8]),
+        "expected_warming": ("Expected warming by 2100 (°C)", [2.0, 2.5, 3.5, 4.0]),
+    },
+    "pages/02_State-Dependent_Discount_Factor.py": {
+        "delta_c": ("Consumption growth (Δcₜ₊₁)", [-0.05, -0.01, 0.03, 0.07]),
+        "scenario": ("Choose the asset type:", ["Pays more in bad times", "Pays more in good times"] * 2),
+    },
+}
+
+WARM_RERUNS = 5
+
+
+def _median(samples):
+    seconds, sizes = zip(*samples)
+    return {"seconds": statistics.median(seconds), "bytes": int(statistics.median(sizes))}
+
+
+def measure_page(page):
+    """Metrics for one page; call in a fresh process."""
+    session = PageSession(ROOT / page)
+    cold_seconds, cold_bytes = session.run()
+    result = {
+        "cold": {"seconds": cold_seconds, "bytes": cold_bytes},
+        "warm": _median([session.run() for _ in range(WARM_RERUNS)]),
+        "interactions": {},
+    }
+    for name, (label, values) in WIDGETS.get(page, {}).items():
+        result["interactions"][name] = {
+            "full": _median([session.interact(label, value, fragment=False) for value in values]),
+            "fragment": _median([session.interact(label, value, fragment=True) for value in values]),
+        }
+    # ru_maxrss is in kilobytes on Linux.
+    result["peak_rss_mb"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    return result
+
+
+def run_suite():
+    pages = {}
+    for page in PAGES:
+        child = subprocess.run(
+            [sys.executable, "-W", "ignore", __file__, "--page", page],
+            cwd=ROOT, capture_output=True, text=True, check=True,
+        )
+        pages[page] = json.loads(child.stdout)
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "streamlit": streamlit.__version__,
+        "machine": platform.machine(),
+        "pages": pages,
+    }
+
+
+def _metrics(node, prefix=""):
+    # Flatten nested results into {"page/cold/seconds": value, ...}.
+    for key, value in node.items():
+        if isinstance(value, dict):
+            yield from _metrics(value, f"{prefix}{key}/")
+        elif isinstance(value, (int, float)):
+            yield f"{prefix}{key}", value
+
+
+def compare(baseline, current):
+    before = dict(_metrics(baseline["pages"]))
+    for name, value in _metrics(current["pages"]):
+        if name in before and before[name]:
+            print(f"{name:<90} {before[name]:>12.4g} {value:>12.4g} {value / before[name] - 1:+8.1%}")
+
+
+def report(results):
+    for page, metrics in results["pages"].items():
+        print(page)
+        print(f"  cold {metrics['cold']['seconds'] * 1e3:8.1f} ms {metrics['cold']['bytes'] / 1e3:8.1f} KB"
+              f"   warm {metrics['warm']['seconds'] * 1e3:8.1f} ms   peak RSS {metrics['peak_rss_mb']:.0f} MB")
+        for name, modes in metrics["interactions"].items():
+            print(f"  {name:<18}" + "".join(
+                f" {mode} {modes[mode]['seconds'] * 1e3:7.1f} ms {modes[mode]['bytes'] / 1e3:7.1f} KB"
+                for mode in ("full", "fragment")))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-o", "--output", help="results file (default: benchmarks/results/<timestamp>.json)")
+    parser.add_argument("--compare", metavar="BASELINE", help="previous results file to compare against")
+    parser.add_argument("--page", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    os.chdir(ROOT)
+    sys.path.insert(0, str(ROOT))
+    if args.page:
+        json.dump(measure_page(args.page), sys.stdout)
+        return
+
+    results = run_suite()
+    output = args.output or ROOT / "benchmarks" / "results" / f"{time.strftime('%Y%m%d-%H%M%S')}.json"
+    Path(output).parent.mkdir(parents=True, exist_ok=True)
+    with open(output, "w") as fh:
+        json.dump(results, fh, indent=2)
+    report(results)
+    print(f"\nwrote {output}")
+    if args.compare:
+        with open(args.compare) as fh:
+            compare(json.load(fh), results)
+
+
+if __name__ == "__main__":
+    main()
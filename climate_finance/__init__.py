@@ -0,0 +1 @@
+"""Climate asset-pricing helpers shared by the Streamlit pages."""
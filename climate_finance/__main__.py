@@ -0,0 +1,51 @@
+"""Command-line entry point: ``python -m climate_finance``."""
+
+import argparse
+import sys
+
+import polars as pl
+
+from climate_finance.batch import run_batch
+
+
+def _assignment(text):
+    name, sep, value = text.partition("=")
+    if not sep or not name:
+        raise argparse.ArgumentTypeError(f"expected NAME=VALUE, got {text!r}")
+    return name, float(value)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m climate_finance", description=__doc__)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    price = commands.add_parser(
+        "price",
+        help="price a Parquet/CSV position file",
+        description="Price positions with cf_<scenario> (and r_<scenario>) columns, in streaming batches.",
+    )
+    price.add_argument("source", help="input .parquet or .csv file")
+    price.add_argument("destination", help="output .parquet or .csv file")
+    price.add_argument("-p", "--probability", metavar="SCENARIO=P", type=_assignment, action="append",
+                       required=True, help="scenario probability; repeat for every scenario")
+    price.add_argument("-g", "--growth", metavar="SCENARIO=DC", type=_assignment, action="append",
+                       help="log consumption growth; price with the CRRA discount factor instead of r_<scenario>")
+    price.add_argument("--delta", type=float, default=0.02, help="rate of time preference (default: 0.02)")
+    price.add_argument("--gamma", type=float, default=2.0, help="relative risk aversion (default: 2.0)")
+
+    args = parser.parse_args(argv)
+    try:
+        run_batch(
+            args.source,
+            args.destination,
+            dict(args.probability),
+            growth=dict(args.growth) if args.growth else None,
+            delta=args.delta,
+            gamma=args.gamma,
+        )
+    except (ValueError, OSError, pl.exceptions.PolarsError) as exc:
+        parser.exit(1, f"error: {exc}\n")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
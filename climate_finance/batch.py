@@ -0,0 +1,73 @@
+"""Streaming valuation of position files, outside the Streamlit app.
+
+A position file (Parquet or CSV) has one row per position and, for every
+scenario ``s``, a cashflow column ``cf_<s>``. Positions are priced either
+
+* with scenario discount rates, from columns ``r_<s>``, as on page 01; or
+* with the exact CRRA discount factor of each scenario's consumption
+  growth, as on page 02, which also gives the risk premium.
+
+The query is built lazily and written with polars' streaming engine, so
+files of millions of rows are processed in bounded-memory batches; other
+columns (position ids, portfolios...) are passed through unchanged.
+"""
+
+from pathlib import Path
+
+import polars as pl
+
+from climate_finance.pricing import scenario_price, state_price
+from climate_finance.sdf import crra_sdf
+
+_READERS = {".parquet": pl.scan_parquet, ".pq": pl.scan_parquet, ".csv": pl.scan_csv}
+
+
+def _format(path):
+    suffix = Path(path).suffix.lower()
+    if suffix not in _READERS:
+        raise ValueError(f"{path}: expected a .parquet or .csv file")
+    return suffix
+
+
+def scan_positions(path):
+    """Lazy frame over a Parquet or CSV position file."""
+    return _READERS[_format(path)](path)
+
+
+def price_positions(positions, probabilities, growth=None, delta=0.02, gamma=2.0):
+    """Add pricing columns to a lazy frame of positions.
+
+    ``probabilities`` maps scenario names to probabilities summing to one.
+    Without ``growth``, adds ``expected_cashflow``, ``expected_rate`` and
+    ``price``. With ``growth`` (log consumption growth per scenario), adds
+    ``price``, ``expected_payoff``, ``risk_free``, ``expected_return`` and
+    ``risk_premium``.
+    """
+    scenarios = list(probabilities)
+    weights = [float(probabilities[s]) for s in scenarios]
+    if abs(sum(weights) - 1) > 1e-9:
+        raise ValueError(f"scenario probabilities sum to {sum(weights)}, not 1")
+
+    required = [f"cf_{s}" for s in scenarios] + ([f"r_{s}" for s in scenarios] if growth is None else [])
+    columns = positions.collect_schema().names()
+    missing_columns = [c for c in required if c not in columns]
+    if missing_columns:
+        raise ValueError(f"position file has no columns {missing_columns}")
+
+    cashflows = [pl.col(f"cf_{s}") for s in scenarios]
+    if growth is None:
+        result = scenario_price(weights, cashflows, [pl.col(f"r_{s}") for s in scenarios])
+    else:
+        missing = set(scenarios) - set(growth)
+        if missing:
+            raise ValueError(f"no consumption growth for scenarios {sorted(missing)}")
+        discount_factors = crra_sdf([growth[s] for s in scenarios], delta, gamma).tolist()
+        result = state_price(weights, discount_factors, cashflows)
+    return positions.with_columns(**result._asdict())
+
+
+def run_batch(source, destination, probabilities, growth=None, delta=0.02, gamma=2.0):
+    """Price the positions in ``source`` and stream the result to ``destination``."""
+    sink = "sink_csv" if _format(destination) == ".csv" else "sink_parquet"
+    priced = price_positions(scan_positions(source), probabilities, growth, delta, gamma)
+    getattr(priced, sink)(destination, engine="streaming")
@@ -0,0 +1,288 @@
+"""Streaming covariances and climate betas of large cashflow panels.
+
+For every asset ``i`` the panel holds a series ``y_{t,i}`` (cashflow
+growth, returns...) and the factor ``x_t`` is consumption growth or GDP
+loss. The estimator fits ``y_i = α_i + β_i x + ε_i`` for all assets at once
+from chunks of periods, without ever holding the panel in memory.
+
+Each chunk is reduced to the per-asset centred co-moments
+
+    M_pq = Σ_t (x_t - x̄)^p (y_t - ȳ)^q
+
+and chunks are merged with the pairwise update that generalizes Welford's
+algorithm to any order: both sets of moments are re-centred on the merged
+means by a binomial expansion in the difference of means. It never
+subtracts large raw sums, so it is as accurate as a two-pass computation.
+Missing observations (NaN) are skipped per asset.
+
+The second-order moments give covariances, betas and classical standard
+errors. Moments up to order four give the heteroskedasticity-robust HC0
+and HC1 errors exactly. All of these match
+``statsmodels.OLS(y, add_constant(x)).fit(cov_type=...)``.
+
+Rolling windows keep the moments of each period in a two-stack queue, so
+sliding the window only merges and never subtracts. Memory is
+O(window × assets) whatever the number of periods.
+"""
+
+from math import comb
+from pathlib import Path
+from typing import NamedTuple
+
+import numpy as np
+
+# Centred co-moment orders (p, q) needed for the HC standard errors, and
+# closed under the lower orders the merge update uses. M_10 = M_01 = 0.
+_ORDERS = [(2, 0), (1, 1), (0, 2), (3, 0), (2, 1), (1, 2), (4, 0), (3, 1), (2, 2)]
+_INDEX = {order: k for k, order in enumerate(_ORDERS)}
+
+
+def _merge_terms():
+    # Terms C(p, i) C(q, j) M_{p-i, q-j} s_x^i s_y^j of the merge update:
+    # source rows (row 0 is the count M_00, row k + 1 is _ORDERS[k]),
+    # monomials (i * 3 + j is s_x^i s_y^j), and the matrix summing the
+    # terms into the target orders with their binomial coefficients.
+    terms = []
+    for target, (p, q) in enumerate(_ORDERS):
+        for i in range(p + 1):
+            for j in range(q + 1):
+                source = (p - i, q - j)
+                if sum(source) != 1:
+                    row = 0 if source == (0, 0) else _INDEX[source] + 1
+                    terms.append((target, row, i * 3 + j, comb(p, i) * comb(q, j)))
+    target, source, monomial, coef = (np.array(column) for column in zip(*terms))
+    combine = np.zeros((len(_ORDERS), len(terms)))
+    combine[target, np.arange(len(terms))] = coef
+    return source, monomial, combine
+
+
+_SOURCE, _MONOMIAL, _COMBINE = _merge_terms()
+# Terms on the count only, for periods with no central moments.
+_FROM_COUNT = _SOURCE == 0
+
+COV_TYPES = ("nonrobust", "HC0", "HC1")
+
+
+class Moments(NamedTuple):
+    count: np.ndarray
+    mean_x: np.ndarray
+    mean_y: np.ndarray
+    central: np.ndarray  # (len(_ORDERS), *assets), or None when all zero
+
+
+class ClimateBetas(NamedTuple):
+    count: np.ndarray
+    covariance: np.ndarray
+    variance_x: np.ndarray
+    variance_y: np.ndarray
+    alpha: np.ndarray
+    beta: np.ndarray
+    alpha_se: np.ndarray
+    beta_se: np.ndarray
+    r_squared: np.ndarray
+
+
+class RollingBetas(NamedTuple):
+    period: np.ndarray
+    betas: ClimateBetas
+
+
+def chunk_moments(x, y):
+    """Per-asset co-moments of the factor ``x`` (periods,) and a panel chunk ``y`` (periods, assets)."""
+    y = np.asarray(y, dtype=float)
+    x = np.broadcast_to(np.asarray(x, dtype=float).reshape(-1, *([1] * (y.ndim - 1))), y.shape)
+    valid = np.isfinite(x) & np.isfinite(y)
+    count = valid.sum(axis=0)
+    safe = np.maximum(count, 1)
+    mean_x = np.where(valid, x, 0.0).sum(axis=0) / safe
+    mean_y = np.where(valid, y, 0.0).sum(axis=0) / safe
+    u = np.where(valid, x - mean_x, 0.0)
+    v = np.where(valid, y - mean_y, 0.0)
+    # Every order has p + q >= 2, so missing observations contribute zero.
+    powers_u = [1.0, u, u * u, u * u * u, (u * u) ** 2]
+    powers_v = [1.0, v, v * v]
+    central = np.stack([(powers_u[p] * powers_v[q]).sum(axis=0) for p, q in _ORDERS])
+    return Moments(count, mean_x, mean_y, central)
+
+
+def _shifted(moments, shift_x, shift_y):
+    # Σ (x - x̄_part + s_x)^p (y - ȳ_part + s_y)^q for every order, by
+    # binomial expansion.
+    powers_x = np.ones((5, *shift_x.shape))
+    powers_y = np.ones((3, *shift_y.shape))
+    for k in range(1, 5):
+        powers_x[k] = powers_x[k - 1] * shift_x
+    for k in range(1, 3):
+        powers_y[k] = powers_y[k - 1] * shift_y
+    monomials = (powers_x[:, None] * powers_y[None, :]).reshape(15, *shift_x.shape)
+    if moments.central is None:
+        source, monomial, combine = _SOURCE[_FROM_COUNT], _MONOMIAL[_FROM_COUNT], _COMBINE[:, _FROM_COUNT]
+        rows = moments.count[None].astype(float)
+    else:
+        source, monomial, combine = _SOURCE, _MONOMIAL, _COMBINE
+        rows = np.concatenate([moments.count[None].astype(float), moments.central])
+    terms = (rows[source] * monomials[monomial]).reshape(len(source), -1)
+    return (combine @ terms).reshape(len(_ORDERS), *shift_x.shape)
+
+
+def merge_moments(a, b):
+    """Co-moments of the union of two disjoint sets of periods."""
+    count = a.count + b.count
+    safe = np.maximum(count, 1)
+    delta_x = b.mean_x - a.mean_x
+    delta_y = b.mean_y - a.mean_y
+    # Deviations from the merged mean: x - x̄ = (x - x̄_a) - n_b/n δ for a,
+    # and (x - x̄_b) + n_a/n δ for b.
+    weight_a, weight_b = -b.count / safe, a.count / safe
+    central = (_shifted(a, weight_a * delta_x, weight_a * delta_y)
+               + _shifted(b, weight_b * delta_x, weight_b * delta_y))
+    return Moments(count, a.mean_x + b.count / safe * delta_x, a.mean_y + b.count / safe * delta_y, central)
+
+
+def stream_moments(chunks):
+    """Merged co-moments of an iterable of ``(x, y)`` chunks."""
+    total = None
+    for x, y in chunks:
+        moments = chunk_moments(x, y)
+        total = moments if total is None else merge_moments(total, moments)
+    if total is None:
+        raise ValueError("no chunks to estimate from")
+    return total
+
+
+def estimate(moments, cov_type="nonrobust"):
+    """Covariances, OLS betas and standard errors from co-moments.
+
+    ``cov_type`` is ``"nonrobust"``, ``"HC0"`` or ``"HC1"``, as in
+    statsmodels. Assets with fewer than three observations, or no
+    variation in the factor, get NaN.
+    """
+    if cov_type not in COV_TYPES:
+        raise ValueError(f"cov_type must be one of {COV_TYPES}, got {cov_type!r}")
+    n = moments.count.astype(float)
+    central = np.zeros((len(_ORDERS), *np.shape(n))) if moments.central is None else moments.central
+    m = {order: central[k] for k, order in enumerate(_ORDERS)}
+    with np.errstate(divide="ignore", invalid="ignore"):
+        usable = (n > 2) & (m[2, 0] > 0)
+        sxx, sxy, syy = m[2, 0], m[1, 1], m[0, 2]
+        beta = sxy / sxx
+        alpha = moments.mean_y - beta * moments.mean_x
+        ssr = np.maximum(syy - beta * sxy, 0.0)
+        if cov_type == "nonrobust":
+            sigma2 = ssr / (n - 2)
+            var_beta = sigma2 / sxx
+            var_alpha = sigma2 * (1 / n + moments.mean_x**2 / sxx)
+        else:
+            # Sandwich in the centred parametrization y = c + β (x - x̄),
+            # where X'X is diagonal, then mapped to α = c - β x̄.
+            e2 = ssr
+            e2u = m[1, 2] - 2 * beta * m[2, 1] + beta**2 * m[3, 0]
+            e2u2 = m[2, 2] - 2 * beta * m[3, 1] + beta**2 * m[4, 0]
+            scale = n / (n - 2) if cov_type == "HC1" else 1.0
+            var_c = scale * e2 / n**2
+            var_beta = scale * e2u2 / sxx**2
+            cov_c_beta = scale * e2u / (n * sxx)
+            var_alpha = var_c + moments.mean_x**2 * var_beta - 2 * moments.mean_x * cov_c_beta
+        betas = ClimateBetas(
+            count=moments.count,
+            covariance=sxy / (n - 1),
+            variance_x=sxx / (n - 1),
+            variance_y=syy / (n - 1),
+            alpha=alpha,
+            beta=beta,
+            alpha_se=np.sqrt(var_alpha),
+            beta_se=np.sqrt(var_beta),
+            r_squared=1 - ssr / syy,
+        )
+    return ClimateBetas(*(np.where(usable, field, np.nan) if i else field for i, field in enumerate(betas)))
+
+
+def climate_betas(chunks, cov_type="nonrobust"):
+    """Per-asset covariances and betas on the factor, in one pass over ``(x, y)`` chunks."""
+    return estimate(stream_moments(chunks), cov_type)
+
+
+def _period_moments(x, y):
+    # A single observation per asset has no central moments; ``None`` lets
+    # merge_moments skip their terms.
+    valid = np.isfinite(y) & np.isfinite(x)
+    return Moments(valid.astype(np.int64), np.where(valid, x, 0.0), np.where(valid, y, 0.0), None)
+
+
+def rolling_climate_betas(chunks, window, cov_type="nonrobust", min_periods=None):
+    """Betas over a sliding window of ``window`` periods, one pass over ``(x, y)`` chunks.
+
+    Yields one ``RollingBetas`` per input chunk, for the windows ending in
+    that chunk once at least ``min_periods`` (default ``window``) periods
+    have been seen; ``period`` is the index of the last period of each
+    window.
+    """
+    min_periods = window if min_periods is None else min_periods
+    # Two-stack queue: ``front`` holds suffix aggregates of the oldest
+    # periods (its last entry covers all of them), ``back`` the newest
+    # periods and their running aggregate.
+    front, back, back_total = [], [], None
+    seen = 0
+    for x, y in chunks:
+        y = np.asarray(y, dtype=float)
+        y = y.reshape(len(y), -1) if y.ndim == 1 else y
+        x = np.asarray(x, dtype=float).ravel()
+        periods, results = [], []
+        for t in range(len(y)):
+            period = _period_moments(x[t], y[t])
+            back.append(period)
+            back_total = period if back_total is None else merge_moments(back_total, period)
+            seen += 1
+            if len(front) + len(back) > window:
+                if not front:
+                    # Flip: suffix aggregates of the back stack, newest first.
+                    suffix = None
+                    for moments in reversed(back):
+                        suffix = moments if suffix is None else merge_moments(moments, suffix)
+                        front.append(suffix)
+                    back, back_total = [], None
+                front.pop()
+            if seen >= min_periods:
+                parts = [m for m in (front[-1] if front else None, back_total) if m is not None]
+                total = parts[0] if len(parts) == 1 else merge_moments(*parts)
+                periods.append(seen - 1)
+                results.append(estimate(total, cov_type))
+        if results:
+            yield RollingBetas(np.asarray(periods), ClimateBetas(*(np.stack(f) for f in zip(*results))))
+
+
+def frame_chunks(frame, factor, assets, chunk_rows=10_000):
+    """``(x, y)`` chunks of about ``chunk_rows`` rows from a wide polars frame, one row per period.
+
+    A lazy frame is run with the streaming engine and read batch by batch,
+    with only the ``factor`` and ``assets`` columns, so a scan of a panel
+    larger than memory is never collected whole.
+    """
+    import polars as pl
+
+    columns = [factor, *assets]
+    if isinstance(frame, pl.LazyFrame):
+        chunks = frame.select(columns).collect_batches(chunk_size=chunk_rows)
+    else:
+        chunks = frame.select(columns).iter_slices(chunk_rows)
+    for chunk in chunks:
+        if chunk.height:
+            yield chunk[factor].to_numpy(), chunk.select(assets).to_numpy()
+
+
+def file_chunks(path, factor, assets, chunk_rows=10_000):
+    """``(x, y)`` chunks from a wide Parquet or CSV file, one row per period.
+
+    The file is scanned once, in order, about ``chunk_rows`` rows at a
+    time, and only the ``factor`` and ``assets`` columns are decoded.
+    """
+    import polars as pl
+
+    suffix = Path(path).suffix.lower()
+    if suffix in (".parquet", ".pq"):
+        frame = pl.scan_parquet(path)
+    elif suffix == ".csv":
+        frame = pl.scan_csv(path)
+    else:
+        raise ValueError(f"{path}: expected a .parquet or .csv file")
+    yield from frame_chunks(frame.select(pl.col([factor, *assets]).cast(pl.Float64)), factor, assets, chunk_rows)
@@ -0,0 +1,122 @@
+"""Process-wide memoization of figures and other expensive artifacts.
+
+Streamlit re-executes a page script from the top on every widget
+interaction, so anything built at module level is rebuilt on every rerun
+of every session. Builders decorated with ``cached_figure`` run once per
+distinct set of arguments per server process and the cache holds the
+figure's validated spec; each call returns a new figure built from it
+without re-validation, so a session may update its copy freely.
+"""
+
+import functools
+import hashlib
+import threading
+import types
+from collections import OrderedDict
+
+import numpy as np
+
+
+class LRUCache:
+    """Thread-safe least-recently-used cache with hit/miss counters.
+
+    Concurrent requests for a key that is being built wait for that build
+    instead of starting their own.
+    """
+
+    def __init__(self, maxsize=128):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._pending = {}
+        self._lock = threading.Lock()
+
+    def get_or_create(self, key, factory):
+        while True:
+            with self._lock:
+                if key in self._entries:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return self._entries[key]
+                building = self._pending.get(key)
+                if building is None:
+                    self.misses += 1
+                    building = self._pending[key] = threading.Event()
+                    break
+            # Another thread is building the key; if it fails, retry.
+            building.wait()
+
+        # Build outside the lock so slow builders do not block other keys.
+        try:
+            value = factory()
+            with self._lock:
+                self._entries[key] = value
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+        finally:
+            with self._lock:
+                del self._pending[key]
+            building.set()
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+
+FIGURE_CACHE = LRUCache(maxsize=128)
+
+
+def freeze(value):
+    """Hashable stand-in for builder arguments (lists, dicts, arrays...)."""
+    if isinstance(value, dict):
+        return tuple(sorted((k, freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(v) for v in value)
+    if isinstance(value, np.ndarray):
+        return (value.dtype.str, value.shape, hashlib.sha1(np.ascontiguousarray(value).tobytes()).hexdigest())
+    return value
+
+
+def _spec(fig):
+    return type(fig), fig.to_dict()
+
+
+def cached_figure(func=None, *, cache=FIGURE_CACHE):
+    """Memoize ``func`` in ``cache``, keyed on its arguments.
+
+    Page scripts redefine their builders on every rerun, so the key uses the
+    defining file, name and bytecode of the builder rather than the function
+    object; editing the builder invalidates its entries. Globals the builder
+    reads are not part of the key, so pass data in as arguments.
+
+    ``func`` must return a plotly figure. Every call gets its own copy.
+    """
+    if func is None:
+        return functools.partial(cached_figure, cache=cache)
+
+    code = func.__code__
+    # Nested code objects have address-dependent reprs; leave them out.
+    consts = tuple(c for c in code.co_consts if not isinstance(c, types.CodeType))
+    fingerprint = hashlib.sha1(code.co_code + repr((consts, code.co_names)).encode()).hexdigest()
+    name = (code.co_filename, func.__qualname__, fingerprint)
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        key = (name, freeze(args), freeze(kwargs))
+        figure_type, spec = cache.get_or_create(key, lambda: _spec(func(*args, **kwargs)))
+        # The spec was validated when the figure was built.
+        return figure_type(spec, _validate=False)
+
+    return wrapper
+
+
+def cache_summary(cache=FIGURE_CACHE):
+    """One-line hit/miss summary, for display in the page sidebar."""
+    return f"Figure cache: {cache.hits} hits, {cache.misses} misses, {len(cache)}/{cache.maxsize} entries"
@@ -0,0 +1,235 @@
+"""Plotly figures that stay small however much data is behind them.
+
+pandas, plotly.express and the spatial helpers are imported by the
+figures that need them, so pages that only draw heatmaps or line charts
+do not pay for them at startup.
+"""
+
+import numpy as np
+import plotly.graph_objects as go
+
+from climate_finance.cache import cached_figure
+
+# Above this many points the beta map switches from one marker per asset
+# to one marker per grid cell.
+MAP_MAX_POINTS = 5_000
+
+# Roughly one cell every 16 pixels of a 256-pixel map tile.
+_CELL_PIXELS = 16
+
+# Line charts keep at most this many points over all their series...
+LINE_MAX_POINTS = 1_000
+# ...but never fewer than this per series.
+_MIN_SERIES_POINTS = 16
+# From this many points drawn, line charts are rendered with WebGL.
+WEBGL_MIN_POINTS = 5_000
+
+# Heatmaps show at most this many rows and columns; a finer surface is
+# sampled down for display, which a 450-pixel chart cannot resolve anyway.
+HEATMAP_MAX_SIDE = 50
+
+
+def cell_size_for_zoom(zoom):
+    """Grid cell size in degrees matching a mapbox zoom level."""
+    return 360 * _CELL_PIXELS / (256 * 2**zoom)
+
+
+def beta_map(geo_data, value="Beta Sensitivity", hover_name="City", zoom=1, max_points=MAP_MAX_POINTS, height=500):
+    """Map of beta sensitivities, aggregated server-side for large universes.
+
+    Up to ``max_points`` rows, every asset gets its own marker. Beyond that
+    the assets are averaged on a lat/lon grid whose resolution follows
+    ``zoom``; the grid is coarsened until at most ``max_points`` cells are
+    occupied, so the figure payload is bounded whatever the number of assets.
+    """
+    import pandas as pd
+    import plotly.express as px
+
+    from climate_finance.spatial import aggregate_to_grid, coarsen_grid
+
+    if len(geo_data) <= max_points:
+        fig = px.scatter_mapbox(
+            geo_data,
+            lat="lat",
+            lon="lon",
+            color=value,
+            size=value,
+            hover_name=hover_name,
+            color_continuous_scale="YlOrRd",
+            size_max=30,
+            zoom=zoom,
+            height=height
+        )
+    else:
+        cell_deg = cell_size_for_zoom(zoom)
+        cells = aggregate_to_grid(geo_data["lat"], geo_data["lon"], geo_data[value], cell_deg)
+        while cells.count.size > max_points:
+            cell_deg *= 2
+            cells = coarsen_grid(cells, cell_deg)
+        cells = pd.DataFrame({
+            "lat": cells.lat,
+            "lon": cells.lon,
+            "Assets": cells.count,
+            f"Mean {value}": cells.mean,
+            f"Max {value}": cells.max,
+        })
+        fig = px.scatter_mapbox(
+            cells,
+            lat="lat",
+            lon="lon",
+            color=f"Mean {value}",
+            size="Assets",
+            hover_data={f"Max {value}": ":.2f", "Assets": True, "lat": False, "lon": False},
+            color_continuous_scale="YlOrRd",
+            size_max=30,
+            zoom=zoom,
+            height=height
+        )
+
+    fig.update_layout(mapbox_style="carto-positron")
+    fig.update_layout(margin={"r":0,"t":0,"l":0,"b":0})
+    return fig
+
+
+def lttb(x, y, n_out):
+    """Indices of ``n_out`` points keeping the shape of a line (largest triangle three buckets).
+
+    The first and last points are kept, and the interior points are split
+    into ``n_out - 2`` buckets; from each bucket the point forming the
+    largest triangle with the point kept from the previous bucket and the
+    mean of the next bucket is kept. ``y`` may hold several series on the
+    same ``x``, shape ``(series, points)``; they are reduced together and
+    the result has shape ``(series, n_out)``.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    series = y.reshape(-1, x.size)
+    n = x.size
+    if n_out >= n:
+        return np.broadcast_to(np.arange(n), (*y.shape[:-1], n))
+    if n_out < 3:
+        raise ValueError("LTTB keeps at least 3 points")
+    rows = np.arange(series.shape[0])
+    edges = (np.arange(n_out - 1) * (n - 2) / (n_out - 2)).astype(np.int64) + 1
+    keep = np.empty((series.shape[0], n_out), dtype=np.int64)
+    keep[:, 0], keep[:, -1] = 0, n - 1
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        if i + 2 < edges.size:
+            next_x, next_y = x[hi:edges[i + 2]].mean(), series[:, hi:edges[i + 2]].mean(axis=1)
+        else:
+            next_x, next_y = x[-1], series[:, -1]
+        prev_x, prev_y = x[keep[:, i]], series[rows, keep[:, i]]
+        area = np.abs(
+            (prev_x - next_x)[:, None] * (series[:, lo:hi] - prev_y[:, None])
+            - (prev_x[:, None] - x[lo:hi]) * (next_y - prev_y)[:, None]
+        )
+        keep[:, i + 1] = lo + np.where(np.isnan(area), -1.0, area).argmax(axis=1)
+    return keep.reshape(*y.shape[:-1], n_out)
+
+
+def line_chart(x, series, title=None, x_title=None, y_title=None, y_range=None, max_points=LINE_MAX_POINTS,
+               webgl_min_points=WEBGL_MIN_POINTS):
+    """Line chart of ``series`` (name -> values on the shared ``x``), light however long the series.
+
+    Above ``max_points`` points in total, every series is downsampled with
+    ``lttb`` to its share of the budget; with a ``y_range``, the shape is
+    judged on the visible part of the curves. From ``webgl_min_points``
+    points drawn the traces are ``Scattergl``.
+    """
+    x = np.asarray(x, dtype=float)
+    names = list(series)
+    values = np.array([np.asarray(series[name], dtype=float) for name in names]).reshape(len(names), x.size)
+    per_series = max(max_points // max(len(names), 1), _MIN_SERIES_POINTS)
+    xs = np.broadcast_to(x, values.shape)
+    if x.size > per_series:
+        visible = values if y_range is None else np.clip(values, *y_range)
+        keep = lttb(x, visible, per_series)
+        xs, values = x[keep], np.take_along_axis(values, keep, axis=1)
+
+    trace = go.Scattergl if values.size >= webgl_min_points else go.Scatter
+    fig = go.Figure([trace(x=xs[i], y=values[i], mode='lines', name=name) for i, name in enumerate(names)])
+    fig.update_layout(title=title, xaxis_title=x_title, yaxis_title=y_title, yaxis_range=y_range)
+    return fig
+
+
+def payload_bytes(fig):
+    """Size of the JSON Streamlit sends to the browser for ``fig``."""
+    import plotly.io as pio
+
+    return len(pio.to_json(fig, validate=False).encode())
+
+
+def _evenly_spaced(n, n_out):
+    # Positions of n_out samples out of n, first and last included.
+    if n <= n_out:
+        return np.arange(n)
+    return np.unique(np.linspace(0, n - 1, n_out).round().astype(np.intp))
+
+
+def sensitivity_heatmap(x, y, z, x_title, y_title, z_title, title=None, height=450, max_side=HEATMAP_MAX_SIDE):
+    """Heatmap of a 2-D sensitivity surface ``z[y, x]``.
+
+    At most ``max_side`` rows and columns of the surface are drawn, as
+    float32, so the payload stays small whatever the resolution of the
+    computation.
+    """
+    x, y, z = np.asarray(x), np.asarray(y), np.asarray(z)
+    rows, cols = _evenly_spaced(y.size, max_side), _evenly_spaced(x.size, max_side)
+    z = z[np.ix_(rows, cols)].astype(np.float32)
+    fig = go.Figure(go.Heatmap(x=x[cols], y=y[rows], z=z, colorscale="RdBu_r", colorbar={"title": z_title}))
+    fig.update_layout(title=title, xaxis_title=x_title, yaxis_title=y_title, height=height, template="plotly_white")
+    return fig
+
+
+@cached_figure
+def scc_scatter_figure(version):
+    """Published SCC estimates by year of publication, from the REEP meta-analysis.
+
+    ``version`` is ``scc.scc_version()``: it only keys the cached figure, so
+    that an edited workbook gets a new one.
+    """
+    import polars as pl
+
+    from climate_finance.scc import scc_arrays
+
+    scc = scc_arrays(["year", "scc"], pl.col("scc") > 0)
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(x=scc["year"], y=scc["scc"], mode='markers', marker=dict(size=4, opacity=0.4), name='SCC estimate'))
+    fig.update_layout(
+        title="Published SCC Estimates by Year of Publication",
+        xaxis_title="Year of publication",
+        yaxis_title="SCC (2010 $/tC)",
+        yaxis_type="log",
+        template="plotly_white"
+    )
+    return fig
+
+
+@cached_figure
+def scc_density_figure(version, prtp_values=(0.0, 1.0, 1.5, 3.0)):
+    """Weighted densities of log10(SCC) per pure rate of time preference, on a common grid.
+
+    ``version`` keys the cached figure on the workbook, as for ``scc_scatter_figure``.
+    """
+    import polars as pl
+
+    from climate_finance.density import evaluation_grid, weighted_binned_kde
+    from climate_finance.scc import scc_arrays
+
+    scc = scc_arrays(["scc", "weight", "prtp"], (pl.col("scc") > 0) & pl.col("prtp").is_in(list(prtp_values)))
+    log_grid = evaluation_grid(-2.5, 5.5, 512)
+
+    fig = go.Figure()
+    for prtp in prtp_values:
+        group = scc["prtp"] == prtp
+        _, density = weighted_binned_kde(np.log10(scc["scc"][group]), scc["weight"][group], grid=log_grid)
+        fig.add_trace(go.Scatter(x=10 ** log_grid, y=density, mode='lines', name=f'PRTP = {prtp}%'))
+    fig.update_layout(
+        title="Distribution of SCC Estimates by Pure Rate of Time Preference",
+        xaxis_title="SCC (2010 $/tC)",
+        xaxis_type="log",
+        yaxis_title="Density of log10(SCC)",
+        template="plotly_white"
+    )
+    return fig
@@ -0,0 +1,148 @@
+"""Epstein-Zin recursive utility on a Markov grid of consumption growth.
+
+CRRA utility ties risk aversion ``γ`` to the elasticity of intertemporal
+substitution ``ψ = 1/γ``. Epstein-Zin preferences separate the two:
+
+    V_t = [(1 - β) C_t^{1-1/ψ} + β R_t(V_{t+1})^{1-1/ψ}]^{1/(1-1/ψ)},
+    R_t(V) = E_t[V^{1-γ}]^{1/(1-γ)}.
+
+Log consumption growth follows a Markov chain on the states ``g_s`` with
+transition matrix ``P``. Utility is homothetic, so ``v_s = V_t / C_t``
+only depends on the state and solves the fixed point
+
+    v_s^{1-1/ψ} = (1 - β) + β R_s^{1-1/ψ},   R_s = (Σ_{s'} P_{ss'} (v_{s'} e^{g_{s'}})^{1-γ})^{1/(1-γ)},
+
+solved for all states at once, with Anderson acceleration: plain
+iteration contracts at rate ``β`` and needs thousands of steps for
+annual discounting, the accelerated one a few dozen. The implied SDF is
+
+    m_{ss'} = β e^{-g_{s'}/ψ} (v_{s'} e^{g_{s'}} / R_s)^{1/ψ - γ},
+
+which is the CRRA kernel ``β e^{-γ g_{s'}}`` when ``ψ = 1/γ``.
+"""
+
+from typing import NamedTuple
+
+import numpy as np
+
+from climate_finance.cache import LRUCache, freeze
+
+SOLUTION_CACHE = LRUCache(maxsize=32)
+
+
+class EpsteinZinSolution(NamedTuple):
+    growth: np.ndarray
+    transition: np.ndarray
+    value: np.ndarray
+    certainty_equivalent: np.ndarray
+    sdf: np.ndarray
+    risk_free: np.ndarray
+    iterations: int
+    converged: bool
+
+
+def tauchen(mean, vol, rho, n=7, width=3.0):
+    """Markov chain approximating AR(1) growth ``g' = μ + ρ (g - μ) + σ ε``.
+
+    Returns the ``n`` growth states and the ``(n, n)`` transition matrix.
+    """
+    from scipy.stats import norm
+
+    spread = width * vol / np.sqrt(1 - rho**2) if n > 1 else 0.0
+    growth = mean + np.linspace(-spread, spread, n)
+    if n == 1:
+        return growth, np.ones((1, 1))
+    step = growth[1] - growth[0]
+    conditional = mean + rho * (growth[:, None] - mean)
+    cdf = norm.cdf((growth[None, :] - conditional + step / 2) / vol)
+    transition = np.diff(np.concatenate([np.zeros((n, 1)), cdf[:, :-1], np.ones((n, 1))], axis=1), axis=1)
+    return growth, transition
+
+
+def _power_mean(transition, x, exponent):
+    # (Σ P x^a)^(1/a), with the geometric mean as the a → 0 limit.
+    if np.isclose(exponent, 0.0):
+        return np.exp(transition @ np.log(x))
+    return (transition @ x**exponent) ** (1 / exponent)
+
+
+def _anderson_step(history_x, history_f, fallback):
+    # Least-squares combination of the last iterates minimizing the residual.
+    residuals = np.array([f - x for x, f in zip(history_x, history_f)])
+    if len(residuals) < 2:
+        return fallback
+    diffs = np.diff(residuals, axis=0)
+    coef = np.linalg.lstsq(diffs.T, residuals[-1], rcond=None)[0]
+    images = np.array(history_f)
+    return images[-1] - coef @ np.diff(images, axis=0)
+
+
+def _solve(growth, transition, gamma, psi, beta, tol, max_iter, memory):
+    rho = 1 - 1 / psi
+    exp_g = np.exp(growth)
+
+    def update(log_v):
+        v = np.exp(log_v)
+        ce = _power_mean(transition, v * exp_g, 1 - gamma)
+        if np.isclose(rho, 0.0):
+            # ψ = 1: log v = β log R.
+            return beta * np.log(ce), ce
+        return np.log((1 - beta) + beta * ce**rho) / rho, ce
+
+    log_v = np.zeros_like(growth)
+    history_x, history_f = [], []
+    iterations, converged = 0, False
+    for _ in range(max_iter):
+        iterations += 1
+        image, _ = update(log_v)
+        if not np.all(np.isfinite(image)):
+            if not history_f:
+                # No finite value function, e.g. β R^{1-1/ψ} >= 1.
+                break
+            # The extrapolation left the domain: restart from the last plain iterate.
+            log_v, history_x, history_f = history_f[-1], [], []
+            continue
+        if np.max(np.abs(image - log_v)) < tol:
+            log_v, converged = image, True
+            break
+        history_x = (history_x + [log_v])[-memory:]
+        history_f = (history_f + [image])[-memory:]
+        candidate = _anderson_step(history_x, history_f, image)
+        # Fall back to a plain step if the extrapolation leaves the domain.
+        log_v = candidate if np.all(np.isfinite(candidate)) else image
+
+    value = np.exp(log_v)
+    _, ce = update(log_v)
+    future = value * exp_g
+    sdf = beta * exp_g[None, :] ** (-1 / psi) * (future[None, :] / ce[:, None]) ** (1 / psi - gamma)
+    for array in (value, ce, sdf):
+        array.setflags(write=False)
+    risk_free = 1 / np.sum(transition * sdf, axis=1)
+    risk_free.setflags(write=False)
+    return EpsteinZinSolution(growth, transition, value, ce, sdf, risk_free, iterations, converged)
+
+
+def solve_epstein_zin(growth, transition, gamma, psi, beta, tol=1e-12, max_iter=10_000, memory=5):
+    """Value function and SDF for Epstein-Zin preferences on a growth grid.
+
+    ``growth`` holds the log consumption growth of each state and
+    ``transition[s, s']`` the probability of moving from ``s`` to ``s'``
+    (i.i.d. growth is a transition matrix with identical rows). Solutions
+    are cached process-wide per ``(γ, ψ, β)`` and grid, and are read-only.
+    ``memory`` is the number of past iterates Anderson acceleration
+    combines; ``memory=1`` is plain fixed-point iteration.
+    ``sdf[s, s']`` prices payoffs in ``s'`` from ``s``; ``risk_free[s]`` is
+    the gross one-period risk-free rate.
+    """
+    growth = np.asarray(growth, dtype=float)
+    transition = np.asarray(transition, dtype=float)
+    if transition.shape != (growth.size, growth.size):
+        raise ValueError(f"expected a {growth.size} x {growth.size} transition matrix, got {transition.shape}")
+    if not np.allclose(transition.sum(axis=1), 1.0):
+        raise ValueError("transition matrix rows must sum to one")
+    if not 0 < beta < 1:
+        raise ValueError("beta must be in (0, 1)")
+    key = (float(gamma), float(psi), float(beta), freeze(growth), freeze(transition), tol, max_iter, memory)
+    return SOLUTION_CACHE.get_or_create(
+        key, lambda: _solve(growth, transition, gamma, psi, beta, tol, max_iter, memory)
+    )
@@ -0,0 +1,241 @@
+"""Gridded physical-hazard layers sampled at asset locations.
+
+Hazard layers (flood depth, heat days...) are global grids per climate
+scenario and year. A ``HazardStore`` keeps each one on disk as an array of
+square tiles, ``(tile_rows, tile_cols, T + 1, T + 1)``, memory-mapped
+read-only: every tile is contiguous in the file, and carries a one-pixel
+halo from its right and lower neighbours, so the four pixels around any
+point always fall in a single tile.
+
+Sampling sorts the points by tile once (``locate``) and then reads the
+touched tiles in batches, interpolating bilinearly with array operations.
+Tiles no point falls in are never read, so a raster much larger than RAM
+can be sampled at millions of locations; the same ``PixelLocations`` are
+reused across the scenarios and years of a layer.
+
+Values are taken at cell centres. Grids covering 360 degrees of longitude
+wrap around the date line; elsewhere points are clamped to the edge cells.
+
+Each write of a raster goes to a new, immutable version directory, and a
+``CURRENT`` file naming the live version is then swapped with an atomic
+rename: readers see either the old raster or the new one, never none, and
+a crash mid-write leaves the old one in place.
+"""
+
+import functools
+import json
+import os
+import shutil
+import threading
+import time
+from pathlib import Path
+from typing import NamedTuple
+
+import numpy as np
+
+HAZARD_DIR = Path(__file__).resolve().parent.parent / "data" / "hazard"
+
+TILE_SIZE = 256
+
+
+class PixelLocations(NamedTuple):
+    geometry: tuple
+    order: np.ndarray
+    tiles: np.ndarray
+    counts: np.ndarray
+    row: np.ndarray
+    col: np.ndarray
+    row_frac: np.ndarray
+    col_frac: np.ndarray
+
+
+class TiledRaster:
+    """A tiled grid, usually memory-mapped from a ``HazardStore``."""
+
+    def __init__(self, tiles, shape, bounds):
+        self.tiles = tiles
+        self.shape = tuple(shape)
+        self.bounds = tuple(float(b) for b in bounds)
+        self.tile_size = tiles.shape[-1] - 1
+        west, south, east, north = self.bounds
+        self.resolution = ((north - south) / self.shape[0], (east - west) / self.shape[1])
+        self.wrap = bool(np.isclose(east - west, 360.0))
+
+    @classmethod
+    def from_grid(cls, grid, bounds=(-180.0, -90.0, 180.0, 90.0), tile_size=TILE_SIZE, out=None):
+        """Tile a ``(rows, cols)`` grid whose first row is the northern edge.
+
+        ``out`` may be a preallocated (e.g. memory-mapped) array of shape
+        ``tile_shape(grid.shape, tile_size)``; the grid is copied one row
+        of tiles at a time.
+        """
+        rows, cols = grid.shape
+        shape = tile_shape(grid.shape, tile_size)
+        tiles = np.empty(shape, dtype=grid.dtype) if out is None else out
+        wrap = np.isclose(bounds[2] - bounds[0], 360.0)
+        # Column indices of every tile, halo included; past the last column
+        # the halo repeats the edge, or wraps to the first column.
+        col = (np.arange(shape[1])[:, None] * tile_size + np.arange(tile_size + 1)).ravel()
+        col = np.where((col == cols) & wrap, 0, np.minimum(col, cols - 1))
+        for i in range(shape[0]):
+            row = np.minimum(np.arange(i * tile_size, (i + 1) * tile_size + 1), rows - 1)
+            block = np.asarray(grid[row])[:, col].reshape(tile_size + 1, shape[1], tile_size + 1)
+            tiles[i] = block.transpose(1, 0, 2)
+        return cls(tiles, grid.shape, bounds)
+
+    @property
+    def geometry(self):
+        return (self.shape, self.bounds, self.tile_size)
+
+    def locate(self, lat, lon):
+        """Tile and in-tile pixel coordinates of points, sorted by tile."""
+        lat = np.asarray(lat, dtype=float).ravel()
+        lon = np.asarray(lon, dtype=float).ravel()
+        rows, cols = self.shape
+        west, _, _, north = self.bounds
+        y = np.clip((north - lat) / self.resolution[0] - 0.5, 0, rows - 1)
+        x = (lon - west) / self.resolution[1] - 0.5
+        x = np.mod(x, cols) if self.wrap else np.clip(x, 0, cols - 1)
+        y0 = np.floor(y).astype(np.int64)
+        x0 = np.minimum(np.floor(x).astype(np.int64), cols - 1)
+
+        tile_cols = self.tiles.shape[1]
+        tile = (y0 // self.tile_size) * tile_cols + x0 // self.tile_size
+        order = np.argsort(tile, kind="stable")
+        tiles, counts = np.unique(tile[order], return_counts=True)
+        return PixelLocations(
+            self.geometry, order, tiles, counts,
+            (y0 % self.tile_size)[order], (x0 % self.tile_size)[order],
+            (y - y0)[order], (x - x0)[order],
+        )
+
+    def tiles_touched(self, lat, lon):
+        """Number of tiles sampling these points reads, out of the total."""
+        return self.locate(lat, lon).tiles.size, self.tiles.shape[0] * self.tiles.shape[1]
+
+    def sample(self, lat, lon, max_tiles=64):
+        """Bilinear interpolation of the grid at points (degrees)."""
+        return self.sample_at(self.locate(lat, lon), max_tiles)
+
+    def sample_at(self, locations, max_tiles=64):
+        """Sample at ``locations`` from ``locate`` on a raster of the same geometry.
+
+        At most ``max_tiles`` tiles are held in memory at a time.
+        """
+        if locations.geometry != self.geometry:
+            raise ValueError("locations were computed for a raster with a different geometry")
+        flat = self.tiles.reshape(-1, self.tile_size + 1, self.tile_size + 1)
+        sorted_values = np.empty(locations.order.size, dtype=np.result_type(self.tiles.dtype, np.float32))
+        ends = np.cumsum(locations.counts)
+        for first in range(0, locations.tiles.size, max_tiles):
+            last = min(first + max_tiles, locations.tiles.size)
+            # Fancy indexing a memory map only reads the selected tiles.
+            block = flat[locations.tiles[first:last]]
+            points = slice(ends[first] - locations.counts[first], ends[last - 1])
+            k = np.repeat(np.arange(last - first), locations.counts[first:last])
+            r, c = locations.row[points], locations.col[points]
+            fy, fx = locations.row_frac[points], locations.col_frac[points]
+            top = block[k, r, c] * (1 - fx) + block[k, r, c + 1] * fx
+            bottom = block[k, r + 1, c] * (1 - fx) + block[k, r + 1, c + 1] * fx
+            sorted_values[points] = top * (1 - fy) + bottom * fy
+        values = np.empty_like(sorted_values)
+        values[locations.order] = sorted_values
+        return values
+
+
+def tile_shape(shape, tile_size=TILE_SIZE):
+    """Shape of the tile array holding a grid of ``shape``."""
+    return (-(-shape[0] // tile_size), -(-shape[1] // tile_size), tile_size + 1, tile_size + 1)
+
+
+class HazardStore:
+    """Directory of tiled hazard rasters, one per layer, scenario and year."""
+
+    def __init__(self, path=HAZARD_DIR):
+        self.path = Path(path)
+
+    def _directory(self, layer, scenario, year):
+        return self.path / layer / scenario / str(year)
+
+    def write(self, layer, scenario, year, grid, bounds=(-180.0, -90.0, 180.0, 90.0), tile_size=TILE_SIZE,
+              dtype=np.float32, overwrite=False):
+        """Tile ``grid`` (first row north) into the store.
+
+        The raster is written to a new version directory, then made current
+        by atomically replacing the ``CURRENT`` pointer; the version before
+        it is kept for readers that have just read the old pointer, older
+        ones are removed.
+        """
+        directory = self._directory(layer, scenario, year)
+        pointer = directory / "CURRENT"
+        if pointer.exists() and not overwrite:
+            raise FileExistsError(f"{layer}/{scenario}/{year} is already in the store")
+        # Version names sort by creation time.
+        version = f"v{time.time_ns():020d}-{os.getpid()}-{threading.get_ident()}"
+        tmp = directory / f"{version}.tmp"
+        tmp.mkdir(parents=True)
+        try:
+            tiles = np.lib.format.open_memmap(
+                tmp / "tiles.npy", mode="w+", dtype=dtype, shape=tile_shape(np.shape(grid), tile_size)
+            )
+            TiledRaster.from_grid(grid, bounds, tile_size, out=tiles)
+            tiles.flush()
+            del tiles
+            (tmp / "raster.json").write_text(json.dumps({"shape": list(np.shape(grid)), "bounds": list(bounds)}))
+            os.replace(tmp, directory / version)
+            previous = _current(directory)
+            tmp_pointer = directory / f"CURRENT.{version}.tmp"
+            tmp_pointer.write_text(version)
+            os.replace(tmp_pointer, pointer)
+        finally:
+            shutil.rmtree(tmp, ignore_errors=True)
+        for stale in directory.glob("v*"):
+            if stale.suffix != ".tmp" and stale.name < version and stale.name != previous:
+                shutil.rmtree(stale, ignore_errors=True)
+
+    def keys(self, layer):
+        """``(scenario, year)`` pairs stored for ``layer``."""
+        return sorted((d.parent.name, int(d.name)) for d in (self.path / layer).glob("*/*") if (d / "CURRENT").exists())
+
+    def raster(self, layer, scenario, year):
+        """Read-only memory-mapped raster, at its current version."""
+        directory = self._directory(layer, scenario, year)
+        version = _current(directory)
+        if version is None:
+            raise FileNotFoundError(f"{layer}/{scenario}/{year} is not in the store")
+        return _open(directory / version)
+
+    def sample(self, layer, scenario, year, lat, lon):
+        """Layer values at points for one scenario and year."""
+        return self.raster(layer, scenario, year).sample(lat, lon)
+
+    def sample_paths(self, layer, scenarios, years, lat, lon):
+        """Layer values at points, shape ``(scenarios, years, points)``.
+
+        Points are located once and reused for every raster of the same
+        geometry.
+        """
+        lat = np.asarray(lat, dtype=float).ravel()
+        out = np.empty((len(scenarios), len(years), lat.size))
+        locations = None
+        for i, scenario in enumerate(scenarios):
+            for j, year in enumerate(years):
+                raster = self.raster(layer, scenario, year)
+                if locations is None or locations.geometry != raster.geometry:
+                    locations = raster.locate(lat, lon)
+                out[i, j] = raster.sample_at(locations)
+        return out
+
+
+def _current(directory):
+    try:
+        return (directory / "CURRENT").read_text()
+    except FileNotFoundError:
+        return None
+
+
+@functools.lru_cache(maxsize=64)
+def _open(version):
+    # Versions are never modified, only removed, so the path is the key.
+    meta = json.loads((version / "raster.json").read_text())
+    return TiledRaster(np.load(version / "tiles.npy", mmap_mode="r"), meta["shape"], meta["bounds"])
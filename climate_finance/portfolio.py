@@ -0,0 +1,82 @@
+"""Scenario valuation of a whole book of assets at once.
+
+For assets ``a`` and climate scenarios ``s``, with scenario probabilities
+``π_s`` and discount factors ``d_s`` (``1 / (1 + r_s)`` or a stochastic
+discount factor ``m_s``), the unconditional price is
+
+    P_a = Σ_s π_s d_s CF_{a,s},
+
+i.e. one matrix-vector product of the cashflow matrix with the weights
+``w = π ⊙ d``. The impact of a group of scenarios ``G`` (e.g. physical
+damages or abatement) on the price is the discounted, probability-weighted
+loss relative to the baseline cashflow, as in the Introduction example:
+
+    Impact_{a,G} = Σ_{s ∈ G} π_s d_s (CF_a - CF_{a,s}).
+
+Both are computed as matrix products over chunks of assets, so a book of
+hundreds of thousands of positions never needs an assets × scenarios
+temporary beyond one chunk.
+"""
+
+from typing import NamedTuple
+
+import numpy as np
+
+
+class PortfolioValuation(NamedTuple):
+    prices: np.ndarray
+    impacts: np.ndarray | None
+    groups: list
+
+
+def value_portfolio(probabilities, discount_factors, cashflows=None, betas=None, baseline=None,
+                    groups=None, dtype=np.float64, chunk_size=65_536):
+    """Price every asset and attribute its climate impact to scenario groups.
+
+    Pass either an ``(assets, scenarios)`` ``cashflows`` matrix, or ``betas``
+    of the same shape together with ``baseline`` cashflows, in which case
+    ``CF(s) = β(s) · CF``. ``groups`` labels each scenario (e.g.
+    ``["Physical Damages", "Abatement"]``); impacts are returned per distinct
+    label, in order of first appearance, and require ``baseline``.
+
+    The inputs may be stored in float32 (or be memory-mapped); each chunk
+    of ``chunk_size`` assets is converted to ``dtype`` before the products.
+    """
+    if (cashflows is None) == (betas is None):
+        raise ValueError("pass exactly one of cashflows or betas")
+    if baseline is None and (betas is not None or groups is not None):
+        raise ValueError("betas and impacts require baseline cashflows")
+
+    weights = np.asarray(probabilities, dtype=dtype) * np.asarray(discount_factors, dtype=dtype)
+    matrix = cashflows if cashflows is not None else betas
+    n_assets, n_scenarios = matrix.shape
+    if weights.shape != (n_scenarios,):
+        raise ValueError(f"expected {n_scenarios} scenario weights, got {weights.shape}")
+
+    labels = []
+    if groups is not None:
+        if len(groups) != n_scenarios:
+            raise ValueError(f"expected {n_scenarios} group labels, got {len(groups)}")
+        labels = list(dict.fromkeys(groups))
+        membership = np.array([[g == label for label in labels] for g in groups], dtype=dtype)
+        group_weights = weights[:, None] * membership
+        group_totals = weights @ membership
+
+    prices = np.empty(n_assets, dtype=dtype)
+    impacts = np.empty((n_assets, len(labels)), dtype=dtype) if groups is not None else None
+    for start in range(0, n_assets, chunk_size):
+        stop = min(start + chunk_size, n_assets)
+        block = np.asarray(matrix[start:stop], dtype=dtype)
+        if betas is not None:
+            # CF(s) = β(s) · CF, so the baseline factors out of both products.
+            base = np.asarray(baseline[start:stop], dtype=dtype)
+            prices[start:stop] = base * (block @ weights)
+            if impacts is not None:
+                impacts[start:stop] = base[:, None] * (group_totals - block @ group_weights)
+        else:
+            prices[start:stop] = block @ weights
+            if impacts is not None:
+                base = np.asarray(baseline[start:stop], dtype=dtype)
+                impacts[start:stop] = base[:, None] * group_totals - block @ group_weights
+
+    return PortfolioValuation(prices, impacts, labels)
@@ -0,0 +1,75 @@
+"""Background warm-up of the artifacts the pages build on first visit.
+
+Sessions start on the introduction and then open the other pages, which
+would otherwise load the SCC data, fit the KDEs and build the term
+structures and figures while the user waits. ``warm_up()`` is called once
+the introduction has rendered: it submits those builds to a small thread
+pool and returns at once. They land in the process-wide caches
+(``FIGURE_CACHE``, ``CURVE_CACHE``, ``SURFACE_CACHE``) and the shared
+array cache, where the pages pick them up.
+
+Each task is submitted at most once per process, whichever session asks
+first; later sessions get the same future. A page that needs an artifact
+still being warmed waits for that build through the cache instead of
+starting its own. Failed tasks are retried on the next ``warm_up()``.
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+_EXECUTOR = ThreadPoolExecutor(max_workers=2, thread_name_prefix="prefetch")
+_FUTURES = {}
+_LOCK = threading.Lock()
+
+
+def prefetch(name, func, *args, **kwargs):
+    """Run ``func(*args, **kwargs)`` in the background once per process.
+
+    Returns the ``Future`` of the task registered under ``name``.
+    """
+    with _LOCK:
+        future = _FUTURES.get(name)
+        if future is None or (future.done() and future.exception() is not None):
+            future = _FUTURES[name] = _EXECUTOR.submit(func, *args, **kwargs)
+    return future
+
+
+# Tasks import lazily, so importing this module from the introduction costs
+# nothing; their arguments must match the ones the pages use.
+
+def _scc_figures():
+    from climate_finance.charts import scc_density_figure, scc_scatter_figure
+    from climate_finance.scc import scc_version
+
+    scc_scatter_figure(scc_version())
+    scc_density_figure(scc_version())
+
+
+def _term_structure():
+    from climate_finance.term_structure import term_structure
+
+    term_structure(0.02, 2.0)
+
+
+def _sensitivity_cube():
+    from climate_finance.sensitivity import STATE_PRICE_AXES, state_price_cube
+
+    state_price_cube(*STATE_PRICE_AXES)
+
+
+WARM_UP_TASKS = {
+    "scc_figures": _scc_figures,
+    "term_structure": _term_structure,
+    "sensitivity_cube": _sensitivity_cube,
+}
+
+
+def warm_up(tasks=WARM_UP_TASKS):
+    """Start the warm-up tasks in the background; returns their futures by name."""
+    # plotly, through narwhals, looks polars up in sys.modules for every
+    # array it validates; while a worker imports it, a figure built by any
+    # session fails on the half-initialised module. Import it here instead,
+    # at ~0.1 s once per process (budgeted in benchmarks/import_budget.py).
+    import polars  # noqa: F401
+
+    return {name: prefetch(name, task) for name, task in tasks.items()}
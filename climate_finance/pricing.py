@@ -0,0 +1,127 @@
+"""Scenario and state-price valuation used by the pages and the batch CLI.
+
+Two ways of pricing a claim on next period's cashflow ``CF_s`` in states
+(or climate scenarios) ``s`` with probabilities ``π_s``:
+
+* discounting the expected cashflow at the expected rate (page 01),
+
+      P = E[CF] / (1 + E[r]);
+
+* with a stochastic discount factor ``m_s`` (page 02),
+
+      P = E[m CF],   R^f = 1 / E[m],   risk premium = E[CF] / P - R^f.
+
+The functions only add and multiply their per-state inputs, so each
+``cashflows[s]`` may be a scalar, a NumPy array (one entry per position)
+or a polars expression, which is how ``climate_finance.batch`` prices
+position files lazily.
+
+``SCENARIO_PRICE_GRAPH`` and ``STATE_PRICE_GRAPH`` compute the same
+quantities as dependency graphs (``climate_finance.graph``), so a page
+rerun only recomputes those downstream of the inputs that changed.
+"""
+
+import functools
+import operator
+from typing import Any, NamedTuple
+
+import numpy as np
+
+from climate_finance.graph import Graph
+
+
+class ScenarioPrice(NamedTuple):
+    expected_cashflow: Any
+    expected_rate: Any
+    price: Any
+
+
+class StatePrice(NamedTuple):
+    price: Any
+    expected_payoff: Any
+    risk_free: Any
+    expected_return: Any
+    risk_premium: Any
+
+
+def expectation(probabilities, values):
+    """``Σ_s π_s values[s]``, for any values supporting ``+`` and ``*``."""
+    return functools.reduce(operator.add, (p * v for p, v in zip(probabilities, values, strict=True)))
+
+
+def scenario_price(probabilities, cashflows, rates):
+    """Expected cashflow discounted at the expected rate, ``E[CF] / (1 + E[r])``."""
+    expected_cashflow = expectation(probabilities, cashflows)
+    expected_rate = expectation(probabilities, rates)
+    return ScenarioPrice(expected_cashflow, expected_rate, expected_cashflow / (1 + expected_rate))
+
+
+def state_price(probabilities, discount_factors, cashflows):
+    """Price, gross risk-free rate and risk premium under state discount factors ``m_s``."""
+    price = expectation(probabilities, [m * cf for m, cf in zip(discount_factors, cashflows, strict=True)])
+    expected_payoff = expectation(probabilities, cashflows)
+    risk_free = 1 / expectation(probabilities, discount_factors)
+    expected_return = expected_payoff / price
+    return StatePrice(price, expected_payoff, risk_free, expected_return, expected_return - risk_free)
+
+
+def climate_cashflows(gdp_loss, sensitivity=0.5):
+    """Hedging and exposed cashflow paths for a GDP loss path.
+
+    The absolute loss is rescaled to ``[0, 1]``; the hedging asset pays
+    ``1 + sensitivity · loss`` and the exposed asset ``1 - sensitivity · loss``.
+    """
+    loss = np.abs(np.asarray(gdp_loss, dtype=float))
+    span = loss.max() - loss.min()
+    loss = (loss - loss.min()) / span if span > 0 else np.zeros_like(loss)
+    return 1 + sensitivity * loss, 1 - sensitivity * loss
+
+
+def _scenario_price_graph():
+    graph = Graph()
+
+    @graph.node
+    def expected_cf(probabilities, cashflows):
+        return expectation(probabilities, cashflows)
+
+    @graph.node
+    def expected_r(probabilities, rates):
+        return expectation(probabilities, rates)
+
+    @graph.node
+    def price(expected_cf, expected_r):
+        return expected_cf / (1 + expected_r)
+
+    return graph
+
+
+def _state_price_graph():
+    graph = Graph()
+
+    @graph.node
+    def risk_free(probabilities, discount_factors):
+        return 1 / expectation(probabilities, discount_factors)
+
+    @graph.node
+    def expected_x(probabilities, cashflows):
+        return expectation(probabilities, cashflows)
+
+    @graph.node
+    def price(probabilities, discount_factors, cashflows):
+        return expectation(probabilities, [m * cf for m, cf in zip(discount_factors, cashflows, strict=True)])
+
+    @graph.node
+    def expected_return(expected_x, price):
+        return expected_x / price
+
+    @graph.node
+    def risk_premium(expected_return, risk_free):
+        return expected_return - risk_free
+
+    return graph
+
+
+# Incremental versions of scenario_price and state_price for the pages:
+# evaluate them with the inputs named after the function arguments.
+SCENARIO_PRICE_GRAPH = _scenario_price_graph()
+STATE_PRICE_GRAPH = _state_price_graph()
@@ -0,0 +1,199 @@
+"""Opt-in timing of the sections of a page rerun.
+
+A page creates one ``Profiler`` per rerun with ``page_profiler()``, marks
+the start of each logical section with ``profiler.section(name)`` and
+calls ``show_profile(profiler)`` at the end. Sections run back to back, so
+each one is timed from its mark to the next. When profiling is off every
+call returns immediately.
+
+cProfile and tracemalloc stay active until ``finish()``, and a rerun can
+stop before ``show_profile()`` (an exception, or Streamlit interrupting it
+for a newer rerun). The running profiler is kept in ``st.session_state``,
+and the session's next ``page_profiler()`` finishes it first.
+
+Both tools are process-wide while reruns are per session. tracemalloc is
+reference-counted across the profilers using it, and stopped when the last
+one finishes (if a profiler started it); only one cProfile can run at a
+time, so a profiler that finds another one active says so in its report.
+
+Profiling is switched on from the sidebar, or with the query parameter
+``?profile=1``; ``?profile=cprofile``, ``?profile=tracemalloc`` (or both,
+comma-separated) also run the function profiler and the allocation
+tracer for the rerun. Figures passed through ``profiler.figure(fig)`` on
+their way to ``st.plotly_chart`` are listed with their payload size.
+"""
+
+import cProfile
+import io
+import pstats
+import threading
+import time
+import tracemalloc
+
+_TRACING_LOCK = threading.Lock()
+_tracing_users = 0
+_started_tracing = False
+
+
+def _acquire_tracing():
+    global _tracing_users, _started_tracing
+    with _TRACING_LOCK:
+        if _tracing_users == 0:
+            _started_tracing = not tracemalloc.is_tracing()
+            if _started_tracing:
+                tracemalloc.start()
+        _tracing_users += 1
+
+
+def _release_tracing():
+    """Snapshot of the traced memory, or None if tracing was stopped elsewhere."""
+    global _tracing_users
+    with _TRACING_LOCK:
+        snapshot = tracemalloc.take_snapshot() if tracemalloc.is_tracing() else None
+        _tracing_users -= 1
+        if _tracing_users == 0 and _started_tracing:
+            tracemalloc.stop()
+        return snapshot
+
+
+class Profiler:
+    """Wall time per section, plus optional cProfile and tracemalloc."""
+
+    def __init__(self, enabled=False, cprofile=False, memory=False):
+        self.enabled = enabled
+        self.timings = []
+        self.stats = None
+        self.snapshot = None
+        self.figures = []
+        self.notes = []
+        self._current = None
+        self._started = None
+        self._profile = cProfile.Profile() if enabled and cprofile else None
+        self._memory = enabled and memory
+
+    def start(self, section="Setup"):
+        if not self.enabled:
+            return self
+        if self._memory:
+            _acquire_tracing()
+        if self._profile is not None:
+            try:
+                self._profile.enable()
+            except ValueError:
+                self._profile = None
+                self.notes.append("cProfile skipped: another profiler is active in this process.")
+        self.section(section)
+        return self
+
+    def section(self, name):
+        """Close the running section and start timing ``name``."""
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        if self._current is not None:
+            self.timings.append((self._current, now - self._started))
+        self._current, self._started = name, now
+
+    def figure(self, fig, name=None):
+        """Record the payload size of a figure about to be sent; returns ``fig``."""
+        if self.enabled:
+            from climate_finance.charts import payload_bytes
+
+            name = name or fig.layout.title.text or f"Figure {len(self.figures) + 1}"
+            self.figures.append((name, len(fig.data), payload_bytes(fig)))
+        return fig
+
+    def finish(self):
+        """Stop timing and release cProfile and tracemalloc; safe to call twice."""
+        if not self.enabled or self._current is None:
+            return
+        self.section(None)
+        # Snapshot first, so the profiler's own bookkeeping is not reported.
+        if self._memory:
+            self.snapshot = _release_tracing()
+            if self.snapshot is None:
+                self.notes.append("tracemalloc was stopped outside the profiler; no allocation sites.")
+        if self._profile is not None:
+            self._profile.disable()
+            self.stats = pstats.Stats(self._profile)
+
+    def hotspots(self, limit=15):
+        """Top functions by cumulative time, as ``pstats`` prints them."""
+        if self.stats is None:
+            return ""
+        out = io.StringIO()
+        self.stats.stream = out
+        self.stats.sort_stats("cumulative").print_stats(limit)
+        return out.getvalue()
+
+    def allocations(self, limit=10):
+        """Source lines holding the most memory at the end of the rerun."""
+        if self.snapshot is None:
+            return []
+        snapshot = self.snapshot.filter_traces([
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, cProfile.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+        ])
+        return [str(stat) for stat in snapshot.statistics("lineno")[:limit]]
+
+
+def page_profiler(section="Setup"):
+    """Started ``Profiler`` for this rerun, configured from the sidebar."""
+    import streamlit as st
+
+    # The last rerun stopped before show_profile(); release what it holds.
+    unfinished = st.session_state.pop("running_profiler", None)
+    if unfinished is not None:
+        unfinished.finish()
+    requested = {o.strip() for o in st.query_params.get("profile", "").lower().split(",") if o.strip()}
+    enabled = st.sidebar.toggle("Profile this page", value=bool(requested) and requested != {"0"})
+    cprofile = memory = False
+    if enabled:
+        cprofile = st.sidebar.checkbox("cProfile hotspots", value="cprofile" in requested)
+        memory = st.sidebar.checkbox("tracemalloc allocation sites", value="tracemalloc" in requested)
+    profiler = Profiler(enabled, cprofile, memory).start(section)
+    if enabled:
+        st.session_state["running_profiler"] = profiler
+    return profiler
+
+
+def show_profile(profiler):
+    """Finish ``profiler`` and show its report in the sidebar."""
+    if not profiler.enabled:
+        return
+    import streamlit as st
+
+    profiler.finish()
+    if st.session_state.get("running_profiler") is profiler:
+        del st.session_state["running_profiler"]
+    total = sum(seconds for _, seconds in profiler.timings)
+    sidebar = st.sidebar
+    sidebar.subheader("Profile")
+    sidebar.dataframe(
+        {
+            "Section": [name for name, _ in profiler.timings],
+            "ms": [round(seconds * 1e3, 1) for _, seconds in profiler.timings],
+            "%": [round(100 * seconds / total, 1) if total else 0.0 for _, seconds in profiler.timings],
+        },
+        hide_index=True,
+    )
+    sidebar.caption(f"Total rerun time: {total * 1e3:.1f} ms")
+    for note in profiler.notes:
+        sidebar.caption(note)
+    if profiler.figures:
+        with sidebar.expander("Figure payloads"):
+            st.dataframe(
+                {
+                    "Figure": [name for name, _, _ in profiler.figures],
+                    "Traces": [traces for _, traces, _ in profiler.figures],
+                    "KB": [round(size / 1e3, 1) for _, _, size in profiler.figures],
+                },
+                hide_index=True,
+            )
+    if profiler.stats is not None:
+        with sidebar.expander("cProfile hotspots"):
+            st.code(profiler.hotspots(), language=None)
+    if profiler.snapshot is not None:
+        with sidebar.expander("Allocation sites"):
+            st.code("\n".join(profiler.allocations()), language=None)
@@ -0,0 +1,156 @@
+"""Gauss-Hermite quadrature for expectations over normal factors.
+
+When log consumption growth and cashflow shocks are (jointly) normal, an
+expectation ``E[f(X)]`` with ``X ~ N(μ, Σ)`` is a weighted sum over a few
+nodes, ``Σ_k w_k f(μ + L z_k)`` with ``Σ = L Lᵀ``. For the smooth
+integrands of asset pricing (``m``, ``m·CF`` under the exact CRRA kernel)
+ten nodes per factor already give machine precision, against millions
+of draws for Monte Carlo.
+
+Several factors use either the tensor product of one-dimensional rules
+(``n^d`` nodes) or a Smolyak sparse grid, which reaches the same
+polynomial exactness with far fewer nodes as the dimension grows; its
+weights may be negative.
+
+The nodes are looped over and the parameters are not: ``μ`` and ``L`` may
+carry any leading dimensions, so one call prices a whole grid of
+parameter sets with memory proportional to the grid.
+"""
+
+import functools
+import itertools
+from math import comb
+from typing import NamedTuple
+
+import numpy as np
+
+from climate_finance.sdf import crra_sdf
+
+
+class Rule(NamedTuple):
+    nodes: np.ndarray
+    weights: np.ndarray
+
+
+class QuadraturePrice(NamedTuple):
+    price: np.ndarray
+    risk_free: np.ndarray
+    expected_payoff: np.ndarray
+    risk_premium: np.ndarray
+
+
+def _frozen(nodes, weights):
+    for array in (nodes, weights):
+        array.setflags(write=False)
+    return Rule(nodes, weights)
+
+
+@functools.lru_cache(maxsize=64)
+def gauss_hermite(n):
+    """``n``-node rule for one standard normal factor (nodes ``(n, 1)``)."""
+    nodes, weights = np.polynomial.hermite_e.hermegauss(n)
+    return _frozen(nodes[:, None], weights / weights.sum())
+
+
+@functools.lru_cache(maxsize=64)
+def tensor_rule(n, dims):
+    """Product of ``n``-node rules for ``dims`` independent standard normals."""
+    one = gauss_hermite(n)
+    nodes = np.array(list(itertools.product(one.nodes[:, 0], repeat=dims))).reshape(-1, dims)
+    weights = np.prod(np.array(list(itertools.product(one.weights, repeat=dims))).reshape(-1, dims), axis=1)
+    return _frozen(nodes, weights)
+
+
+@functools.lru_cache(maxsize=64)
+def sparse_rule(level, dims):
+    """Smolyak sparse grid of Gauss-Hermite rules for ``dims`` standard normals.
+
+    Combines products of 1-D rules with ``2i - 1`` nodes, ``i`` summing to
+    at most ``level + dims - 1``; ``level=1`` is the single node at the mean.
+    Coinciding nodes are merged.
+    """
+    q = level + dims - 1
+    merged = {}
+    for index in itertools.product(range(1, level + 1), repeat=dims):
+        total = sum(index)
+        if not q - dims + 1 <= total <= q:
+            continue
+        coef = (-1) ** (q - total) * comb(dims - 1, q - total)
+        rules = [gauss_hermite(2 * i - 1) for i in index]
+        for point in itertools.product(*(zip(r.nodes[:, 0], r.weights) for r in rules)):
+            key = tuple(round(x, 12) + 0.0 for x, _ in point)
+            merged[key] = merged.get(key, 0.0) + coef * np.prod([w for _, w in point])
+    nodes = np.array([k for k, w in merged.items() if w != 0.0]).reshape(-1, dims)
+    weights = np.array([w for w in merged.values() if w != 0.0])
+    return _frozen(nodes, weights)
+
+
+def covariance_factor(cov):
+    """``L`` with ``L Lᵀ = cov`` for stacked covariance matrices, singular ones included."""
+    cov = np.asarray(cov, dtype=float)
+    try:
+        return np.linalg.cholesky(cov)
+    except np.linalg.LinAlgError:
+        values, vectors = np.linalg.eigh(cov)
+        return vectors * np.sqrt(np.clip(values, 0.0, None))[..., None, :]
+
+
+def normal_expectation(func, mean, factor, rule):
+    """``E[func(X)]`` for ``X = mean + factor @ Z``, ``Z`` standard normal.
+
+    ``mean`` has shape ``(..., d)`` and ``factor`` ``(..., d, k)`` for the
+    ``k`` factors of ``rule`` (see ``covariance_factor``). ``func`` gets
+    the node values, shape ``(..., d)``, and returns an array of any shape
+    broadcasting with the leading dimensions.
+    """
+    mean = np.asarray(mean, dtype=float)
+    factor = np.asarray(factor, dtype=float)
+    total = 0.0
+    for z, w in zip(rule.nodes, rule.weights):
+        total = total + w * func(mean + factor @ z)
+    return total
+
+
+def quadrature_price(probabilities, growth_mean, growth_vol, cashflow_level, delta=0.02, gamma=2.0,
+                     cashflow_exposure=1.0, cashflow_vol=0.0, payoff=None, nodes=10, rule=None):
+    """``P = E[m·X]``, ``R^f = 1/E[m]`` and the risk premium by quadrature.
+
+    Same model as ``montecarlo.simulate_price``: in scenario ``s`` (the last
+    axis of the per-scenario arguments), ``Δc ~ N(μ_s, σ_s^2)`` and
+    ``CF = level_s · exp(b (Δc - μ_s) + σ_ε ε - (b^2 σ_s^2 + σ_ε^2) / 2)``,
+    priced with the exact kernel ``m = exp(-δ - γ Δc)``. ``X`` is ``CF`` or
+    ``payoff(CF)``; kinked payoffs converge more slowly in ``nodes``.
+
+    Every argument may carry leading dimensions, which broadcast: for
+    instance ``gamma`` of shape ``(n, 1)`` and ``delta`` of shape ``(m,)``
+    price an ``(n, m)`` grid at once. ``rule`` defaults to the tensor
+    product of ``nodes``-node rules over the two shocks.
+    """
+    rule = tensor_rule(nodes, 2) if rule is None else rule
+    # Per-parameter-set arguments get a scenario axis.
+    delta, gamma, exposure, cashflow_vol = (
+        np.asarray(a, dtype=float)[..., None] for a in (delta, gamma, cashflow_exposure, cashflow_vol)
+    )
+    mu, sigma, level, probabilities = np.broadcast_arrays(
+        *(np.asarray(a, dtype=float) for a in (growth_mean, growth_vol, cashflow_level, probabilities))
+    )
+    # (Δc, log CF) is bivariate normal; its Cholesky factor is known.
+    log_level = np.log(level) - 0.5 * ((exposure * sigma) ** 2 + cashflow_vol**2)
+    mean = np.stack(np.broadcast_arrays(mu, log_level), axis=-1)
+    zero = np.zeros_like(mean[..., 0])
+    factor = np.stack(np.broadcast_arrays(
+        np.stack(np.broadcast_arrays(sigma, zero), axis=-1),
+        np.stack(np.broadcast_arrays(exposure * sigma, cashflow_vol), axis=-1),
+    ), axis=-2)
+
+    def integrand(x):
+        m = crra_sdf(x[..., 0], delta, gamma)
+        cf = np.exp(x[..., 1])
+        payout = cf if payoff is None else payoff(cf)
+        return np.stack(np.broadcast_arrays(m, m * payout, payout))
+
+    expected_m, price, expected_payoff = (
+        np.sum(probabilities * e, axis=-1) for e in normal_expectation(integrand, mean, factor, rule)
+    )
+    risk_free = 1 / expected_m
+    return QuadraturePrice(price, risk_free, expected_payoff, expected_payoff / price - risk_free)
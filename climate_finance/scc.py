@@ -0,0 +1,170 @@
+"""Social cost of carbon (SCC) estimates from the REEP meta-analysis workbook.
+
+The workbook is slow to parse (calamine has to walk every cell of a 1.4 MB
+xlsx), so it is converted once into a Parquet file next to it and every
+later read goes through ``pl.scan_parquet``. Pages only pay for the columns
+and rows they actually ask for.
+"""
+
+import functools
+import hashlib
+import os
+from pathlib import Path
+
+import numpy as np
+import polars as pl
+
+from climate_finance.shared import shared_arrays
+
+REEP_WORKBOOK = Path(__file__).resolve().parent.parent / "data" / "socialcostcarbon - REEP.xlsx"
+
+# Bump when the tidy schema below changes so stale caches are rebuilt.
+_CACHE_VERSION = 2
+
+# Column positions in the "Data" sheet and their tidy names. The first three
+# rows of the sheet hold summary statistics and the header.
+_DATA_SHEET = "Data"
+_HEADER_ROWS = 3
+_COLUMNS = {
+    0: "study",
+    1: "ref",
+    4: "year",
+    12: "quality_weight",
+    13: "weight",
+    14: "scc",
+    29: "peer_reviewed",
+    42: "prtp",
+}
+
+SCC_SCHEMA = {
+    "study": pl.String,
+    "ref": pl.String,
+    "year": pl.Int16,
+    "quality_weight": pl.Float64,
+    "weight": pl.Float64,
+    "scc": pl.Float64,
+    "peer_reviewed": pl.Boolean,
+    "prtp": pl.Float64,
+}
+
+
+def _read_workbook(workbook):
+    # Numeric columns are read as floats, so "NA" cells become null; read as
+    # text, calamine would round the values to nine significant digits.
+    dtypes = {position: "string" if name in ("study", "ref") else "float" for position, name in _COLUMNS.items()}
+    raw = pl.read_excel(
+        workbook,
+        sheet_name=_DATA_SHEET,
+        has_header=False,
+        columns=list(_COLUMNS),
+        read_options={"skip_rows": _HEADER_ROWS, "dtypes": dtypes},
+    )
+    raw.columns = list(_COLUMNS.values())
+    return raw.select(
+        # Only the first estimate of each study carries the author and reference.
+        pl.col("study").forward_fill(),
+        pl.col("ref").forward_fill(),
+        pl.col("year").cast(pl.Int16),
+        pl.col("quality_weight").cast(pl.Float64),
+        pl.col("weight").cast(pl.Float64),
+        pl.col("scc").cast(pl.Float64),
+        pl.col("peer_reviewed").cast(pl.Boolean),
+        pl.col("prtp").cast(pl.Float64),
+    )
+
+
+def _content_hash(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for block in iter(lambda: fh.read(1 << 20), b""):
+            digest.update(block)
+    digest.update(str(_CACHE_VERSION).encode())
+    return digest.hexdigest()[:16]
+
+
+def build_scc_cache(workbook=REEP_WORKBOOK, cache_dir=None):
+    """Convert ``workbook`` to Parquet if needed and return the cache path.
+
+    The cache file is named after a hash of the workbook contents, so an
+    edited workbook gets a new file and older ones are removed. Writes go
+    through a temporary file so concurrent server processes never see a
+    half-written cache.
+    """
+    workbook = Path(workbook)
+    cache_dir = Path(cache_dir) if cache_dir is not None else workbook.parent / ".cache"
+    cache_path = cache_dir / f"{workbook.stem}-{_content_hash(workbook)}.parquet"
+    if cache_path.exists():
+        return cache_path
+
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    tmp_path = cache_path.with_suffix(f".{os.getpid()}.tmp")
+    _read_workbook(workbook).write_parquet(tmp_path, statistics=True)
+    os.replace(tmp_path, cache_path)
+
+    for stale in cache_dir.glob(f"{workbook.stem}-*.parquet"):
+        if stale != cache_path:
+            stale.unlink(missing_ok=True)
+    return cache_path
+
+
+@functools.lru_cache(maxsize=8)
+def _cached_scan(workbook, cache_dir, mtime_ns, size):
+    # mtime and size are part of the key so that an edited workbook is
+    # re-hashed; an unchanged one never leaves this cache.
+    return pl.scan_parquet(build_scc_cache(workbook, cache_dir))
+
+
+def scan_scc(workbook=REEP_WORKBOOK, cache_dir=None):
+    """Lazy frame over the SCC estimates, one row per published estimate.
+
+    Columns follow ``SCC_SCHEMA``: ``scc`` is in 2010 US$ per tonne of
+    carbon and ``prtp`` is the pure rate of time preference in percent
+    (null where the study does not report one). The frame is memoized per
+    process, so callers should ``select``/``filter`` before ``collect`` to
+    benefit from Parquet projection and predicate pushdown.
+    """
+    workbook = Path(workbook).resolve()
+    stat = workbook.stat()
+    return _cached_scan(workbook, cache_dir, stat.st_mtime_ns, stat.st_size)
+
+
+@functools.lru_cache(maxsize=8)
+def _cached_version(workbook, cache_dir, mtime_ns, size):
+    return build_scc_cache(workbook, cache_dir).stem.rsplit("-", 1)[1]
+
+
+def scc_version(workbook=REEP_WORKBOOK, cache_dir=None):
+    """Hash of the contents of ``workbook``, to key artifacts built from it.
+
+    Like ``scan_scc``, the workbook is only re-hashed when its modification
+    time or size changes.
+    """
+    workbook = Path(workbook).resolve()
+    stat = workbook.stat()
+    return _cached_version(workbook, cache_dir, stat.st_mtime_ns, stat.st_size)
+
+
+def scc_arrays(columns, predicate=None, workbook=REEP_WORKBOOK, cache_dir=None):
+    """Numeric SCC ``columns`` as read-only arrays shared by all server processes.
+
+    Rows are those of ``scan_scc`` matching the polars ``predicate``; the
+    projection and the predicate are pushed down into the Parquet scan, so
+    only the selected data is read and stored. ``prtp`` is NaN where the
+    study does not report one. The arrays are memory-mapped from the shared
+    array cache, scoped to the workbook contents so that arrays of an
+    edited workbook replace the old ones, and each machine holds one copy.
+    """
+    columns = list(columns)
+    workbook = Path(workbook).resolve()
+    version = scc_version(workbook, cache_dir)
+
+    def build():
+        frame = scan_scc(workbook, cache_dir)
+        if predicate is not None:
+            frame = frame.filter(predicate)
+        frame = frame.select(columns).with_columns(pl.col(pl.Float64).fill_null(np.nan)).collect()
+        return {name: frame[name].to_numpy() for name in columns}
+
+    # Not str(predicate): polars elides long literals when printing them.
+    key = ("scc", tuple(columns), None if predicate is None else predicate.meta.serialize(format="json"))
+    return shared_arrays(key, build, scope=(f"scc-{workbook.stem}", version))
@@ -0,0 +1,76 @@
+"""Illustrative climate scenario paths and their annual interpolation.
+
+The paths shown on page 01 are given every ten years from 2020 to 2100.
+Multi-period valuation needs them at every payment date, so
+``interpolate_paths`` resamples all scenarios at once onto a finer grid,
+and ``log_consumption`` turns a GDP-loss path into the consumption
+trajectory that drives the discount factors.
+"""
+
+from typing import NamedTuple
+
+import numpy as np
+
+SCENARIO_YEARS = list(range(2020, 2101, 10))
+
+# Temperature (°C above pre-industrial)
+TEMPERATURE_PATHS = {
+    'Net Zero 2050':     [1.2, 1.3, 1.4, 1.5, 1.5, 1.5, 1.5, 1.5, 1.5],
+    'Current Policies':  [1.2, 1.4, 1.6, 1.9, 2.2, 2.5, 2.8, 3.0, 3.2],
+    'Delayed Transition': [1.2, 1.4, 1.7, 2.0, 2.4, 2.7, 2.9, 3.0, 3.1],
+    'Hot House World':   [1.2, 1.5, 1.9, 2.4, 2.9, 3.4, 3.9, 4.3, 4.7],
+}
+
+# Emissions (GtCO₂/year)
+EMISSIONS_PATHS = {
+    'Net Zero 2050':     [35, 30, 22, 15, 8, 2, 0, 0, 0],
+    'Current Policies':  [35, 36, 37, 38, 39, 40, 41, 42, 43],
+    'Delayed Transition': [35, 36, 35, 30, 25, 18, 10, 5, 0],
+    'Hot House World':   [35, 38, 42, 45, 47, 49, 50, 51, 52],
+}
+
+# GDP loss (% deviation from baseline)
+GDP_PATHS = {
+    'Net Zero 2050':     [0, -0.2, -0.4, -0.6, -0.8, -1.0, -1.2, -1.3, -1.4],
+    'Current Policies':  [0, -0.1, -0.3, -0.7, -1.2, -1.8, -2.5, -3.3, -4.0],
+    'Delayed Transition': [0, -0.2, -0.5, -1.0, -1.7, -2.4, -3.1, -3.8, -4.5],
+    'Hot House World':   [0, -0.3, -0.8, -1.6, -2.6, -3.7, -5.0, -6.4, -7.9],
+}
+
+
+class ScenarioPaths(NamedTuple):
+    years: np.ndarray
+    scenarios: list
+    values: np.ndarray
+
+
+def interpolate_paths(years, paths, step=1.0):
+    """Linearly interpolate ``{scenario: values}`` onto every ``step`` years.
+
+    The grid starts at the first year and stops at or before the last one,
+    so nothing is extrapolated when ``step`` does not divide the span.
+    Returns the new dates and a ``(scenarios, dates)`` array. The bracketing
+    indices and weights are shared by all scenarios, so this is one
+    gather and one blend whatever the number of scenarios.
+    """
+    years = np.asarray(years, dtype=float)
+    values = np.asarray(list(paths.values()), dtype=float)
+    # The small tolerance keeps the last year despite round-off in the division.
+    n_dates = int(np.floor((years[-1] - years[0]) / step + 1e-9)) + 1
+    grid = years[0] + step * np.arange(n_dates)
+    right = np.clip(np.searchsorted(years, grid, side="right"), 1, years.size - 1)
+    weight = (grid - years[right - 1]) / (years[right] - years[right - 1])
+    blended = values[:, right - 1] * (1 - weight) + values[:, right] * weight
+    return ScenarioPaths(grid, list(paths), blended)
+
+
+def log_consumption(gdp_loss, years, trend=0.02):
+    """Log consumption relative to the first date, ``(scenarios, dates)``.
+
+    Consumption grows at the baseline rate ``trend`` (log, per year) and is
+    reduced by the GDP loss in percent: ``c_t = trend · (t - t_0) +
+    log(1 + loss_t / 100)``.
+    """
+    years = np.asarray(years, dtype=float)
+    log_c = trend * (years - years[0]) + np.log1p(np.asarray(gdp_loss, dtype=float) / 100)
+    return log_c - log_c[..., :1]
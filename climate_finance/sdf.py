@@ -0,0 +1,36 @@
+"""CRRA stochastic discount factor.
+
+With CRRA utility and log consumption growth ``Δc = log(c_{t+1} / c_t)``,
+
+    m_{t+1} = β (c_{t+1} / c_t)^{-γ} = exp(-δ - γ Δc),
+
+where ``β = exp(-δ)``. Page 02 shows the first-order approximation
+``1 - δ - γ Δc``; the functions here use the exact kernel.
+"""
+
+import numpy as np
+
+
+def crra_sdf(growth, delta, gamma):
+    """Exact CRRA discount factor for log consumption growth ``growth``."""
+    return np.exp(-delta - gamma * np.asarray(growth))
+
+
+def crra_sdf_approx(growth, delta, gamma):
+    """First-order approximation ``1 - δ - γ Δc`` shown on page 02."""
+    return 1 - delta - gamma * np.asarray(growth)
+
+
+def lognormal_sdf_mean(growth_mean, growth_vol, delta, gamma):
+    """``E[m]`` when log consumption growth is normal; ``R^f = 1 / E[m]``."""
+    return np.exp(-delta - gamma * np.asarray(growth_mean) + 0.5 * (gamma * np.asarray(growth_vol)) ** 2)
+
+
+def risk_free_rate(growth_mean, growth_vol, delta, gamma):
+    """Gross risk-free rate ``1 / E[m]`` for normal log consumption growth."""
+    return 1 / lognormal_sdf_mean(growth_mean, growth_vol, delta, gamma)
+
+
+def risk_free_rate_approx(expected_growth, delta, gamma):
+    """First-order approximation ``R^f ≈ 1 + δ + γ E[Δc]`` shown on page 02."""
+    return 1 + delta + gamma * np.asarray(expected_growth)
@@ -0,0 +1,104 @@
+"""Price and risk-premium surfaces over whole parameter grids.
+
+The pricing functions of ``climate_finance.pricing`` only add, multiply
+and divide, so feeding them parameter axes shaped to broadcast against
+each other evaluates the whole cube in one pass. A 200 × 200 × 49 cube is
+almost two million prices and takes a few tens of milliseconds.
+
+Cubes are stored once per machine in the shared array cache and memoized
+process-wide on their axes and inputs; moving a slice through a cube is
+then only indexing. Their arrays are read-only memory maps.
+"""
+
+from typing import NamedTuple
+
+import numpy as np
+
+from climate_finance.cache import LRUCache, freeze
+from climate_finance.pricing import scenario_price, state_price
+from climate_finance.sdf import crra_sdf
+from climate_finance.shared import shared_arrays
+
+SURFACE_CACHE = LRUCache(maxsize=16)
+
+# γ × δ × probability of good times axes of the cube shown on page 02.
+STATE_PRICE_AXES = (np.linspace(0.0, 10.0, 200), np.linspace(0.0, 0.1, 200), np.linspace(0.02, 0.98, 49))
+for _axis in STATE_PRICE_AXES:
+    _axis.setflags(write=False)
+
+
+class SensitivityCube(NamedTuple):
+    axes: dict
+    values: dict
+
+    def slice(self, name, axis, value):
+        """2-D surface of ``values[name]`` at the grid point of ``axis`` nearest ``value``.
+
+        Returns the remaining two axes (as ``{name: grid}``) and the surface.
+        """
+        names = list(self.axes)
+        position = names.index(axis)
+        index = int(np.abs(self.axes[axis] - value).argmin())
+        surface = np.take(self.values[name], index, axis=position)
+        return {n: self.axes[n] for n in names if n != axis}, surface
+
+
+def _grid(*axes):
+    # Each axis varies along its own dimension of the cube.
+    axes = [np.asarray(a, dtype=float) for a in axes]
+    return [a.reshape([-1 if i == j else 1 for j in range(len(axes))]) for i, a in enumerate(axes)]
+
+
+def _flatten(cube):
+    return {**{f"axes.{k}": v for k, v in cube.axes.items()}, **{f"values.{k}": v for k, v in cube.values.items()}}
+
+
+def _cube(key, build):
+    # Stored once per machine and memory-mapped read-only by every process.
+    def mapped():
+        arrays = shared_arrays(key, lambda: _flatten(build()))
+        parts = {"axes": {}, "values": {}}
+        for name, array in arrays.items():
+            part, field = name.split(".", 1)
+            parts[part][field] = array
+        return SensitivityCube(**parts)
+    return SURFACE_CACHE.get_or_create(key, mapped)
+
+
+def state_price_cube(gamma, delta, probability, growth=(0.03, -0.02), cashflows=(2.0, 1.0)):
+    """Two-state pricing of page 02 over ``gamma × delta × probability``.
+
+    State one (good times, consumption growth ``growth[0]``) has probability
+    ``probability``; the discount factors are the exact CRRA kernel. Values
+    are ``price``, ``risk_free`` and ``risk_premium``.
+    """
+    def build():
+        g, d, p = _grid(gamma, delta, probability)
+        discount_factors = [crra_sdf(dc, d, g) for dc in growth]
+        result = state_price([p, 1 - p], discount_factors, list(cashflows))
+        shape = np.broadcast_shapes(g.shape, d.shape, p.shape)
+        return SensitivityCube(
+            axes={"gamma": g.ravel(), "delta": d.ravel(), "probability": p.ravel()},
+            values={name: np.broadcast_to(getattr(result, name), shape).copy()
+                    for name in ("price", "risk_free", "risk_premium")},
+        )
+
+    key = ("state_price", freeze(np.asarray(gamma, dtype=float)), freeze(np.asarray(delta, dtype=float)),
+           freeze(np.asarray(probability, dtype=float)), freeze(growth), freeze(cashflows))
+    return _cube(key, build)
+
+
+def scenario_price_cube(probability, rate_a, rate_b, cashflows=(100.0, 50.0)):
+    """Page 01 pricing ``E[CF] / (1 + E[r])`` over ``probability × rate_a × rate_b``."""
+    def build():
+        p, ra, rb = _grid(probability, rate_a, rate_b)
+        result = scenario_price([p, 1 - p], list(cashflows), [ra, rb])
+        shape = np.broadcast_shapes(p.shape, ra.shape, rb.shape)
+        return SensitivityCube(
+            axes={"probability": p.ravel(), "rate_a": ra.ravel(), "rate_b": rb.ravel()},
+            values={"price": np.broadcast_to(result.price, shape).copy()},
+        )
+
+    key = ("scenario_price", freeze(np.asarray(probability, dtype=float)), freeze(np.asarray(rate_a, dtype=float)),
+           freeze(np.asarray(rate_b, dtype=float)), freeze(cashflows))
+    return _cube(key, build)
@@ -0,0 +1,86 @@
+"""Read-only arrays shared by every server process on a machine.
+
+Each Streamlit server process otherwise builds and holds its own copy of
+large read-only data (SCC estimates, sensitivity cubes, hazard grids).
+``shared_arrays`` builds them once per machine into ``.npy`` files and
+memory-maps them read-only in every process: the pages live in the OS page
+cache once, and each process only maps them, so adding workers does not
+add copies.
+
+Files are written to a temporary directory that is renamed into place, so
+a process never maps a half-written array; if two processes build the
+same key at once, one rename wins and the other copy is discarded.
+
+Arrays derived from an input that can change (the SCC workbook) are stored
+under a ``scope=(name, version)``: storing arrays for a new version removes
+those of every other version of the same name, so stale copies do not pile
+up. Processes that still map removed files keep their mappings.
+"""
+
+import functools
+import hashlib
+import os
+import shutil
+import threading
+from pathlib import Path
+
+import numpy as np
+
+SHARED_DIR = Path(__file__).resolve().parent.parent / "data" / ".cache" / "shared"
+
+
+def _directory(key, cache_dir, scope):
+    # The key must have a stable repr across processes (strings, numbers,
+    # tuples, or the digests produced by cache.freeze).
+    digest = hashlib.sha256(repr(key).encode()).hexdigest()[:24]
+    root = Path(cache_dir if cache_dir is not None else SHARED_DIR)
+    if scope is not None:
+        name, version = scope
+        root = root / f"{name}@{version}"
+    return root / digest
+
+
+def _prune(directory, scope):
+    name, _ = scope
+    for stale in directory.parent.parent.glob(f"{name}@*"):
+        if stale != directory.parent:
+            shutil.rmtree(stale, ignore_errors=True)
+
+
+def shared_arrays(key, build, cache_dir=None, scope=None):
+    """Arrays for ``key``, memory-mapped read-only from the shared cache.
+
+    ``build()`` is only called if no process has stored ``key`` yet, and
+    must return a ``{name: ndarray}`` dict of non-object arrays. The result
+    keeps the same names, in the same order. With ``scope=(name,
+    version)``, storing the arrays removes those stored under other
+    versions of ``name``.
+    """
+    directory = _directory(key, cache_dir, scope)
+    if not directory.exists():
+        arrays = build()
+        tmp = directory.with_name(f"{directory.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp.mkdir(parents=True)
+        for position, (name, array) in enumerate(arrays.items()):
+            np.save(tmp / f"{position:03d}-{name}.npy", np.ascontiguousarray(array), allow_pickle=False)
+        try:
+            os.replace(tmp, directory)
+        except OSError:
+            # Another process stored the same arrays first.
+            shutil.rmtree(tmp, ignore_errors=True)
+        if scope is not None:
+            _prune(directory, scope)
+    return _map(directory)
+
+
+@functools.lru_cache(maxsize=64)
+def _map(directory):
+    arrays = {}
+    for path in sorted(directory.glob("*.npy")):
+        name = path.stem.split("-", 1)[1]
+        try:
+            arrays[name] = np.load(path, mmap_mode="r")
+        except ValueError:
+            # Empty arrays cannot be memory-mapped.
+            arrays[name] = np.load(path)
+    return arrays
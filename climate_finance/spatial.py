@@ -0,0 +1,179 @@
+"""Spatial index for geolocated asset exposure queries.
+
+Coordinates are mapped to points on the unit sphere and stored in a
+``scipy.spatial.cKDTree``. The straight-line (chord) distance between two
+such points is a monotone function of their great-circle distance,
+
+    chord = 2 sin(d / 2R),
+
+so radius and nearest-neighbour queries on the sphere become ordinary
+Euclidean KD-tree queries, with no approximation and no special handling
+of the date line or the poles.
+"""
+
+from typing import NamedTuple
+
+import numpy as np
+
+EARTH_RADIUS_KM = 6371.0088
+
+
+def to_unit_vectors(lat, lon):
+    """``(n, 3)`` unit vectors for latitudes and longitudes in degrees."""
+    lat = np.radians(np.asarray(lat, dtype=float))
+    lon = np.radians(np.asarray(lon, dtype=float))
+    cos_lat = np.cos(lat)
+    return np.column_stack([cos_lat * np.cos(lon), cos_lat * np.sin(lon), np.sin(lat)])
+
+
+def _chord(distance_km):
+    angle = np.minimum(np.asarray(distance_km, dtype=float) / EARTH_RADIUS_KM, np.pi)
+    return 2 * np.sin(angle / 2)
+
+
+def _great_circle(chord):
+    with np.errstate(invalid="ignore"):
+        distance = 2 * EARTH_RADIUS_KM * np.arcsin(np.minimum(chord / 2, 1.0))
+    return np.where(np.isinf(chord), np.inf, distance)
+
+
+class SpatialIndex:
+    """Great-circle radius and k-nearest-neighbour queries over fixed points.
+
+    Query results are positions into the coordinate arrays the index was
+    built from, so they can be used directly with ``DataFrame.iloc`` or to
+    index a column of asset attributes (e.g. beta sensitivities).
+    """
+
+    def __init__(self, lat, lon):
+        lat = np.asarray(lat, dtype=float)
+        lon = np.asarray(lon, dtype=float)
+        if lat.shape != lon.shape or lat.ndim != 1:
+            raise ValueError("lat and lon must be one-dimensional arrays of the same length")
+        self._build(to_unit_vectors(lat, lon))
+
+    def _build(self, points, leafsize=16):
+        from scipy.spatial import cKDTree
+
+        self.size = len(points)
+        # Bulk build: the sliding-midpoint tree is much faster to build than
+        # a balanced one and queries just as well on geographic data.
+        self._tree = cKDTree(points, leafsize=leafsize, balanced_tree=False, compact_nodes=False)
+
+    def within_radius(self, lat, lon, radius_km, workers=-1):
+        """Points within ``radius_km`` of each query location.
+
+        Returns one array of indices per query location. ``radius_km`` may
+        be a scalar or one radius per location.
+        """
+        queries = to_unit_vectors(np.atleast_1d(lat), np.atleast_1d(lon))
+        hits = self._tree.query_ball_point(queries, _chord(radius_km), workers=workers, return_sorted=True)
+        return [np.asarray(h, dtype=np.intp) for h in hits]
+
+    def count_within_radius(self, lat, lon, radius_km, workers=-1):
+        """Number of points within ``radius_km`` of each query location."""
+        queries = to_unit_vectors(np.atleast_1d(lat), np.atleast_1d(lon))
+        return self._tree.query_ball_point(queries, _chord(radius_km), workers=workers, return_length=True)
+
+    def within_footprint(self, lat, lon, radius_km, workers=-1):
+        """Sorted indices of points within ``radius_km`` of any footprint cell.
+
+        The footprint is given as the centres of the hazard cells it covers,
+        e.g. the flooded cells of a hazard map.
+        """
+        hits = self.within_radius(lat, lon, radius_km, workers=workers)
+        if not hits:
+            return np.empty(0, dtype=np.intp)
+        return np.unique(np.concatenate(hits))
+
+    def nearest(self, lat, lon, k=1, max_distance_km=np.inf, workers=-1):
+        """Distances (km) and indices of the ``k`` nearest points.
+
+        Shapes follow ``cKDTree.query``: ``(n,)`` for ``k=1`` and ``(n, k)``
+        otherwise. Missing neighbours beyond ``max_distance_km`` get an
+        infinite distance and the index ``self.size``.
+        """
+        queries = to_unit_vectors(np.atleast_1d(lat), np.atleast_1d(lon))
+        upper = _chord(max_distance_km) if np.isfinite(max_distance_km) else np.inf
+        chord, index = self._tree.query(queries, k=k, distance_upper_bound=upper, workers=workers)
+        return _great_circle(chord), index
+
+    def save(self, path):
+        """Write the indexed points and tree parameters to ``path`` (``.npz`` format).
+
+        Only arrays are stored, so loading a file cannot run code; the tree
+        is rebuilt on load, which is cheap next to computing the points.
+        """
+        with open(path, "wb") as fh:
+            np.savez(fh, points=self._tree.data, leafsize=self._tree.leafsize)
+
+    @classmethod
+    def load(cls, path):
+        """Load an index written by ``save``."""
+        with np.load(path, allow_pickle=False) as data:
+            if set(data.files) != {"points", "leafsize"}:
+                raise ValueError(f"{path} does not contain a {cls.__name__}")
+            points, leafsize = data["points"], int(data["leafsize"])
+        if points.ndim != 2 or points.shape[1] != 3:
+            raise ValueError(f"{path} does not contain a {cls.__name__}")
+        index = cls.__new__(cls)
+        index._build(points, leafsize)
+        return index
+
+
+class GridAggregate(NamedTuple):
+    lat: np.ndarray
+    lon: np.ndarray
+    count: np.ndarray
+    mean: np.ndarray
+    max: np.ndarray
+
+
+def _reduce_cells(lat, lon, cell_deg, count, total, maximum):
+    n_rows = int(np.ceil(180 / cell_deg))
+    n_cols = int(np.ceil(360 / cell_deg))
+    # Latitude 90 belongs to the northernmost row, not to one beyond it.
+    row = np.minimum(np.floor((lat + 90) / cell_deg).astype(np.int64), n_rows - 1)
+    col = np.floor((lon + 180) / cell_deg).astype(np.int64) % n_cols
+    cell = row * n_cols + col
+
+    order = np.argsort(cell, kind="stable")
+    cell = cell[order]
+    starts = np.flatnonzero(np.r_[True, cell[1:] != cell[:-1]])
+    occupied = cell[starts]
+    count = np.add.reduceat(count[order], starts)
+    return GridAggregate(
+        lat=(occupied // n_cols + 0.5) * cell_deg - 90,
+        lon=(occupied % n_cols + 0.5) * cell_deg - 180,
+        count=count,
+        mean=np.add.reduceat(total[order], starts) / count,
+        max=np.maximum.reduceat(maximum[order], starts),
+    )
+
+
+def aggregate_to_grid(lat, lon, values, cell_deg):
+    """Count, mean and max of ``values`` per ``cell_deg`` x ``cell_deg`` cell.
+
+    Only occupied cells are returned, located at their centres, so the
+    output size depends on the grid resolution and not on the number of
+    points.
+    """
+    values = np.asarray(values, dtype=float)
+    if values.size == 0:
+        empty = np.empty(0)
+        return GridAggregate(empty, empty, np.empty(0, dtype=np.intp), empty, empty)
+    lat = np.asarray(lat, dtype=float)
+    lon = np.asarray(lon, dtype=float)
+    return _reduce_cells(lat, lon, cell_deg, np.ones(values.size, dtype=np.intp), values, values)
+
+
+def coarsen_grid(cells, cell_deg):
+    """Re-aggregate a ``GridAggregate`` onto cells ``cell_deg`` wide.
+
+    ``cell_deg`` should be a multiple of the original cell size, so that
+    each original cell falls entirely within one coarser cell. This only
+    touches the occupied cells, not the underlying points.
+    """
+    if cells.count.size == 0:
+        return cells
+    return _reduce_cells(cells.lat, cells.lon, cell_deg, cells.count, cells.mean * cells.count, cells.max)
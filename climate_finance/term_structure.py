@@ -0,0 +1,66 @@
+"""Risk-free term structure of every climate scenario.
+
+Along a scenario's consumption path ``c_{s,t}``, the exact CRRA kernel
+prices a zero-coupon bond maturing in ``τ`` years at
+
+    P_s(τ) = exp(-δ τ - γ (c_{s,τ} - c_{s,0})),
+
+with zero rates ``-log P_s(τ) / τ`` and one-period forward rates
+``log(P_s(τ - h) / P_s(τ)) / h``. All scenarios and maturities come out of
+one array pass. Curves are cached process-wide on the parameters and the
+scenario set, and shared, so their arrays are read-only.
+"""
+
+from typing import NamedTuple
+
+import numpy as np
+
+from climate_finance.cache import LRUCache, freeze
+from climate_finance.dcf import cumulative_discount_factors
+from climate_finance.scenarios import GDP_PATHS, SCENARIO_YEARS, interpolate_paths, log_consumption
+
+CURVE_CACHE = LRUCache(maxsize=64)
+
+
+class TermStructure(NamedTuple):
+    scenarios: list
+    maturities: np.ndarray
+    discount_factors: np.ndarray
+    zero_rates: np.ndarray
+    forward_rates: np.ndarray
+
+
+def _build(delta, gamma, gdp_paths, years, trend, step):
+    paths = interpolate_paths(years, gdp_paths, step)
+    log_c = log_consumption(paths.values, paths.years, trend)
+    discount = cumulative_discount_factors(log_c, paths.years, delta, gamma)
+    maturities = paths.years[1:] - paths.years[0]
+    log_p = np.log(discount)
+    curves = TermStructure(
+        scenarios=paths.scenarios,
+        maturities=maturities,
+        discount_factors=discount[:, 1:],
+        zero_rates=-log_p[:, 1:] / maturities,
+        forward_rates=-np.diff(log_p, axis=1) / step,
+    )
+    for array in curves[1:]:
+        array.setflags(write=False)
+    return curves
+
+
+def term_structure(delta, gamma, gdp_paths=GDP_PATHS, years=SCENARIO_YEARS, trend=0.02, step=1.0):
+    """Zero-coupon curves for every scenario of ``gdp_paths``.
+
+    ``gdp_paths`` maps scenario names to GDP losses (%) at ``years``; they
+    are interpolated every ``step`` years and added to a baseline log
+    consumption growth of ``trend`` per year. Rates are continuously
+    compounded; arrays are ``(scenarios, maturities)``.
+    """
+    # Scenario order fixes the row order of the curves, so it is part of the key.
+    key = (float(delta), float(gamma), freeze(list(gdp_paths.items())), tuple(years), float(trend), float(step))
+    return CURVE_CACHE.get_or_create(key, lambda: _build(delta, gamma, gdp_paths, years, trend, step))
+
+
+def expected_discount_factors(curves, probabilities):
+    """Zero-coupon prices before the scenario is known, ``Σ_s π_s P_s(τ)``."""
+    return np.asarray(probabilities, dtype=float) @ curves.discount_factors
@@ -1,9 +1,20 @@
 import streamlit as st
 import plotly.graph_objects as go
-import polars as pl
-from scipy.stats import gaussian_kde
 import numpy as np
 
+from climate_finance.cache import cache_summary, cached_figure
+from climate_finance.charts import scc_density_figure, scc_scatter_figure
+from climate_finance.dcf import dcf_value
+from climate_finance.maxent import maxent_probabilities
+from climate_finance.pricing import SCENARIO_PRICE_GRAPH
+from climate_finance.profiling import page_profiler, show_profile
+from climate_finance.scc import scc_version
+from climate_finance.scenarios import (EMISSIONS_PATHS, GDP_PATHS, SCENARIO_YEARS, TEMPERATURE_PATHS,
+                                       interpolate_paths, log_consumption)
+from climate_finance.tree import ScenarioTree
+
+profiler = page_profiler("Expected value pricing")
+
 st.title("Assigning Probabilities to Climate Scenarios")
 
 
@@ -44,96 +55,105 @@ r_a = 0.05    # Discount Rate in Green Transition (5%)
 cf_b = 50.0   # Cash Flow in Delayed Transition
 r_b = 0.10    # Discount Rate in Delayed Transition (10%)
 
-# Interactive slider for probability of State A
-prob_a = st.slider("Probability of State A", 0.0, 1.0, 0.5)
-prob_b = 1.0 - prob_a
-
-# Expected values
-expected_cf = prob_a * cf_a + prob_b * cf_b
-expected_r = prob_a * r_a + prob_b * r_b
-price = expected_cf / (1 + expected_r)
-
-# Show setup
-st.latex(r'''
-\mathbb{E}_t(CF_{t+1}) = \pi_A \cdot CF_A + \pi_B \cdot CF_B
-''')
-# Show setup
-st.latex(r'''
-\mathbb{E}_t(r_{t+1}) = \pi_A \cdot r_A + \pi_B \cdot r_B
-''')
-st.markdown(f"Where:  \n- $CF_A = {cf_a}$, $r_A = {r_a}$  \n- $CF_B = {cf_b}$, $r_B = {r_b}$  \n- $\pi_A = {prob_a:.2f}$, $\pi_B = {prob_b:.2f}$")
-
-# Show result
-st.markdown(f"\n$P_t = {price:.2f}$")
+# Only this block reruns when the slider moves
+@st.fragment
+def state_probability_pricing():
+    # Interactive slider for probability of State A
+    prob_a = st.slider("Probability of State A", 0.0, 1.0, 0.5)
+    prob_b = 1.0 - prob_a
+
+    # Expected values, recomputed only where an input changed
+    pricing = SCENARIO_PRICE_GRAPH.evaluate(
+        {"probabilities": [prob_a, prob_b], "cashflows": [cf_a, cf_b], "rates": [r_a, r_b]},
+        st.session_state.setdefault("scenario_price_memo", {}),
+    )
+    price = pricing.values["price"]
+
+    # Show setup
+    st.latex(r'''
+    \mathbb{E}_t(CF_{t+1}) = \pi_A \cdot CF_A + \pi_B \cdot CF_B
+    ''')
+    # Show setup
+    st.latex(r'''
+    \mathbb{E}_t(r_{t+1}) = \pi_A \cdot r_A + \pi_B \cdot r_B
+    ''')
+    st.markdown(f"Where:  \n- $CF_A = {cf_a}$, $r_A = {r_a}$  \n- $CF_B = {cf_b}$, $r_B = {r_b}$  \n- $\pi_A = {prob_a:.2f}$, $\pi_B = {prob_b:.2f}$")
+
+    # Show result
+    st.markdown(f"\n$P_t = {price:.2f}$")
+    if profiler.enabled:
+        st.caption(pricing.summary())
+
+
+state_probability_pricing()
 
 st.write("""
          In the context of climate risk, states of the world can be defined by different climate scenarios, leading to different outcomes 
          such as temperature changes, policy responses, and economic impacts.""")
 
+profiler.section("Scenario paths")
+
 import plotly.graph_objects as go
 
-# Simulated years
-years = list(range(2020, 2101, 10))
+# Simulated temperature (°C above pre-industrial), emissions (GtCO₂/year)
+# and GDP loss (% deviation from baseline) paths
+years = SCENARIO_YEARS
+temperature_paths = TEMPERATURE_PATHS
+emissions_paths = EMISSIONS_PATHS
+gdp_paths = GDP_PATHS
+
+@cached_figure
+def scenario_figure(years, paths, title, yaxis_title):
+    fig = go.Figure()
+    for scenario, values in paths.items():
+        fig.add_trace(go.Scatter(x=years, y=values, mode='lines', name=scenario))
+    fig.update_layout(
+        title=title,
+        xaxis_title="Year",
+        yaxis_title=yaxis_title,
+        template="plotly_white"
+    )
+    return fig
 
-# Simulated data for temperature (°C above pre-industrial)
-temperature_paths = {
-    'Net Zero 2050':     [1.2, 1.3, 1.4, 1.5, 1.5, 1.5, 1.5, 1.5, 1.5],
-    'Current Policies':  [1.2, 1.4, 1.6, 1.9, 2.2, 2.5, 2.8, 3.0, 3.2],
-    'Delayed Transition': [1.2, 1.4, 1.7, 2.0, 2.4, 2.7, 2.9, 3.0, 3.1],
-    'Hot House World':   [1.2, 1.5, 1.9, 2.4, 2.9, 3.4, 3.9, 4.3, 4.7],
-}
-
-# Simulated data for emissions (GtCO₂/year)
-emissions_paths = {
-    'Net Zero 2050':     [35, 30, 22, 15, 8, 2, 0, 0, 0],
-    'Current Policies':  [35, 36, 37, 38, 39, 40, 41, 42, 43],
-    'Delayed Transition': [35, 36, 35, 30, 25, 18, 10, 5, 0],
-    'Hot House World':   [35, 38, 42, 45, 47, 49, 50, 51, 52],
-}
-
-# Simulated GDP loss (% deviation from baseline)
-gdp_paths = {
-    'Net Zero 2050':     [0, -0.2, -0.4, -0.6, -0.8, -1.0, -1.2, -1.3, -1.4],
-    'Current Policies':  [0, -0.1, -0.3, -0.7, -1.2, -1.8, -2.5, -3.3, -4.0],
-    'Delayed Transition': [0, -0.2, -0.5, -1.0, -1.7, -2.4, -3.1, -3.8, -4.5],
-    'Hot House World':   [0, -0.3, -0.8, -1.6, -2.6, -3.7, -5.0, -6.4, -7.9],
-}
 
 # Plot 1: Temperature pathways
-fig_temp = go.Figure()
-for scenario, temps in temperature_paths.items():
-    fig_temp.add_trace(go.Scatter(x=years, y=temps, mode='lines', name=scenario))
-fig_temp.update_layout(
-    title="Temperature Increase by Scenario (°C above pre-industrial)",
-    xaxis_title="Year",
-    yaxis_title="Temperature (°C)",
-    template="plotly_white"
-)
-st.plotly_chart(fig_temp, use_container_width=True)
+fig_temp = scenario_figure(years, temperature_paths, "Temperature Increase by Scenario (°C above pre-industrial)", "Temperature (°C)")
+st.plotly_chart(profiler.figure(fig_temp), use_container_width=True)
 
 # Plot 2: Emissions pathways
-fig_emiss = go.Figure()
-for scenario, emissions in emissions_paths.items():
-    fig_emiss.add_trace(go.Scatter(x=years, y=emissions, mode='lines', name=scenario))
-fig_emiss.update_layout(
-    title="CO₂ Emissions by Scenario (GtCO₂/year)",
-    xaxis_title="Year",
-    yaxis_title="Emissions (GtCO₂/year)",
-    template="plotly_white"
-)
-st.plotly_chart(fig_emiss, use_container_width=True)
+fig_emiss = scenario_figure(years, emissions_paths, "CO₂ Emissions by Scenario (GtCO₂/year)", "Emissions (GtCO₂/year)")
+st.plotly_chart(profiler.figure(fig_emiss), use_container_width=True)
 
 # Plot 3: GDP deviation
-fig_gdp = go.Figure()
-for scenario, gdp_losses in gdp_paths.items():
-    fig_gdp.add_trace(go.Scatter(x=years, y=gdp_losses, mode='lines', name=scenario))
-fig_gdp.update_layout(
-    title="GDP Loss Relative to Baseline (%)",
-    xaxis_title="Year",
-    yaxis_title="GDP Loss (%)",
-    template="plotly_white"
+fig_gdp = scenario_figure(years, gdp_paths, "GDP Loss Relative to Baseline (%)", "GDP Loss (%)")
+st.plotly_chart(profiler.figure(fig_gdp), use_container_width=True)
+
+st.write(r"""
+         Each path is a full trajectory, so assets can be valued over the whole horizon rather than for one period. Interpolating 
+         the GDP paths to annual steps gives log consumption $c_{s,t}$ in every scenario, which compounds into the cumulative discount factor
+         """)
+
+st.latex(r"""M_{s,t} = e^{-\delta (t - t_0) - \gamma (c_{s,t} - c_{s,0})}, \qquad P_s = \sum_{t} M_{s,t} \, CF_{s,t}""")
+
+st.write(r"""
+         Below, two assets pay a yearly cashflow starting at 1 until 2100: the **exposed** asset's cashflow moves with consumption ($\beta = 1$), the 
+         **hedging** asset's against it ($\beta = -1$), with $\delta = 0.02$ and $\gamma = 2$.
+         """)
+
+annual = interpolate_paths(years, gdp_paths)
+dcf = dcf_value(
+    np.full(len(annual.scenarios), 1 / len(annual.scenarios)),
+    log_consumption(annual.values, annual.years),
+    annual.years,
+    cashflows=[1.0, 1.0],
+    betas=[1.0, -1.0],
+)
+st.dataframe(
+    {"Scenario": annual.scenarios, "Exposed asset": dcf.scenario_prices[0], "Hedging asset": dcf.scenario_prices[1]},
+    hide_index=True,
+    column_config={"Exposed asset": st.column_config.NumberColumn(format="%.2f"),
+                   "Hedging asset": st.column_config.NumberColumn(format="%.2f")},
 )
-st.plotly_chart(fig_gdp, use_container_width=True)
 
 st.write("""Much has been written on the construction and features of theses scenarios, but for the purpose of our discussion, the most 
          important feature is that, by design, they have not been associated any probabilistic estimate. We claim that, for 
@@ -171,7 +191,118 @@ st.write("""
          bring us close or beyond this temperature.""")
 
 
+profiler.section("Maximum-entropy probabilities")
+st.subheader("Maximum-Entropy Scenario Probabilities")
+
+st.write("""
+         Experts find it easier to express a view on a few summary quantities, such as the expected warming by the end of the century, 
+         than on the probability of each scenario. Given such an elicited expectation, we choose the scenario probabilities 
+         that match it while staying as close as possible to equal weights, i.e. the **maximum-entropy** distribution:
+         """)
+
+st.latex(r'''
+         \max_{\pi} -\sum_{s} \pi(s) \log \pi(s) \quad \text{s.t.} \quad \sum_{s} \pi(s) T_{2100}(s) = \mathbb{E}[T_{2100}], \quad \sum_{s} \pi(s) = 1
+         ''')
+
+scenarios = list(temperature_paths)
+warming_2100 = np.array([temperature_paths[name][-1] for name in scenarios])
+gdp_2100 = np.array([gdp_paths[name][-1] for name in scenarios])
+
+@cached_figure
+def probability_figure(scenarios, probabilities):
+    fig = go.Figure()
+    fig.add_trace(go.Bar(x=scenarios, y=probabilities))
+    fig.update_layout(
+        title="Maximum-Entropy Scenario Probabilities",
+        yaxis_title="Probability",
+        yaxis_range=[0, 1],
+        template="plotly_white"
+    )
+    return fig
+
+
+# Only this block reruns when the slider moves
+@st.fragment
+def maxent_scenario_probabilities():
+    expected_warming = st.slider("Expected warming by 2100 (°C)", 1.6, 4.6, 3.1, step=0.1)
+
+    # Warm-start from the multipliers of the previous rerun
+    solution = maxent_probabilities(warming_2100, expected_warming, initial=st.session_state.get("maxent_multipliers"))
+    if not solution.converged:
+        st.session_state.pop("maxent_multipliers", None)
+        st.warning(f"The probabilities matching an expected warming of {expected_warming:.1f}°C did not converge.")
+        return
+    st.session_state["maxent_multipliers"] = solution.multipliers
+    scenario_probs = solution.probabilities
+
+    fig_probs = probability_figure(scenarios, scenario_probs)
+    st.plotly_chart(profiler.figure(fig_probs), use_container_width=True)
+
+    st.markdown(f"Implied expected GDP loss in 2100: ${scenario_probs @ gdp_2100:.2f}\\%$")
+
+
+maxent_scenario_probabilities()
+
+profiler.section("Social cost of carbon")
 st.subheader("Social Cost of Carbon (SCC)")
 
+st.write("""
+         The social cost of carbon is the present value of the damages caused by emitting one additional tonne of carbon. 
+         The REEP meta-analysis collects the published estimates; each point below is one estimate, in 2010 US$ per tonne of carbon.
+         """)
+
+fig_scc = scc_scatter_figure(scc_version())
+st.plotly_chart(profiler.figure(fig_scc), use_container_width=True)
+
+st.write("""
+         Much of the dispersion comes from the pure rate of time preference (PRTP) assumed by each study: the lower the PRTP, 
+         the more weight is given to damages far in the future, and the higher the SCC. The densities below use the study weights of the meta-analysis.
+         """)
+
+# Built in the background once the introduction has rendered
+fig_scc_kde = scc_density_figure(scc_version())
+st.plotly_chart(profiler.figure(fig_scc_kde), use_container_width=True)
+
+st.subheader("The Relationship Between SCC and Abatement")
+
+st.write(r"""
+         Abatement is a choice made decade after decade, each time facing uncertain climate outcomes, so its consequences form a 
+         branching tree of scenarios rather than a handful of paths. Below, every decade until 2100 branches into a mild, central 
+         or severe climate outcome with probabilities 25%, 50% and 25%. Without abatement, log consumption grows by 0.25, 0.18 or 
+         0.00 per decade; abating costs 0.02 of growth in the mild and central outcomes but raises growth in the severe one to 0.10.
+         """)
+
+st.write(r"""
+         Each policy is priced by backward induction on its tree, applying the kernel $m = e^{-\delta - \gamma \Delta c}$ of page 02 
+         at every node ($\delta = 0.2$ per decade, $\gamma = 2$). Abatement raises expected consumption in 2100 and removes the worst 
+         outcomes; as consumption is less likely to fall, investors also value a safe payoff in 2100 less, i.e. long-term rates are higher.
+         """)
+
+abatement_policies = {
+    "No abatement": [0.25, 0.18, 0.00],
+    "Abatement": [0.23, 0.16, 0.10],
+}
 
-st.subheader("The Relationship Between SCC and Abatement")
\ No newline at end of file
+policy_rows = []
+for policy, growth in abatement_policies.items():
+    tree = ScenarioTree.branching([0.25, 0.5, 0.25], growth, depth=8)
+    final = tree.level(tree.depth)
+    # With delta = gamma = 0 the state prices are the path probabilities
+    path_probability = tree.state_prices(0.0, 0.0)
+    state_prices = tree.state_prices(0.2, 2.0)
+    policy_rows.append({
+        "Policy": policy,
+        "Tree nodes": tree.size,
+        "Expected consumption in 2100": path_probability[final] @ np.exp(tree.consumption[final]),
+        "Value of consumption stream": tree.price(0.2, 2.0, cashflow=np.exp(tree.consumption))[0],
+        "Price of 1 paid in 2100": state_prices[final].sum(),
+    })
+
+st.dataframe(policy_rows, hide_index=True, column_config={
+    name: st.column_config.NumberColumn(format="%.3f")
+    for name in ["Expected consumption in 2100", "Value of consumption stream", "Price of 1 paid in 2100"]
+})
+
+st.sidebar.caption(cache_summary())
+
+show_profile(profiler)
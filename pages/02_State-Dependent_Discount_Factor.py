@@ -2,6 +2,19 @@ import streamlit as st
 import plotly.graph_objects as go
 import numpy as np
 
+from climate_finance.cache import cache_summary, cached_figure
+from climate_finance.charts import line_chart, sensitivity_heatmap
+from climate_finance.epstein_zin import solve_epstein_zin
+from climate_finance.montecarlo import simulate_price
+from climate_finance.pricing import STATE_PRICE_GRAPH, climate_cashflows, state_price
+from climate_finance.profiling import page_profiler, show_profile
+from climate_finance.quadrature import quadrature_price
+from climate_finance.sdf import crra_sdf, crra_sdf_approx, risk_free_rate_approx
+from climate_finance.sensitivity import STATE_PRICE_AXES, state_price_cube
+from climate_finance.term_structure import term_structure
+
+profiler = page_profiler("Utility functions")
+
 st.title("State-Dependent Discount Factor")
 
 st.write(r"""We describe what the investor wants by a **utility function**:
@@ -29,31 +42,41 @@ u(c) = \log(c); \quad u'(c) = \frac{1}{c}
 
 # Define consumption range
 c = np.linspace(0.1, 3, 500)
-u_c = np.log(c)
-u_prime_c = 1 / c
 
-# Create log utility function chart
-fig1 = go.Figure()
-fig1.add_trace(go.Scatter(x=c, y=u_c, mode='lines', name='u(c) = log(c)'))
-fig1.update_layout(title='Log Utility Function', xaxis_title='Consumption (c)', yaxis_title='Utility')
 
-# Create marginal utility function chart
-fig2 = go.Figure()
-fig2.add_trace(go.Scatter(x=c, y=u_prime_c, mode='lines', name="u'(c) = 1/c"))
-fig2.update_layout(title='Marginal Utility Function', xaxis_title='Consumption (c)', yaxis_title='Marginal Utility')
+@cached_figure
+def log_utility_figure(c):
+    # Create log utility function chart
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(x=c, y=np.log(c), mode='lines', name='u(c) = log(c)'))
+    fig.update_layout(title='Log Utility Function', xaxis_title='Consumption (c)', yaxis_title='Utility')
+    return fig
+
+
+@cached_figure
+def log_marginal_utility_figure(c):
+    # Create marginal utility function chart
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(x=c, y=1 / c, mode='lines', name="u'(c) = 1/c"))
+    fig.update_layout(title='Marginal Utility Function', xaxis_title='Consumption (c)', yaxis_title='Marginal Utility')
+    return fig
+
+
+fig1 = log_utility_figure(c)
+fig2 = log_marginal_utility_figure(c)
 
 
 st.write(r"""The utility level $u(c)$ is the satisfaction or **happiness** that the investor derives from consuming $c$.
          """)
 # Display charts in Streamlit
-st.plotly_chart(fig1)
+st.plotly_chart(profiler.figure(fig1))
 
 st.write(r"""The marginal utility $u'(c)$ is the **additional satisfaction** or happiness that the investor derives from **consuming an additional unit of $c$**.
          It is the slope of the utility function at a given point. 
          At any point on the x-axis, the y-axis tells you how much extra happiness you get from consuming one more unit at that level.
 The more you already consume, the less valuable one more unit becomes.""")
 
-st.plotly_chart(fig2)
+st.plotly_chart(profiler.figure(fig2))
 
 st.write(r"""
          A more useful functional form generalizes log: it lets us adjust the **curvature of the utility function (i.e., risk aversion)**:
@@ -77,36 +100,22 @@ This behavior plays a key role in how future, risky payoffs are valued in asset
 # Gamma values to plot
 gamma_values = [0.5, 1, 2, 5, 20]
 
-# Plotly figure for utility
-fig_utility = go.Figure()
-for gamma in gamma_values:
-    if gamma == 1:
-        u_c = np.log(c)
-    else:
-        u_c = (c ** (1 - gamma)) / (1 - gamma) 
-    fig_utility.add_trace(go.Scatter(x=c, y=u_c, mode='lines', name=f'γ = {gamma}'))
-
-fig_utility.update_layout(
-    title="CRRA Utility Function",
-    xaxis_title="Consumption (c)",
-    yaxis_title="Utility u(c)",
-    yaxis_range=[-5, 5]
-)
-
-# Plotly figure for marginal utility
-fig_marginal = go.Figure()
-for gamma in gamma_values:
-    u_prime_c = c ** (-gamma)
-    fig_marginal.add_trace(go.Scatter(x=c, y=u_prime_c, mode='lines', name=f'γ = {gamma}'))
-
-fig_marginal.update_layout(
-    title="CRRA Marginal Utility Function",
-    xaxis_title="Consumption (c)",
-    yaxis_title="Marginal Utility u'(c)",
-    yaxis_range=[0, 3]
-)
+# 500-point curves, downsampled to the chart's point budget
+@cached_figure
+def crra_marginal_utility_figure(c, gamma_values):
+    return line_chart(
+        c,
+        {f'γ = {gamma}': c ** (-gamma) for gamma in gamma_values},
+        title="CRRA Marginal Utility Function",
+        x_title="Consumption (c)",
+        y_title="Marginal Utility u'(c)",
+        y_range=[0, 3],
+    )
+
+
+fig_marginal = crra_marginal_utility_figure(c, gamma_values)
 # Display charts in Streamlit
-st.plotly_chart(fig_marginal)
+st.plotly_chart(profiler.figure(fig_marginal))
 
 
 st.write(r"""
@@ -185,20 +194,33 @@ The stochastic discount factor $m_{t+1}$ tells us how much the investor values a
 
 This captures **risk aversion**: investors value payoffs more in bad times.
 """)
+profiler.section("Discount factor calculator")
+
 # Fixed parameters
 delta = 0.03
 gamma = 2.0
 
-# User input: consumption growth
-delta_c = st.slider("Consumption growth (Δcₜ₊₁)", min_value=-0.1, max_value=0.1, value=0.02, step=0.01)
+# Only this block reruns when the slider moves; a fragment rerun reuses
+# these arguments, while module-level names may have been reassigned.
+@st.fragment
+def sdf_calculator(delta, gamma):
+    # User input: consumption growth
+    delta_c = st.slider("Consumption growth (Δcₜ₊₁)", min_value=-0.1, max_value=0.1, value=0.02, step=0.01)
+
+    # Compute m_{t+1}
+    m_approx = crra_sdf_approx(delta_c, delta, gamma)
 
-# Compute m_{t+1}
-m_approx = 1 - delta - gamma * delta_c
+    # Display computation
+    st.latex(rf"m_{{t+1}} \approx 1 - {delta} - {gamma} \times {delta_c} = {m_approx:.3f}")
 
-# Display computation
-st.latex(rf"m_{{t+1}} \approx 1 - {delta} - {gamma} \times {delta_c} = {m_approx:.3f}")
+    # Exact CRRA kernel, with beta = exp(-delta)
+    m_exact = crra_sdf(delta_c, delta, gamma)
+    st.latex(rf"m_{{t+1}} = e^{{-{delta} - {gamma} \times {delta_c}}} = {m_exact:.3f}")
 
 
+sdf_calculator(delta, gamma)
+
+profiler.section("Risk-free rate")
 st.subheader("Risk-free Rate")
 
 st.write(r"""The risk-free rate is the return on a risk-free asset, such as government bonds. Assuming we pay 1 dollar today to obtain $R^f$:""")
@@ -223,41 +245,54 @@ gamma = 2.0
 # Define a range of expected consumption growth values
 expected_dc = np.linspace(-0.05, 0.05, 500)
 
-# Compute risk-free rate using the approximation
-rf_rate = 1 + delta + gamma * expected_dc
 
-# Plot
-fig = go.Figure()
-fig.add_trace(go.Scatter(x=expected_dc, y=rf_rate, mode='lines', name=r"$R^f_t$"))
-fig.update_layout(
-    title="Risk-Free Rate vs. Expected Consumption Growth",
-    xaxis_title=r"Expected Consumption Growth",
-    yaxis_title=r"Risk-Free Rate",
-    showlegend=False
-)
+@cached_figure
+def risk_free_figure(expected_dc, delta, gamma):
+    # Compute risk-free rate using the approximation
+    rf_rate = risk_free_rate_approx(expected_dc, delta, gamma)
+
+    # Plot
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(x=expected_dc, y=rf_rate, mode='lines', name=r"$R^f_t$"))
+    fig.update_layout(
+        title="Risk-Free Rate vs. Expected Consumption Growth",
+        xaxis_title=r"Expected Consumption Growth",
+        yaxis_title=r"Risk-Free Rate",
+        showlegend=False
+    )
+    return fig
+
+
+@cached_figure
+def risk_free_damages_figure(expected_dc, delta, gamma):
+    rf_rate = risk_free_rate_approx(expected_dc, delta, gamma)
+
+    fig_dam = go.Figure()
+    fig_dam.add_trace(go.Scatter(x=expected_dc, y=rf_rate, mode='lines', name=r"$R^f_t$"))
 
-st.plotly_chart(fig)
+    # Add annotations for physical damages and abatement
+    fig_dam.add_vline(x=-0.03, line=dict(color='red', dash='dash'), name='Physical Damages')
+    fig_dam.add_annotation(x=-0.03, y=risk_free_rate_approx(-0.03, delta, gamma), text="Physical Damages\n↓ consumption growth\n↓ Risk-Free Rate", 
+                       showarrow=True, arrowhead=1, ax=-60, ay=40, bgcolor='white')
 
+    fig_dam.add_vline(x=0.03, line=dict(color='green', dash='dash'), name='Abatement in Good Times')
+    fig_dam.add_annotation(x=0.03, y=risk_free_rate_approx(0.03, delta, gamma), text="Abatement\n↑ consumption growth\n↑ Risk-Free Rate", 
+                       showarrow=True, arrowhead=1, ax=60, ay=-40, bgcolor='white')
 
-fig_dam = go.Figure()
-fig_dam.add_trace(go.Scatter(x=expected_dc, y=rf_rate, mode='lines', name=r"$R^f_t$"))
+    # Final chart formatting
+    fig_dam.update_layout(
+        title="Risk-Free Rate Response to Expected Consumption Growth",
+        xaxis_title=r"Expected Consumption Growth",
+        yaxis_title=r"Risk-Free Rate",
+        showlegend=False
+    )
+    return fig_dam
 
-# Add annotations for physical damages and abatement
-fig_dam.add_vline(x=-0.03, line=dict(color='red', dash='dash'), name='Physical Damages')
-fig_dam.add_annotation(x=-0.03, y=1 + delta + gamma * (-0.03), text="Physical Damages\n↓ consumption growth\n↓ Risk-Free Rate", 
-                   showarrow=True, arrowhead=1, ax=-60, ay=40, bgcolor='white')
 
-fig_dam.add_vline(x=0.03, line=dict(color='green', dash='dash'), name='Abatement in Good Times')
-fig_dam.add_annotation(x=0.03, y=1 + delta + gamma * (0.03), text="Abatement\n↑ consumption growth\n↑ Risk-Free Rate", 
-                   showarrow=True, arrowhead=1, ax=60, ay=-40, bgcolor='white')
+fig = risk_free_figure(expected_dc, delta, gamma)
+st.plotly_chart(profiler.figure(fig))
 
-# Final chart formatting
-fig_dam.update_layout(
-    title="Risk-Free Rate Response to Expected Consumption Growth",
-    xaxis_title=r"Expected Consumption Growth",
-    yaxis_title=r"Risk-Free Rate",
-    showlegend=False
-)
+fig_dam = risk_free_damages_figure(expected_dc, delta, gamma)
 
 st.write("""So, what does it means in the context of climate change?
 **Physical damages are expected to lower consumption growth, 
@@ -265,7 +300,7 @@ st.write("""So, what does it means in the context of climate change?
 **Abatement is expected to be higher in good times,
          so we expect higher risk-free rate.**""")
 
-st.plotly_chart(fig_dam)
+st.plotly_chart(profiler.figure(fig_dam))
 
 st.write(r"""What does it implies for valuation of assets? It means that **physical damages** will **impact more the valuation of risky assets than abatement**, 
          because physical damages are expected to lower consumption growth, which leads to lower risk-free rate (i.e., lower discounting of future cash flows),
@@ -273,6 +308,34 @@ st.write(r"""What does it implies for valuation of assets? It means that **physi
          """)
 
 
+st.write(r"""
+         The same reasoning holds at every horizon. Along the consumption path of each climate scenario of page 01, a zero-coupon 
+         bond maturing in $\tau$ years is worth $P_s(\tau) = e^{-\delta \tau - \gamma (c_{s,\tau} - c_{s,0})}$, which gives a 
+         full yield curve per scenario: **the larger the expected damages, the lower the long-term rates**.
+         """)
+
+# Warmed in the background for the default δ and γ
+curves = term_structure(delta, gamma)
+
+
+@cached_figure
+def yield_curve_figure(scenarios, maturities, zero_rates):
+    fig = go.Figure()
+    for scenario, rates in zip(scenarios, zero_rates):
+        fig.add_trace(go.Scatter(x=maturities, y=100 * rates, mode='lines', name=scenario))
+    fig.update_layout(
+        title="Risk-Free Zero Rates by Climate Scenario",
+        xaxis_title="Maturity (years)",
+        yaxis_title="Zero rate (%)",
+        template="plotly_white"
+    )
+    return fig
+
+
+st.plotly_chart(profiler.figure(yield_curve_figure(curves.scenarios, curves.maturities, curves.zero_rates)), use_container_width=True)
+
+
+profiler.section("Risk premium")
 st.subheader("Risk Premium")
 
 st.write(r"""Now how to value risky assets?""")
@@ -310,63 +373,139 @@ Suppose there are two possible states of the world tomorrow, each equally likely
 An asset pays a cash flow $CF_{t+1}$ that depends on the state:
 """)
 
-scenario = st.radio(
-    "Choose the asset type:",
-    options=["Pays more in good times", "Pays more in bad times"]
-)
+# Only this block reruns when the asset type changes
+@st.fragment
+def two_state_pricing():
+    scenario = st.radio(
+        "Choose the asset type:",
+        options=["Pays more in good times", "Pays more in bad times"]
+    )
+
+    # Fixed pricing kernel
+    m_u = 0.5  # good times → low marginal utility
+    m_d = 1.0  # bad times → high marginal utility
+
+    # Set cash flows
+    if scenario == "Pays more in good times":
+        x_u, x_d = 2.0, 1.0
+    else:
+        x_u, x_d = 1.0, 2.0
+
+    # Asset price, risk-free rate R^f = 1 / E[m] and implied return; switching
+    # the asset leaves the risk-free rate untouched
+    pricing = STATE_PRICE_GRAPH.evaluate(
+        {"probabilities": [0.5, 0.5], "discount_factors": [m_u, m_d], "cashflows": [x_u, x_d]},
+        st.session_state.setdefault("state_price_memo", {}),
+    )
+    price, expected_x, risk_free, expected_return, risk_premium = (
+        pricing.values[name] for name in ("price", "expected_x", "risk_free", "expected_return", "risk_premium")
+    )
+
+    # Show setup
+    st.latex(r'''
+    P_t = \mathbb{E}[m_{t+1} CF_{t+1}] = \frac{1}{2} m_u CF_{u} + \frac{1}{2} m_d CF_d
+    ''')
+    st.markdown(f"- $CF_u = {x_u}$, $CF_d = {x_d}$  \n- $m_u = {m_u}$, $m_d = {m_d}$")
+
+    st.latex(f"\\mathbb{{E}}[CF_{{t+1}}] = {expected_x:.2f} \\quad \\text{{ and }} \\quad p_t = {price:.2f}")
+
+    st.latex(f"\\text{{Expected return}} = \\frac{{\\mathbb{{E}}[CF_{{t+1}}]}}{{p_t}} = {expected_return:.2f}")
+    st.latex(f"\\text{{Risk-free rate}} = R^f = {risk_free:.2f}")
+    st.latex(f"\\textbf{{Risk premium}} = {expected_return:.2f} - {risk_free:.2f} = {risk_premium:.2f}")
+
+    if scenario == "Pays more in bad times":
+        st.success("This asset pays off in bad states → negative covariance with $m_{t+1}$ → **lower risk premium** → **higher price**.")
+    else:
+        st.error("This asset pays off in good states → positive covariance with $m_{t+1}$ → **higher risk premium** → **lower price**.")
+    if profiler.enabled:
+        st.caption(pricing.summary())
+
+
+two_state_pricing()
+
+st.write("""
+Even though expected cash flow and volatility are the same, **the asset is worth more when it pays in bad times**, because cash flows are more valuable when $m_{t+1}$ is high (i.e., in bad states of the world).
+""")
+
+st.write(r"""
+         With the exact kernel $m_s = e^{-\delta - \gamma \Delta c_s}$, the same asset can be priced for every combination of risk 
+         aversion, impatience and probability of good times at once. Good times have consumption growth of 3%, bad times of -2%, 
+         and the asset pays 2 in good times and 1 in bad times.
+         """)
 
-# Fixed pricing kernel
-m_u = 0.5  # good times → low marginal utility
-m_d = 1.0  # bad times → high marginal utility
+# 200 x 200 x 49 grid, computed once per machine (and warmed in the background);
+# the heatmap draws a 50 x 50 sample of each slice
+sensitivity_axes = STATE_PRICE_AXES
 
-# Risk-free rate: E[m] = 0.5*(m_u + m_d)
-rf_inverse = 1 / (0.5 * (m_u + m_d))
 
-# Set cash flows
-if scenario == "Pays more in good times":
-    x_u, x_d = 2.0, 1.0
-else:
-    x_u, x_d = 1.0, 2.0
+@cached_figure
+def sensitivity_figure(gamma_grid, delta_grid, surface, measure, probability):
+    return sensitivity_heatmap(
+        delta_grid, gamma_grid, surface, "Rate of time preference δ", "Risk aversion γ", measure,
+        title=f"{measure} with a probability of good times of {probability:.2f}",
+    )
 
-# Expected payoff
-expected_x = 0.5 * (x_u + x_d)
 
-# Expected m
-expected_m = 0.5 * (m_u + m_d)
+# Only the slice changes when the controls move; the cube is memoized
+@st.fragment
+def sensitivity_surface():
+    measure = st.radio("Surface", ["Risk premium", "Price"], horizontal=True)
+    probability = st.select_slider(
+        "Probability of good times", options=sensitivity_axes[2].round(2).tolist(), value=0.5
+    )
+    cube = state_price_cube(*sensitivity_axes)
+    axes, surface = cube.slice(measure.lower().replace(" ", "_"), "probability", probability)
+    st.plotly_chart(
+        profiler.figure(sensitivity_figure(axes["gamma"], axes["delta"], surface, measure, probability)),
+        use_container_width=True,
+    )
 
-# Asset price
-price = 0.5 * m_u * x_u + 0.5 * m_d * x_d
 
-# Implied return
-expected_return = expected_x / price
-risk_premium = expected_return - rf_inverse
+sensitivity_surface()
 
-# Show setup
-st.latex(r'''
-P_t = \mathbb{E}[m_{t+1} CF_{t+1}] = \frac{1}{2} m_u CF_{u} + \frac{1}{2} m_d CF_d
-''')
-st.markdown(f"- $CF_u = {x_u}$, $CF_d = {x_d}$  \n- $m_u = {m_u}$, $m_d = {m_d}$")
+profiler.section("Recursive preferences")
+st.subheader("Recursive Preferences")
 
-st.latex(f"\\mathbb{{E}}[CF_{{t+1}}] = {expected_x:.2f} \\quad \\text{{ and }} \\quad p_t = {price:.2f}")
+st.write(r"""
+         With CRRA utility, $\gamma$ sets both risk aversion and the willingness to substitute consumption over time (the elasticity 
+         of intertemporal substitution is $\psi = 1/\gamma$). Climate asset pricing models generally use Epstein-Zin preferences, 
+         which separate the two:
+         """)
 
-st.latex(f"\\text{{Expected return}} = \\frac{{\\mathbb{{E}}[CF_{{t+1}}]}}{{p_t}} = {expected_return:.2f}")
-st.latex(f"\\text{{Risk-free rate}} = R^f = {rf_inverse:.2f}")
-st.latex(f"\\textbf{{Risk premium}} = {expected_return:.2f} - {rf_inverse:.2f} = {risk_premium:.2f}")
+st.latex(r"""V_t = \left[(1 - \beta) c_t^{1 - 1/\psi} + \beta \, \mathbb{E}_t\left[V_{t+1}^{1-\gamma}\right]^{\frac{1 - 1/\psi}{1 - \gamma}}\right]^{\frac{1}{1 - 1/\psi}}""")
 
-if scenario == "Pays more in bad times":
-    st.success("This asset pays off in bad states → negative covariance with $m_{t+1}$ → **lower risk premium** → **higher price**.")
-else:
-    st.error("This asset pays off in good states → positive covariance with $m_{t+1}$ → **higher risk premium** → **lower price**.")
+st.latex(r"""m_{t+1} = \beta \left(\frac{c_{t+1}}{c_t}\right)^{-1/\psi} \left(\frac{V_{t+1}}{\mathbb{E}_t\left[V_{t+1}^{1-\gamma}\right]^{1/(1-\gamma)}}\right)^{1/\psi - \gamma}""")
 
-st.write("""
-Even though expected cash flow and volatility are the same, **the asset is worth more when it pays in bad times**, because cash flows are more valuable when $m_{t+1}$ is high (i.e., in bad states of the world).
-""")
+st.write(r"""
+         The value function is solved on the good/bad consumption growth states above (3% and -2%, equally likely) with 
+         $\gamma = 10$ and $\beta = e^{-0.02}$. For $\psi = 1/\gamma$ it is the CRRA case. A higher $\psi$ makes investors 
+         more willing to shift consumption over time, which lowers the risk-free rate, while the premium of the asset paying 2 in good 
+         times and 1 in bad times depends mostly on $\gamma$.
+         """)
+
+ez_growth = np.array([0.03, -0.02])
+ez_transition = np.full((2, 2), 0.5)
+ez_rows = []
+for psi in [0.1, 0.5, 1.0, 1.5]:
+    ez = solve_epstein_zin(ez_growth, ez_transition, gamma=10.0, psi=psi, beta=np.exp(-0.02))
+    ez_pricing = state_price(ez_transition[0], ez.sdf[0], [2.0, 1.0])
+    ez_rows.append({
+        "EIS ψ": "0.1 (CRRA)" if psi == 0.1 else f"{psi}",
+        "Risk-free rate": ez_pricing.risk_free - 1,
+        "Risk premium": ez_pricing.risk_premium,
+    })
+
+st.dataframe(ez_rows, hide_index=True, column_config={
+    "Risk-free rate": st.column_config.NumberColumn(format="percent"),
+    "Risk premium": st.column_config.NumberColumn(format="percent"),
+})
 
 st.write("""
          In the context of climate risk, it means we should take into account how the cashflows of different assets may **covary** with climate risk.
          """)
+profiler.section("Climate cashflows")
+
 import numpy as np
-import pandas as pd
 import plotly.graph_objects as go
 
 # Time horizon
@@ -377,62 +516,136 @@ gdp_loss = np.zeros_like(years, dtype=float)
 gdp_loss[years >= 2030] = -0.1 * (years[years >= 2030] - 2030)  # e.g. -0.1% per year from 2030
 gdp_loss = np.clip(gdp_loss, -5, 0)  # max 5% loss
 
-# Normalize GDP loss (absolute value) for cashflow simulation
-gdp_loss_abs = np.abs(gdp_loss)
-gdp_loss_norm = (gdp_loss_abs - gdp_loss_abs.min()) / (gdp_loss_abs.max() - gdp_loss_abs.min())
-
-# Simulate cashflows
-cf_hedging = 1 + 0.5 * gdp_loss_norm   # pays more as GDP loss increases
-cf_exposed = 1 - 0.5 * gdp_loss_norm   # pays less as GDP loss increases
-
-# Create figure
-fig = go.Figure()
-
-# GDP loss curve
-fig.add_trace(go.Scatter(
-    x=years, y=gdp_loss,
-    name="GDP Loss (%)",
-    mode="lines",
-    line=dict(color="black", dash="dot"),
-    yaxis="y1"
-))
-
-# Hedging asset
-fig.add_trace(go.Scatter(
-    x=years, y=cf_hedging,
-    name="Hedging Asset",
-    mode="lines",
-    line=dict(color="green"),
-    yaxis="y2"
-))
-
-# Exposed asset
-fig.add_trace(go.Scatter(
-    x=years, y=cf_exposed,
-    name="Exposed Asset",
-    mode="lines",
-    line=dict(color="brown"),
-    yaxis="y2"
-))
-
-# Layout with dual y-axes
-fig.update_layout(
-    title="Cashflows under Climate-Driven GDP Loss",
-    xaxis_title="Year",
-    yaxis=dict(
-        title="GDP Loss (%)",
-        side="left",
-        range=[-5.5, 0],
-        showgrid=False
-    ),
-    yaxis2=dict(
-        title="Asset Cashflows",
-        overlaying="y",
-        side="right",
-        showgrid=True
-    ),
-    legend_title="",
-    template="plotly_white"
-)
-
-st.plotly_chart(fig, use_container_width=True)
+# Simulate cashflows: the hedging asset pays more as GDP loss increases,
+# the exposed asset pays less
+cf_hedging, cf_exposed = climate_cashflows(gdp_loss)
+
+@cached_figure
+def climate_cashflows_figure(years, gdp_loss, cf_hedging, cf_exposed):
+    # Create figure
+    fig = go.Figure()
+
+    # GDP loss curve
+    fig.add_trace(go.Scatter(
+        x=years, y=gdp_loss,
+        name="GDP Loss (%)",
+        mode="lines",
+        line=dict(color="black", dash="dot"),
+        yaxis="y1"
+    ))
+
+    # Hedging asset
+    fig.add_trace(go.Scatter(
+        x=years, y=cf_hedging,
+        name="Hedging Asset",
+        mode="lines",
+        line=dict(color="green"),
+        yaxis="y2"
+    ))
+
+    # Exposed asset
+    fig.add_trace(go.Scatter(
+        x=years, y=cf_exposed,
+        name="Exposed Asset",
+        mode="lines",
+        line=dict(color="brown"),
+        yaxis="y2"
+    ))
+
+    # Layout with dual y-axes
+    fig.update_layout(
+        title="Cashflows under Climate-Driven GDP Loss",
+        xaxis_title="Year",
+        yaxis=dict(
+            title="GDP Loss (%)",
+            side="left",
+            range=[-5.5, 0],
+            showgrid=False
+        ),
+        yaxis2=dict(
+            title="Asset Cashflows",
+            overlaying="y",
+            side="right",
+            showgrid=True
+        ),
+        legend_title="",
+        template="plotly_white"
+    )
+    return fig
+
+
+fig = climate_cashflows_figure(years, gdp_loss, cf_hedging, cf_exposed)
+
+st.plotly_chart(profiler.figure(fig), use_container_width=True)
+
+
+profiler.section("Monte Carlo pricing")
+st.subheader("Pricing Climate-Exposed Cashflows by Simulation")
+
+st.write(r"""
+         The two-state example can be extended to continuous outcomes. Next period, the world is either in a **physical damages** state, 
+         with low and volatile consumption growth, or in an **abatement** state, with higher consumption growth. Within each state, 
+         consumption growth is normally distributed and the asset's cashflow moves with consumption growth with an elasticity $b$: 
+         $b > 0$ for the exposed asset, $b < 0$ for the hedging asset. Both assets have the same expected cashflow of 90.
+         """)
+
+st.write(r"""
+         We price them with the exact kernel $m_{t+1} = \beta (c_{t+1}/c_t)^{-\gamma}$ by Monte Carlo simulation, 
+         using antithetic draws and control variates to reduce the standard error.
+         """)
+
+# Physical damages vs abatement states
+mc_probabilities = [0.5, 0.5]
+mc_growth_mean = [-0.02, 0.03]
+mc_growth_vol = [0.04, 0.02]
+mc_cashflow_level = [90.0, 90.0]
+
+mc_assets = [("Hedging Asset", -2.0), ("Exposed Asset", 2.0)]
+
+mc_rows = []
+for asset, exposure in mc_assets:
+    mc = simulate_price(mc_probabilities, mc_growth_mean, mc_growth_vol, mc_cashflow_level,
+                        delta=0.02, gamma=2.0, cashflow_exposure=exposure, cashflow_vol=0.05,
+                        n_draws=200_000, seed=0)
+    quad = quadrature_price(mc_probabilities, mc_growth_mean, mc_growth_vol, mc_cashflow_level,
+                            delta=0.02, gamma=2.0, cashflow_exposure=exposure, cashflow_vol=0.05)
+    mc_rows.append({
+        "Asset": asset,
+        "Price": f"{mc.price:.3f} ± {mc.price_se:.3f}",
+        "Quadrature price": f"{quad.price:.3f}",
+        "Risk-free rate": f"{mc.risk_free:.4f}",
+        "Risk premium": f"{mc.risk_premium:.5f} ± {mc.risk_premium_se:.5f}",
+    })
+
+st.table(mc_rows)
+
+st.write(r"""
+         Because consumption growth and log cashflows are jointly normal within each state, the expectations $E[m]$ and 
+         $E[m \cdot CF]$ are also a weighted sum over a handful of Gauss-Hermite nodes, exact to machine precision. 
+         Quadrature prices a whole range of risk aversions in a single call:
+         """)
+
+
+@cached_figure
+def quadrature_premium_figure(probabilities, growth_mean, growth_vol, cashflow_level, assets, gamma_values):
+    # One call for every (γ, asset) pair: γ along rows, assets along columns
+    names = [asset for asset, _ in assets]
+    quad = quadrature_price(probabilities, growth_mean, growth_vol, cashflow_level,
+                            delta=0.02, gamma=gamma_values[:, None],
+                            cashflow_exposure=np.array([exposure for _, exposure in assets]), cashflow_vol=0.05)
+    return line_chart(
+        gamma_values,
+        {asset: 100 * quad.risk_premium[:, i] for i, asset in enumerate(names)},
+        title="Risk Premium by Quadrature",
+        x_title="Relative Risk Aversion (γ)",
+        y_title="Risk Premium (%)",
+    )
+
+
+fig = quadrature_premium_figure(mc_probabilities, mc_growth_mean, mc_growth_vol, mc_cashflow_level, mc_assets,
+                                np.linspace(0.0, 10.0, 201))
+st.plotly_chart(profiler.figure(fig), use_container_width=True)
+
+st.sidebar.caption(cache_summary())
+
+show_profile(profiler)
@@ -0,0 +1,83 @@
+import numpy as np
+import polars as pl
+import pytest
+import statsmodels.api as sm
+
+from climate_finance.betas import (
+    chunk_moments,
+    climate_betas,
+    estimate,
+    file_chunks,
+    frame_chunks,
+    rolling_climate_betas,
+)
+
+
+@pytest.fixture(scope="module")
+def panel():
+    # Heteroskedastic in the factor, with missing observations.
+    rng = np.random.default_rng(0)
+    x = rng.normal(0.01, 0.02, size=2_000)
+    slopes = np.linspace(-3.0, 3.0, 6)
+    y = 0.05 + np.outer(x, slopes) + rng.normal(size=(x.size, slopes.size)) * 0.01 * (1 + 50 * np.abs(x))[:, None]
+    y[rng.random(y.shape) < 0.02] = np.nan
+    return x, y
+
+
+def _chunks(x, y, size):
+    return [(x[i:i + size], y[i:i + size]) for i in range(0, x.size, size)]
+
+
+@pytest.mark.parametrize("cov_type", ["nonrobust", "HC0", "HC1"])
+def test_betas_match_statsmodels_ols(panel, cov_type):
+    x, y = panel
+    betas = climate_betas(_chunks(x, y, 137), cov_type)
+    for i in range(y.shape[1]):
+        valid = np.isfinite(y[:, i])
+        fit = sm.OLS(y[valid, i], sm.add_constant(x[valid])).fit(cov_type=cov_type)
+        np.testing.assert_allclose([betas.alpha[i], betas.beta[i]], fit.params, rtol=1e-9)
+        np.testing.assert_allclose([betas.alpha_se[i], betas.beta_se[i]], fit.bse, rtol=1e-8)
+        np.testing.assert_allclose(betas.r_squared[i], fit.rsquared, rtol=1e-8)
+
+
+def test_chunking_does_not_change_the_moments(panel):
+    x, y = panel
+    whole = estimate(chunk_moments(x, y), "HC0")
+    for size in (1, 7, 500):
+        chunked = climate_betas(_chunks(x, y, size), "HC0")
+        for expected, actual in zip(whole, chunked):
+            np.testing.assert_allclose(actual, expected, rtol=1e-9, atol=1e-15)
+
+
+def test_rolling_betas_match_each_window(panel):
+    x, y = panel
+    window, min_periods = 300, 50
+    results = list(rolling_climate_betas(_chunks(x, y, 250), window, "HC1", min_periods))
+    periods = np.concatenate([r.period for r in results])
+    beta = np.concatenate([r.betas.beta for r in results])
+    beta_se = np.concatenate([r.betas.beta_se for r in results])
+    np.testing.assert_array_equal(periods, np.arange(min_periods - 1, x.size))
+    for k in (0, 120, window - 1, window, 1_234, x.size - min_periods):
+        t = periods[k]
+        expected = estimate(chunk_moments(x[max(t + 1 - window, 0):t + 1], y[max(t + 1 - window, 0):t + 1]), "HC1")
+        np.testing.assert_allclose(beta[k], expected.beta, rtol=1e-8)
+        np.testing.assert_allclose(beta_se[k], expected.beta_se, rtol=1e-8)
+
+
+def test_frame_and_file_chunks_read_every_row_once(panel, tmp_path):
+    x, y = panel
+    assets = [f"asset_{i}" for i in range(y.shape[1])]
+    frame = pl.DataFrame({"growth": x, **{name: y[:, i] for i, name in enumerate(assets)}})
+    frame.write_parquet(tmp_path / "panel.parquet", row_group_size=300)
+    frame.write_csv(tmp_path / "panel.csv")
+    expected = climate_betas([(x, y)])
+    for chunks in (
+        frame_chunks(frame.lazy(), "growth", assets, chunk_rows=256),
+        file_chunks(tmp_path / "panel.parquet", "growth", assets, chunk_rows=256),
+        file_chunks(tmp_path / "panel.csv", "growth", assets, chunk_rows=256),
+    ):
+        chunks = list(chunks)
+        assert max(chunk_x.size for chunk_x, _ in chunks) <= 256
+        betas = climate_betas(chunks)
+        np.testing.assert_array_equal(betas.count, expected.count)
+        np.testing.assert_allclose(betas.beta, expected.beta, rtol=1e-9)
@@ -0,0 +1,44 @@
+import numpy as np
+import plotly.graph_objects as go
+import plotly.io as pio
+
+from climate_finance.cache import LRUCache, cached_figure
+
+
+def test_cached_figure_returns_independent_copies():
+    cache = LRUCache()
+    calls = []
+
+    @cached_figure(cache=cache)
+    def figure(x):
+        calls.append(x)
+        fig = go.Figure(go.Scatter(x=x, y=np.square(x), name="square"))
+        fig.update_layout(title="Squares")
+        return fig
+
+    x = np.linspace(0.0, 1.0, 50)
+    first = figure(x)
+    expected = pio.to_json(first)
+    first.update_layout(title="Changed")
+    first.data[0].name = "changed"
+    first.add_annotation(text="note")
+
+    second = figure(x)
+    assert len(calls) == 1
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert second is not first
+    assert pio.to_json(second) == expected
+
+
+def test_cached_figure_keys_on_arguments():
+    cache = LRUCache()
+
+    @cached_figure(cache=cache)
+    def figure(x, title):
+        return go.Figure(go.Scatter(x=x, y=x), layout={"title": title})
+
+    x = np.arange(5.0)
+    assert figure(x, "a").layout.title.text == "a"
+    assert figure(x, "b").layout.title.text == "b"
+    assert figure(x + 1, "a").data[0].x is not None
+    assert cache.misses == 3
@@ -0,0 +1,73 @@
+import numpy as np
+import plotly.graph_objects as go
+import pytest
+
+from climate_finance.charts import line_chart, lttb, sensitivity_heatmap
+
+
+def _reference_lttb(x, y, n_out):
+    # Steinarsson's original single-series loop.
+    every = (x.size - 2) / (n_out - 2)
+    keep, a = [0], 0
+    for i in range(n_out - 2):
+        start, end = int(i * every) + 1, int((i + 1) * every) + 1
+        next_start, next_end = end, min(int((i + 2) * every) + 1, x.size)
+        next_x, next_y = x[next_start:next_end].mean(), y[next_start:next_end].mean()
+        area = np.abs((x[a] - next_x) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (next_y - y[a]))
+        a = start + int(area.argmax())
+        keep.append(a)
+    keep.append(x.size - 1)
+    return np.array(keep)
+
+
+@pytest.fixture
+def noisy_series():
+    rng = np.random.default_rng(0)
+    x = np.sort(rng.uniform(0, 10, 5_000))
+    return x, np.vstack([np.sin(x) + rng.normal(0, 0.1, x.size), np.cumsum(rng.normal(size=x.size))])
+
+
+@pytest.mark.parametrize("n_out", [3, 10, 257, 1_000])
+def test_lttb_matches_reference(noisy_series, n_out):
+    x, y = noisy_series
+    keep = lttb(x, y, n_out)
+    assert keep.shape == (2, n_out)
+    assert (keep[:, 0] == 0).all() and (keep[:, -1] == x.size - 1).all()
+    assert (np.diff(keep, axis=1) > 0).all()
+    for row, series in zip(keep, y):
+        np.testing.assert_array_equal(row, _reference_lttb(x, series, n_out))
+
+
+def test_line_chart_downsamples_to_its_budget(noisy_series):
+    x, y = noisy_series
+    fig = line_chart(x, {"sine": y[0], "walk": y[1]}, max_points=600)
+    for trace, series in zip(fig.data, y):
+        assert len(trace.x) == 300
+        assert (trace.x[0], trace.x[-1]) == (x[0], x[-1])
+        assert (trace.y[0], trace.y[-1]) == (series[0], series[-1])
+
+
+def test_line_chart_keeps_short_series():
+    x = np.linspace(0, 1, 50)
+    fig = line_chart(x, {"square": x**2}, title="Short", max_points=1_000)
+    assert isinstance(fig.data[0], go.Scatter)
+    np.testing.assert_array_equal(fig.data[0].x, x)
+    np.testing.assert_array_equal(fig.data[0].y, x**2)
+    assert fig.layout.title.text == "Short"
+
+
+def test_heatmap_samples_large_surfaces_down():
+    x, y = np.linspace(0.0, 0.1, 200), np.linspace(0.0, 10.0, 180)
+    z = np.add.outer(y, 100 * x)
+    trace = sensitivity_heatmap(x, y, z, "x", "y", "z", max_side=50).data[0]
+    assert trace.z.shape == (50, 50) and trace.z.dtype == np.float32
+    assert (trace.x[0], trace.x[-1], trace.y[0], trace.y[-1]) == (x[0], x[-1], y[0], y[-1])
+    np.testing.assert_allclose(trace.z, np.add.outer(trace.y, 100 * trace.x), rtol=1e-6)
+
+
+def test_heatmap_keeps_small_surfaces():
+    x, y = np.arange(4.0), np.arange(3.0)
+    z = np.arange(12.0).reshape(3, 4)
+    trace = sensitivity_heatmap(x, y, z, "x", "y", "z").data[0]
+    np.testing.assert_array_equal(trace.x, x)
+    np.testing.assert_array_equal(trace.z, z)
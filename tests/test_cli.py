@@ -0,0 +1,58 @@
+import numpy as np
+import polars as pl
+import pytest
+
+from climate_finance.__main__ import main
+
+
+@pytest.fixture
+def positions(tmp_path):
+    path = tmp_path / "positions.csv"
+    pl.DataFrame({
+        "id": ["a", "b", "c"],
+        "cf_orderly": [100.0, 50.0, 80.0],
+        "cf_hot": [60.0, 70.0, 80.0],
+        "r_orderly": [0.05, 0.04, 0.03],
+        "r_hot": [0.07, 0.06, 0.03],
+    }).write_csv(path)
+    return path
+
+
+def test_prices_a_position_file(positions, tmp_path):
+    destination = tmp_path / "priced.parquet"
+    main(["price", str(positions), str(destination), "-p", "orderly=0.75", "-p", "hot=0.25"])
+    priced = pl.read_parquet(destination)
+    assert priced["id"].to_list() == ["a", "b", "c"]
+    expected_cashflow = 0.75 * np.array([100.0, 50.0, 80.0]) + 0.25 * np.array([60.0, 70.0, 80.0])
+    expected_rate = 0.75 * np.array([0.05, 0.04, 0.03]) + 0.25 * np.array([0.07, 0.06, 0.03])
+    np.testing.assert_allclose(priced["price"].to_numpy(), expected_cashflow / (1 + expected_rate))
+
+
+def test_prices_with_consumption_growth(positions, tmp_path):
+    destination = tmp_path / "priced.csv"
+    main(["price", str(positions), str(destination), "-p", "orderly=0.5", "-p", "hot=0.5",
+          "-g", "orderly=0.02", "-g", "hot=-0.03", "--delta", "0.01", "--gamma", "3"])
+    priced = pl.read_csv(destination)
+    m = np.exp(-0.01 - 3 * np.array([0.02, -0.03]))
+    np.testing.assert_allclose(priced["risk_free"].to_numpy(), 1 / m.mean())
+    np.testing.assert_allclose(priced["price"].to_numpy()[0], 0.5 * (m[0] * 100.0 + m[1] * 60.0))
+
+
+@pytest.mark.parametrize("args, message", [
+    (["-p", "orderly=0.5", "-p", "stranded=0.5"], "position file has no columns ['cf_stranded', 'r_stranded']"),
+    (["-p", "orderly=0.5", "-p", "hot=0.4"], "scenario probabilities sum to"),
+])
+def test_bad_input_exits_with_a_message(positions, tmp_path, capsys, args, message):
+    destination = tmp_path / "priced.parquet"
+    with pytest.raises(SystemExit) as exit_info:
+        main(["price", str(positions), str(destination), *args])
+    assert exit_info.value.code == 1
+    assert capsys.readouterr().err.startswith(f"error: {message}")
+    assert not destination.exists()
+
+
+def test_unsupported_destination(positions, tmp_path, capsys):
+    with pytest.raises(SystemExit) as exit_info:
+        main(["price", str(positions), str(tmp_path / "priced.xlsx"), "-p", "orderly=1"])
+    assert exit_info.value.code == 1
+    assert "expected a .parquet or .csv file" in capsys.readouterr().err
@@ -0,0 +1,90 @@
+import numpy as np
+import pytest
+
+from climate_finance.dcf import cumulative_discount_factors, dcf_value, value_cashflow_streams
+from climate_finance.pricing import state_price
+from climate_finance.sdf import crra_sdf
+
+
+@pytest.fixture
+def market():
+    rng = np.random.default_rng(0)
+    times = np.arange(2020.0, 2041.0)
+    # Log consumption relative to t_0 along 4 scenarios.
+    log_c = np.concatenate([np.zeros((4, 1)), np.cumsum(rng.normal(0.01, 0.02, (4, times.size - 1)), axis=1)], axis=1)
+    probabilities = rng.dirichlet(np.ones(4))
+    levels = rng.uniform(0.5, 2.0, 7)
+    betas = rng.normal(0.0, 1.0, 7)
+    growth = rng.normal(0.01, 0.01, 7)
+    return probabilities, log_c, times, levels, betas, growth
+
+
+def _loop_prices(probabilities, log_c, times, levels, betas, growth, delta, gamma, paid):
+    prices = np.zeros(levels.size)
+    for a in range(levels.size):
+        for s in range(log_c.shape[0]):
+            for t in range(1, times.size):
+                if not paid[t]:
+                    continue
+                elapsed = times[t] - times[0]
+                m = np.exp(-delta * elapsed - gamma * log_c[s, t])
+                cashflow = levels[a] * np.exp(growth[a] * elapsed + betas[a] * log_c[s, t])
+                prices[a] += probabilities[s] * m * cashflow
+    return prices
+
+
+def test_matches_a_loop_over_assets_scenarios_and_dates(market):
+    probabilities, log_c, times, levels, betas, growth = market
+    valuation = dcf_value(probabilities, log_c, times, levels, betas, growth, delta=0.03, gamma=3.0)
+    expected = _loop_prices(probabilities, log_c, times, levels, betas, growth, 0.03, 3.0, np.ones(times.size, bool))
+    np.testing.assert_allclose(valuation.prices, expected, rtol=1e-12)
+    np.testing.assert_allclose(valuation.discount_factors, cumulative_discount_factors(log_c, times, 0.03, 3.0))
+    np.testing.assert_allclose(valuation.scenario_prices @ probabilities, valuation.prices, rtol=1e-14)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 7, 4096])
+def test_chunk_size_does_not_change_the_prices(market, chunk_size):
+    probabilities, log_c, times, levels, betas, growth = market
+    reference = dcf_value(probabilities, log_c, times, levels, betas, growth)
+    chunked = dcf_value(probabilities, log_c, times, levels, betas, growth, chunk_size=chunk_size)
+    np.testing.assert_allclose(chunked.scenario_prices, reference.scenario_prices, rtol=1e-14)
+
+
+def test_payment_dates_mask_the_cashflows(market):
+    probabilities, log_c, times, levels, betas, growth = market
+    # Every fifth year, t_0 included: its cashflow is already in the price.
+    paid = (times - times[0]) % 5 == 0
+    valuation = dcf_value(probabilities, log_c, times, levels, betas, growth, payment_dates=paid)
+    after_t0 = paid.copy()
+    after_t0[0] = False
+    expected = _loop_prices(probabilities, log_c, times, levels, betas, growth, 0.02, 2.0, after_t0)
+    np.testing.assert_allclose(valuation.prices, expected, rtol=1e-12)
+    assert paid[0]
+
+
+def test_scenario_independent_cashflows(market):
+    probabilities, log_c, times, *_ = market
+    discount = cumulative_discount_factors(log_c, times, 0.02, 2.0)
+    coupons = np.stack([np.ones(times.size), np.linspace(0.0, 2.0, times.size)])
+    flat = value_cashflow_streams(probabilities, discount, coupons)
+    expanded = value_cashflow_streams(probabilities, discount, np.broadcast_to(coupons[:, None], (2, *discount.shape)))
+    np.testing.assert_allclose(flat.scenario_prices, expanded.scenario_prices, rtol=1e-14)
+    np.testing.assert_allclose(flat.prices, (coupons @ discount.T) @ probabilities, rtol=1e-14)
+
+
+def test_two_dates_reduce_to_the_one_period_formula():
+    # Page 02: P = E[m CF] with m_s = exp(-δ - γ Δc_s).
+    probabilities = np.array([0.3, 0.5, 0.2])
+    growth = np.array([0.03, 0.01, -0.04])
+    log_c = np.stack([np.zeros(3), growth], axis=1)
+    valuation = dcf_value(probabilities, log_c, [0.0, 1.0], [2.0, 1.0], betas=[0.0, 1.5], delta=0.02, gamma=2.0)
+    m = crra_sdf(growth, 0.02, 2.0)
+    assert valuation.prices[0] == pytest.approx(state_price(probabilities, m, 2.0 * np.ones(3)).price, rel=1e-14)
+    assert valuation.prices[1] == pytest.approx(state_price(probabilities, m, np.exp(1.5 * growth)).price, rel=1e-14)
+
+
+def test_float32_stays_close_to_float64(market):
+    probabilities, log_c, times, levels, betas, growth = market
+    single = dcf_value(probabilities, log_c, times, levels, betas, growth, dtype=np.float32)
+    assert single.scenario_prices.dtype == np.float32
+    np.testing.assert_allclose(single.prices, dcf_value(probabilities, log_c, times, levels, betas, growth).prices, rtol=1e-5)
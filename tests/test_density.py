@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+from scipy.stats import gaussian_kde
+
+from climate_finance.density import _convolve_same, bandwidth, binned_kde, evaluation_grid, weighted_binned_kde
+
+
+@pytest.mark.parametrize("bw_method", ["scott", "silverman", 0.3])
+def test_bandwidth_matches_gaussian_kde(bw_method):
+    samples = np.random.default_rng(0).lognormal(size=500)
+    weights = np.random.default_rng(1).random(500)
+    reference = gaussian_kde(samples, bw_method=bw_method, weights=weights)
+    assert bandwidth(samples, weights, bw_method) == pytest.approx(np.sqrt(reference.covariance[0, 0]), rel=1e-12)
+
+
+@pytest.mark.parametrize("kernel_size", [7, 511, 1023])
+def test_fft_convolution_matches_direct_convolution(kernel_size):
+    rng = np.random.default_rng(4)
+    counts, kernel = rng.random(512), rng.random(kernel_size)
+    start = (kernel_size - 1) // 2
+    expected = np.convolve(counts, kernel)[start:start + counts.size]
+    np.testing.assert_allclose(_convolve_same(counts, kernel), expected, rtol=1e-10, atol=1e-10)
+
+
+def test_binned_kde_matches_gaussian_kde():
+    rng = np.random.default_rng(2)
+    samples = np.concatenate([rng.normal(0.0, 1.0, 20_000), rng.normal(4.0, 0.5, 10_000)])
+    grid, density = binned_kde(samples, grid_size=2048)
+    reference = gaussian_kde(samples)(grid)
+    assert np.max(np.abs(density - reference)) < 1e-3 * reference.max()
+
+
+def test_weighted_binned_kde_matches_gaussian_kde_on_a_shared_grid():
+    rng = np.random.default_rng(3)
+    samples = np.log10(rng.lognormal(4.0, 1.5, 5_000))
+    weights = rng.random(samples.size)
+    grid = evaluation_grid(-2.5, 5.5, 1024)
+    _, density = weighted_binned_kde(samples, weights, grid=grid)
+    reference = gaussian_kde(samples, weights=weights)(grid)
+    assert np.max(np.abs(density - reference)) < 1e-3 * reference.max()
+    assert np.trapezoid(density, grid) == pytest.approx(1.0, abs=1e-3)
+
+
+@pytest.mark.parametrize("samples, weights", [
+    ([], None),
+    ([2.0], None),
+    ([3.0, 3.0, 3.0], None),
+    ([1.0, 2.0, 3.0], [0.0, 1.0, 0.0]),
+])
+def test_degenerate_samples_are_rejected(samples, weights):
+    with pytest.raises(ValueError, match="need at least two distinct samples"):
+        binned_kde(samples, weights=weights)
@@ -0,0 +1,80 @@
+import numpy as np
+import pytest
+
+from climate_finance.epstein_zin import solve_epstein_zin, tauchen
+
+BETA = 0.98
+
+
+@pytest.fixture(scope="module")
+def chain():
+    return tauchen(0.02, 0.03, 0.5, n=9)
+
+
+def test_tauchen_is_a_transition_matrix_with_the_ar1_mean(chain):
+    growth, transition = chain
+    assert np.allclose(transition.sum(axis=1), 1.0)
+    # Stationary distribution: left eigenvector for eigenvalue one.
+    values, vectors = np.linalg.eig(transition.T)
+    stationary = np.real(vectors[:, np.argmax(np.real(values))])
+    stationary /= stationary.sum()
+    assert stationary @ growth == pytest.approx(0.02, abs=1e-10)
+
+
+@pytest.mark.parametrize("gamma", [2.0, 5.0])
+def test_crra_kernel_when_psi_is_one_over_gamma(chain, gamma):
+    growth, transition = chain
+    solution = solve_epstein_zin(growth, transition, gamma, 1 / gamma, BETA)
+    assert solution.converged
+    expected = np.broadcast_to(BETA * np.exp(-gamma * growth), transition.shape)
+    np.testing.assert_allclose(solution.sdf, expected, rtol=1e-10)
+
+
+def test_iid_growth_has_a_closed_form_value(chain):
+    growth, transition = chain
+    iid = np.broadcast_to(transition[len(growth) // 2], transition.shape)
+    gamma, psi = 10.0, 1.5
+    solution = solve_epstein_zin(growth, iid, gamma, psi, BETA)
+    rho = 1 - 1 / psi
+    certainty = (iid[0] @ np.exp((1 - gamma) * growth)) ** (1 / (1 - gamma))
+    value = ((1 - BETA) / (1 - BETA * certainty**rho)) ** (1 / rho)
+    np.testing.assert_allclose(solution.value, value, rtol=1e-10)
+
+
+@pytest.mark.parametrize("gamma, psi", [(10.0, 1.0), (1.0, 1.5)])
+def test_unit_limits_are_continuous(chain, gamma, psi):
+    growth, transition = chain
+    exact = solve_epstein_zin(growth, transition, gamma, psi, BETA)
+    for eps in (1e-6, -1e-6):
+        near = solve_epstein_zin(growth, transition, gamma + eps * (psi != 1.0), psi + eps * (psi == 1.0), BETA)
+        np.testing.assert_allclose(near.value, exact.value, rtol=1e-5)
+        np.testing.assert_allclose(near.sdf, exact.sdf, rtol=1e-5)
+
+
+def test_anderson_acceleration_reaches_the_plain_fixed_point_faster():
+    growth, transition = tauchen(0.02, 0.03, 0.5, n=201)
+    accelerated = solve_epstein_zin(growth, transition, 10.0, 1.5, 0.99)
+    plain = solve_epstein_zin(growth, transition, 10.0, 1.5, 0.99, memory=1)
+    assert accelerated.converged and plain.converged
+    assert accelerated.iterations < plain.iterations / 10
+    np.testing.assert_allclose(accelerated.value, plain.value, rtol=1e-8)
+    np.testing.assert_allclose(accelerated.risk_free, 1 / np.sum(transition * accelerated.sdf, axis=1))
+
+
+@pytest.mark.filterwarnings("ignore::RuntimeWarning")
+def test_reports_no_convergence_without_a_finite_value(chain):
+    # β R^{1-1/ψ} > 1 for i.i.d. growth: utility is unbounded.
+    growth, transition = chain
+    iid = np.broadcast_to(transition[len(growth) // 2], transition.shape)
+    solution = solve_epstein_zin(growth, iid, 10.0, 1.5, 0.998, max_iter=500)
+    assert not solution.converged
+
+
+def test_rejects_invalid_inputs(chain):
+    growth, transition = chain
+    with pytest.raises(ValueError):
+        solve_epstein_zin(growth, transition[:, :-1], 2.0, 1.0, BETA)
+    with pytest.raises(ValueError):
+        solve_epstein_zin(growth, transition * 2, 2.0, 1.0, BETA)
+    with pytest.raises(ValueError):
+        solve_epstein_zin(growth, transition, 2.0, 1.0, 1.0)
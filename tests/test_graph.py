@@ -0,0 +1,80 @@
+import numpy as np
+import pytest
+
+from climate_finance.cache import freeze
+from climate_finance.graph import Graph
+
+
+@pytest.fixture
+def graph():
+    graph = Graph()
+
+    @graph.node
+    def sign(x):
+        return np.sign(x)
+
+    @graph.node
+    def scaled(sign, y):
+        return sign * y
+
+    @graph.node
+    def total(scaled):
+        return float(np.sum(scaled))
+
+    return graph
+
+
+def test_equal_inputs_reuse_every_node(graph):
+    memo = {}
+    first = graph.evaluate({"x": np.array([1.0, -2.0]), "y": 3.0}, memo)
+    assert first.ran == ["sign", "scaled", "total"] and first.reused == []
+    # A new array with the same contents has the same fingerprint.
+    second = graph.evaluate({"x": np.array([1.0, -2.0]), "y": 3.0}, memo)
+    assert second.ran == [] and second.reused == ["sign", "scaled", "total"]
+    assert freeze(np.array([1.0, -2.0])) == freeze(np.array([1.0, -2.0]))
+    assert second.values["total"] == first.values["total"] == 0.0
+
+
+def test_changed_input_invalidates_downstream_nodes(graph):
+    memo = {}
+    graph.evaluate({"x": np.array([1.0, -2.0]), "y": 3.0}, memo)
+    result = graph.evaluate({"x": np.array([1.0, 2.0]), "y": 3.0}, memo)
+    assert result.ran == ["sign", "scaled", "total"]
+    assert result.values["total"] == 6.0
+
+    result = graph.evaluate({"x": np.array([1.0, 2.0]), "y": 4.0}, memo)
+    assert result.ran == ["scaled", "total"] and result.reused == ["sign"]
+    assert result.values["total"] == 8.0
+
+
+def test_unchanged_node_value_stops_invalidation(graph):
+    memo = {}
+    graph.evaluate({"x": np.array([1.0, -2.0]), "y": 3.0}, memo)
+    # Same signs: sign reruns, returns the same value, and its dependents are reused.
+    result = graph.evaluate({"x": np.array([5.0, -0.5]), "y": 3.0}, memo)
+    assert result.ran == ["sign"] and result.reused == ["scaled", "total"]
+
+
+def test_outputs_only_compute_their_dependencies(graph):
+    result = graph.evaluate({"x": 2.0, "y": 3.0}, {}, outputs=["sign"])
+    assert result.ran == ["sign"] and list(result.values) == ["sign"]
+
+
+def test_graph_errors(graph):
+    with pytest.raises(KeyError):
+        graph.evaluate({"x": 1.0}, {})
+    with pytest.raises(ValueError, match="already defined"):
+        graph.node(graph.nodes["sign"][0])
+
+    cyclic = Graph()
+
+    @cyclic.node
+    def a(b):
+        return b
+
+    @cyclic.node
+    def b(a):
+        return a
+
+    with pytest.raises(ValueError, match="cycle"):
+        cyclic.evaluate({}, {})
@@ -0,0 +1,87 @@
+import numpy as np
+import pytest
+from scipy.interpolate import RegularGridInterpolator
+
+from climate_finance.hazard import HazardStore, TiledRaster
+
+
+def _grid(rows, cols, seed=0):
+    return np.random.default_rng(seed).random((rows, cols))
+
+
+def _reference(grid, bounds, lat, lon):
+    # Bilinear interpolation between cell centres, first row north.
+    rows, cols = grid.shape
+    west, south, east, north = bounds
+    dy, dx = (north - south) / rows, (east - west) / cols
+    centres_lat = north - dy * (np.arange(rows) + 0.5)
+    centres_lon = west + dx * (np.arange(cols) + 0.5)
+    interpolator = RegularGridInterpolator((centres_lat[::-1], centres_lon), grid[::-1])
+    return interpolator(np.column_stack([lat, lon]))
+
+
+def test_sample_matches_regular_grid_interpolator():
+    grid = _grid(100, 140)
+    bounds = (5.0, 40.0, 19.0, 50.0)
+    raster = TiledRaster.from_grid(grid, bounds, tile_size=16)
+    rng = np.random.default_rng(1)
+    # Inside the cell centres, where no clamping applies.
+    lat = rng.uniform(40.05, 49.95, 20_000)
+    lon = rng.uniform(5.05, 18.95, 20_000)
+    np.testing.assert_allclose(raster.sample(lat, lon, max_tiles=3), _reference(grid, bounds, lat, lon), rtol=1e-12)
+
+
+def test_points_beyond_the_cell_centres_are_clamped():
+    grid = _grid(20, 30)
+    raster = TiledRaster.from_grid(grid, (0.0, 0.0, 30.0, 20.0), tile_size=8)
+    np.testing.assert_allclose(raster.sample([19.99, 0.0, 10.5], [0.0, 29.99, -5.0]), [grid[0, 0], grid[-1, -1], grid[9, 0]])
+
+
+def test_global_grids_wrap_around_the_date_line():
+    grid = _grid(18, 36)
+    raster = TiledRaster.from_grid(grid, tile_size=8)
+    lat = np.full(5, 5.0)
+    lon = np.array([-180.0, -176.0, 176.0, 179.0, 180.0])
+    # Between the last and first columns, wrapped.
+    wrapped = np.concatenate([grid[:, -1:], grid, grid[:, :1]], axis=1)
+    expected = _reference(wrapped, (-190.0, -90.0, 190.0, 90.0), lat, lon)
+    np.testing.assert_allclose(raster.sample(lat, lon), expected, rtol=1e-12)
+
+
+def test_only_the_touched_tiles_are_read():
+    raster = TiledRaster.from_grid(_grid(64, 64), (0.0, 0.0, 64.0, 64.0), tile_size=16)
+    assert raster.tiles_touched([60.0, 59.0, 1.0], [1.0, 2.0, 63.0]) == (2, 16)
+
+
+def test_store_round_trip_and_atomic_overwrite(tmp_path):
+    store = HazardStore(tmp_path)
+    first, second = _grid(40, 60, seed=2), _grid(40, 60, seed=3)
+    store.write("flood", "ssp585", 2050, first, tile_size=16)
+    with pytest.raises(FileExistsError):
+        store.write("flood", "ssp585", 2050, second, tile_size=16)
+
+    lat, lon = np.array([10.0, -45.0]), np.array([20.0, 100.0])
+    old = store.raster("flood", "ssp585", 2050)
+    before = old.sample(lat, lon)
+    np.testing.assert_allclose(before, TiledRaster.from_grid(first, tile_size=16).sample(lat, lon), rtol=1e-6)
+
+    for seed in (3, 4, 5):
+        store.write("flood", "ssp585", 2050, _grid(40, 60, seed=seed), tile_size=16, overwrite=True)
+    latest = TiledRaster.from_grid(_grid(40, 60, seed=5), tile_size=16).sample(lat, lon)
+    np.testing.assert_allclose(store.sample("flood", "ssp585", 2050, lat, lon), latest, rtol=1e-6)
+    # A raster mapped before the overwrite keeps reading its own data.
+    np.testing.assert_allclose(old.sample(lat, lon), before)
+    # The current version and the one before it are kept.
+    assert len(list((tmp_path / "flood" / "ssp585" / "2050").glob("v*"))) == 2
+    assert store.keys("flood") == [("ssp585", 2050)]
+
+
+def test_sample_paths_locates_points_once_per_geometry(tmp_path):
+    store = HazardStore(tmp_path)
+    grids = {(s, y): _grid(30, 60, seed=i) for i, (s, y) in enumerate([("a", 2030), ("a", 2050), ("b", 2030), ("b", 2050)])}
+    for (scenario, year), grid in grids.items():
+        store.write("heat", scenario, year, grid, tile_size=16)
+    lat, lon = np.array([0.0, 30.0, -60.0]), np.array([0.0, 90.0, -150.0])
+    paths = store.sample_paths("heat", ["a", "b"], [2030, 2050], lat, lon)
+    assert paths.shape == (2, 2, 3)
+    np.testing.assert_allclose(paths[1, 0], store.sample("heat", "b", 2030, lat, lon))
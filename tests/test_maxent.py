@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+from scipy.optimize import minimize
+from scipy.special import logsumexp
+
+from climate_finance.maxent import maxent_probabilities
+
+
+@pytest.fixture(scope="module")
+def scenarios():
+    rng = np.random.default_rng(0)
+    warming = rng.uniform(1.0, 5.0, 5_000)
+    damages = 0.5 * warming**2 + rng.normal(0.0, 1.0, warming.size)
+    prior = rng.dirichlet(np.ones(warming.size))
+    return np.stack([warming, damages]), prior
+
+
+def test_matches_a_direct_minimization_of_the_dual(scenarios):
+    features, prior = scenarios
+    targets = np.array([3.2, 6.0])
+    solution = maxent_probabilities(features, targets, prior)
+    assert solution.converged
+
+    def dual(multipliers):
+        return logsumexp(np.log(prior) + multipliers @ features) - multipliers @ targets
+
+    reference = minimize(dual, np.zeros(2), method="BFGS", options={"gtol": 1e-10})
+    np.testing.assert_allclose(solution.multipliers, reference.x, rtol=1e-5)
+    np.testing.assert_allclose(features @ solution.probabilities, targets, rtol=1e-9)
+    assert solution.probabilities.sum() == pytest.approx(1.0, abs=1e-12)
+
+
+def test_solution_is_an_exponential_tilt_of_the_prior(scenarios):
+    features, prior = scenarios
+    solution = maxent_probabilities(features, [2.5, 4.0], prior)
+    log_ratio = np.log(solution.probabilities / prior)
+    np.testing.assert_allclose(log_ratio - solution.multipliers @ features, (log_ratio - solution.multipliers @ features)[0], atol=1e-9)
+
+
+def test_warm_start_needs_fewer_iterations(scenarios):
+    features, prior = scenarios
+    previous = maxent_probabilities(features[0], 3.5, prior)
+    cold = maxent_probabilities(features[0], 3.55, prior)
+    warm = maxent_probabilities(features[0], 3.55, prior, initial=previous.multipliers)
+    assert warm.converged and warm.iterations <= 3 and warm.iterations < cold.iterations
+    np.testing.assert_allclose(warm.probabilities, cold.probabilities, rtol=1e-8)
+
+
+def test_many_scenarios_converge_in_a_few_newton_steps():
+    # The dual decrease falls below round-off before the gradient meets
+    # the tolerance; the last steps must still be taken in full.
+    features = np.random.default_rng(0).normal(size=(3, 5_000))
+    targets = np.array([0.1, -0.05, 0.2])
+    solution = maxent_probabilities(features, targets)
+    assert solution.converged and solution.iterations <= 6
+    np.testing.assert_allclose(features @ solution.probabilities, targets, atol=1e-10)
+
+
+def test_rejects_targets_outside_the_scenario_range(scenarios):
+    features, prior = scenarios
+    with pytest.raises(ValueError):
+        maxent_probabilities(features[0], features[0].max(), prior)
@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+
+from climate_finance.montecarlo import _merge_moments, simulate_price
+from climate_finance.sdf import lognormal_sdf_mean
+
+# Physical damages vs abatement, as on page 02.
+SCENARIOS = dict(probabilities=[0.5, 0.5], growth_mean=[-0.02, 0.03], growth_vol=[0.04, 0.02], cashflow_level=[90.0, 90.0])
+
+
+def _closed_form_price(exposure, delta=0.02, gamma=2.0):
+    # E[m CF | s] = level exp(-δ - γμ + γ²σ²/2 - γ b σ²) for the lognormal model.
+    pi, mu, sigma, level = (np.asarray(v) for v in SCENARIOS.values())
+    return pi @ (level * np.exp(-delta - gamma * mu + 0.5 * (gamma * sigma) ** 2 - gamma * exposure * sigma**2))
+
+
+@pytest.mark.parametrize("exposure", [-2.0, 0.0, 2.0])
+def test_price_is_within_four_standard_errors_of_the_closed_form(exposure):
+    mc = simulate_price(**SCENARIOS, cashflow_exposure=exposure, cashflow_vol=0.05, n_draws=400_000, seed=1)
+    assert abs(mc.price - _closed_form_price(exposure)) < 4 * mc.price_se
+    expected_m = 0.5 * lognormal_sdf_mean(np.array(SCENARIOS["growth_mean"]), np.array(SCENARIOS["growth_vol"]), 0.02, 2.0).sum()
+    assert mc.risk_free == pytest.approx(1 / expected_m, rel=1e-12)
+
+
+def test_variance_reduction_cuts_the_standard_error():
+    kwargs = dict(**SCENARIOS, cashflow_exposure=2.0, cashflow_vol=0.05, n_draws=200_000, seed=2)
+    plain = simulate_price(**kwargs, antithetic=False, control_variates=False)
+    reduced = simulate_price(**kwargs)
+    assert reduced.price_se < plain.price_se / 3
+
+
+def test_chunk_size_only_changes_the_draws():
+    kwargs = dict(**SCENARIOS, cashflow_exposure=-2.0, cashflow_vol=0.05, n_draws=300_000)
+    whole = simulate_price(**kwargs, seed=3)
+    chunked = simulate_price(**kwargs, chunk_size=10_000, seed=4)
+    assert chunked.n_draws == whole.n_draws
+    assert abs(chunked.price - whole.price) < 4 * np.hypot(chunked.price_se, whole.price_se)
+
+
+def test_merged_moments_match_the_two_pass_covariance():
+    samples = np.random.default_rng(5).normal(1e6, 1.0, size=(10_000, 4))
+    state = (0, np.zeros(4), np.zeros((4, 4)))
+    for batch in np.array_split(samples, 37):
+        state = _merge_moments(state, batch)
+    n, mean, m2 = state
+    assert n == len(samples)
+    np.testing.assert_allclose(mean, samples.mean(axis=0), rtol=1e-14)
+    np.testing.assert_allclose(m2 / (n - 1), np.cov(samples, rowvar=False), rtol=1e-9, atol=1e-10)
+
+
+def test_seeded_runs_are_cached():
+    first = simulate_price(**SCENARIOS, cashflow_exposure=2.0, n_draws=20_000, seed=0)
+    assert simulate_price(**SCENARIOS, cashflow_exposure=2.0, n_draws=20_000, seed=0) is first
+    assert simulate_price(**SCENARIOS, cashflow_exposure=-2.0, n_draws=20_000, seed=0) != first
+    assert simulate_price(**SCENARIOS, cashflow_exposure=2.0, n_draws=20_000, seed=1) != first
+    assert simulate_price(**SCENARIOS, cashflow_exposure=2.0, n_draws=20_000) is not first
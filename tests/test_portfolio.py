@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+
+from climate_finance.portfolio import value_portfolio
+
+GROUPS = ["Physical Damages", "Abatement"]
+
+
+def test_introduction_discount_rate_example():
+    valuation = value_portfolio([0.9, 0.1], [1 / 1.05, 1 / 1.05], cashflows=np.array([[90.0, 90.0]]),
+                                baseline=[100.0], groups=GROUPS)
+    assert valuation.groups == GROUPS
+    np.testing.assert_allclose(valuation.impacts[0], [0.9 * 10 / 1.05, 0.1 * 10 / 1.05])
+    np.testing.assert_allclose(valuation.prices, [90 / 1.05])
+
+
+def test_introduction_discount_factor_example():
+    valuation = value_portfolio([0.5, 0.5], [1.10, 0.90], cashflows=np.array([[90.0, 90.0]]),
+                                baseline=[100.0], groups=GROUPS)
+    np.testing.assert_allclose(valuation.impacts[0], [5.5, 4.5])
+    np.testing.assert_allclose(valuation.prices, [0.5 * 1.10 * 90 + 0.5 * 0.90 * 90])
+
+
+def test_betas_and_chunks_match_the_dense_computation():
+    rng = np.random.default_rng(0)
+    probabilities = np.array([0.2, 0.3, 0.5])
+    discount_factors = np.array([0.97, 0.95, 0.9])
+    baseline = rng.uniform(50, 150, 1_000)
+    betas = rng.uniform(0.7, 1.2, (1_000, 3))
+    groups = ["a", "b", "a"]
+    valuation = value_portfolio(probabilities, discount_factors, betas=betas, baseline=baseline,
+                                groups=groups, chunk_size=97)
+
+    cashflows = betas * baseline[:, None]
+    weights = probabilities * discount_factors
+    np.testing.assert_allclose(valuation.prices, cashflows @ weights)
+    losses = (baseline[:, None] - cashflows) * weights
+    np.testing.assert_allclose(valuation.impacts, np.column_stack([losses[:, [0, 2]].sum(1), losses[:, 1]]))
+    dense = value_portfolio(probabilities, discount_factors, cashflows=cashflows, baseline=baseline, groups=groups)
+    np.testing.assert_allclose(dense.impacts, valuation.impacts)
+
+
+def test_rejects_ambiguous_inputs():
+    with pytest.raises(ValueError):
+        value_portfolio([1.0], [1.0], cashflows=np.ones((1, 1)), betas=np.ones((1, 1)))
+    with pytest.raises(ValueError):
+        value_portfolio([1.0], [1.0], cashflows=np.ones((1, 1)), groups=["a"])
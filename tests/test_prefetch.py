@@ -0,0 +1,65 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from climate_finance import prefetch
+
+
+@pytest.fixture(autouse=True)
+def futures(monkeypatch):
+    futures = {}
+    monkeypatch.setattr(prefetch, "_FUTURES", futures)
+    return futures
+
+
+def test_concurrent_callers_share_one_future():
+    calls = []
+    release = threading.Event()
+
+    def task():
+        calls.append(1)
+        release.wait(5)
+        return "built"
+
+    with ThreadPoolExecutor(max_workers=8) as callers:
+        futures = list(callers.map(lambda _: prefetch.prefetch("task", task), range(8)))
+    release.set()
+    assert all(future is futures[0] for future in futures)
+    assert futures[0].result(5) == "built"
+    assert calls == [1]
+
+
+def test_only_a_failed_task_is_resubmitted():
+    attempts = []
+
+    def flaky():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise RuntimeError("first attempt fails")
+        return len(attempts)
+
+    failed = prefetch.prefetch("flaky", flaky)
+    with pytest.raises(RuntimeError):
+        failed.result(5)
+    retried = prefetch.prefetch("flaky", flaky)
+    assert retried is not failed and retried.result(5) == 2
+    assert prefetch.prefetch("flaky", flaky) is retried
+    assert len(attempts) == 2
+
+
+def test_warm_up_returns_before_its_tasks_finish():
+    release = threading.Event()
+    started = threading.Event()
+
+    def slow():
+        started.set()
+        release.wait(5)
+
+    try:
+        futures = prefetch.warm_up({"slow": slow})
+        assert started.wait(5)
+        assert not futures["slow"].done()
+    finally:
+        release.set()
+    futures["slow"].result(5)
@@ -0,0 +1,79 @@
+import tracemalloc
+
+from climate_finance.profiling import Profiler
+
+
+def test_overlapping_memory_profilers_each_get_a_snapshot():
+    assert not tracemalloc.is_tracing()
+    first = Profiler(enabled=True, memory=True).start()
+    second = Profiler(enabled=True, memory=True).start()
+    first.finish()
+    assert tracemalloc.is_tracing()
+    second.finish()
+    assert not tracemalloc.is_tracing()
+    assert first.snapshot is not None and second.snapshot is not None
+    assert first.notes == second.notes == []
+
+
+def test_tracing_started_elsewhere_is_left_running():
+    tracemalloc.start()
+    try:
+        profiler = Profiler(enabled=True, memory=True).start()
+        profiler.finish()
+        assert tracemalloc.is_tracing()
+        assert profiler.snapshot is not None
+    finally:
+        tracemalloc.stop()
+
+
+def test_tracing_stopped_elsewhere_is_reported():
+    profiler = Profiler(enabled=True, memory=True).start()
+    tracemalloc.stop()
+    profiler.finish()
+    assert profiler.snapshot is None
+    assert profiler.notes
+
+
+def test_second_cprofile_is_reported():
+    first = Profiler(enabled=True, cprofile=True).start()
+    try:
+        second = Profiler(enabled=True, cprofile=True).start()
+        second.finish()
+    finally:
+        first.finish()
+    assert first.stats is not None and not first.notes
+    assert second.stats is None
+    assert "cProfile" in second.notes[0]
+
+
+def test_finish_is_idempotent():
+    profiler = Profiler(enabled=True, memory=True).start()
+    profiler.finish()
+    profiler.finish()
+    assert not tracemalloc.is_tracing()
+
+
+def _page_that_fails_once():
+    import streamlit as st
+
+    from climate_finance.profiling import page_profiler, show_profile
+
+    profiler = page_profiler()
+    if st.session_state.setdefault("fail", True):
+        st.session_state["fail"] = False
+        raise RuntimeError("rerun stopped before show_profile")
+    show_profile(profiler)
+
+
+def test_next_rerun_finishes_an_interrupted_profiler():
+    from streamlit.testing.v1 import AppTest
+
+    app = AppTest.from_function(_page_that_fails_once)
+    app.query_params["profile"] = "tracemalloc"
+    app.run()
+    assert app.exception
+    assert tracemalloc.is_tracing()
+    app.run()
+    assert not app.exception
+    assert not tracemalloc.is_tracing()
+    assert "running_profiler" not in app.session_state
@@ -0,0 +1,80 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from climate_finance.quadrature import (
+    covariance_factor,
+    gauss_hermite,
+    normal_expectation,
+    quadrature_price,
+    sparse_rule,
+    tensor_rule,
+)
+from climate_finance.sdf import lognormal_sdf_mean
+
+SCENARIOS = dict(probabilities=[0.5, 0.5], growth_mean=[-0.02, 0.03], growth_vol=[0.04, 0.02], cashflow_level=[90.0, 90.0])
+
+
+def _normal_moment(k):
+    # E[z^k] = (k - 1)!! for even k, 0 for odd k.
+    return 0.0 if k % 2 else float(np.prod(np.arange(k - 1, 0, -2)))
+
+
+def _max_moment_error(rule, degree):
+    dims = rule.nodes.shape[1]
+    errors = []
+    for powers in itertools.product(range(degree + 1), repeat=dims):
+        if sum(powers) <= degree:
+            exact = np.prod([_normal_moment(k) for k in powers])
+            estimate = rule.weights @ np.prod(rule.nodes ** np.array(powers), axis=1)
+            errors.append(abs(estimate - exact) / max(1.0, exact))
+    return max(errors)
+
+
+@pytest.mark.parametrize("n, tol", [(1, 1e-15), (5, 1e-12), (10, 1e-7)])
+def test_gauss_hermite_is_exact_to_degree_2n_minus_1(n, tol):
+    # Round-off in the highest moments (E[z^18] = 17!!) grows with n.
+    assert _max_moment_error(gauss_hermite(n), 2 * n - 1) < tol
+
+
+def test_sparse_and_tensor_rules_integrate_polynomials_exactly():
+    assert _max_moment_error(sparse_rule(4, 3), 9) < 1e-10
+    assert _max_moment_error(tensor_rule(5, 2), 9) < 1e-12
+    assert len(sparse_rule(4, 3).weights) < len(tensor_rule(7, 3).weights)
+
+
+@pytest.mark.parametrize("rule", [tensor_rule(8, 3), sparse_rule(5, 3)])
+def test_correlated_lognormal_mean(rule):
+    mean = np.array([0.01, -0.02, 0.03])
+    cov = np.array([[0.04, 0.01, -0.005], [0.01, 0.09, 0.02], [-0.005, 0.02, 0.01]])
+    a = np.array([1.0, -0.5, 2.0])
+    estimate = normal_expectation(lambda x: np.exp(x @ a), mean, covariance_factor(cov), rule)
+    assert estimate == pytest.approx(np.exp(a @ mean + 0.5 * a @ cov @ a), rel=1e-10)
+
+
+def test_covariance_factor_handles_singular_matrices():
+    cov = np.array([[[1.0, 1.0], [1.0, 1.0]], [[0.04, 0.0], [0.0, 0.0]]])
+    factor = covariance_factor(cov)
+    np.testing.assert_allclose(factor @ np.swapaxes(factor, -1, -2), cov, atol=1e-15)
+
+
+@pytest.mark.parametrize("exposure", [-2.0, 0.0, 2.0])
+def test_price_matches_the_lognormal_closed_form(exposure):
+    quad = quadrature_price(**SCENARIOS, cashflow_exposure=exposure, cashflow_vol=0.05)
+    pi, mu, sigma, level = (np.asarray(v) for v in SCENARIOS.values())
+    price = pi @ (level * np.exp(-0.02 - 2.0 * mu + 0.5 * (2.0 * sigma) ** 2 - 2.0 * exposure * sigma**2))
+    assert quad.price == pytest.approx(price, rel=1e-14)
+    assert quad.risk_free == pytest.approx(1 / (pi @ lognormal_sdf_mean(mu, sigma, 0.02, 2.0)), rel=1e-14)
+    assert quad.expected_payoff == pytest.approx(90.0, rel=1e-14)
+
+
+def test_parameter_grids_match_one_call_per_parameter_set():
+    gamma = np.linspace(0.0, 10.0, 7)[:, None]
+    delta = np.array([0.0, 0.02, 0.05])
+    grid = quadrature_price(**SCENARIOS, delta=delta, gamma=gamma, cashflow_exposure=2.0, cashflow_vol=0.05)
+    assert grid.price.shape == (7, 3)
+    for i, j in itertools.product(range(7), range(3)):
+        single = quadrature_price(**SCENARIOS, delta=delta[j], gamma=gamma[i, 0], cashflow_exposure=2.0, cashflow_vol=0.05)
+        for expected, actual in zip(single, grid):
+            assert actual[i, j] == pytest.approx(expected, rel=1e-13)
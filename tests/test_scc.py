@@ -0,0 +1,108 @@
+import os
+import shutil
+import zipfile
+
+import numpy as np
+import pandas as pd
+import polars as pl
+import pytest
+
+from climate_finance import scc, shared
+from climate_finance.scc import REEP_WORKBOOK, build_scc_cache, scan_scc, scc_arrays, scc_version
+
+
+@pytest.fixture
+def workbook(tmp_path):
+    path = tmp_path / REEP_WORKBOOK.name
+    shutil.copy(REEP_WORKBOOK, path)
+    return path
+
+
+@pytest.fixture
+def workbook_reads(monkeypatch):
+    reads = []
+    read_workbook = scc._read_workbook
+
+    def counting(path):
+        reads.append(path)
+        return read_workbook(path)
+
+    monkeypatch.setattr(scc, "_read_workbook", counting)
+    return reads
+
+
+def _edit(workbook):
+    # A zip comment changes the file's bytes and size but not the sheet.
+    with zipfile.ZipFile(workbook, "a") as archive:
+        archive.comment = b"edited"
+
+
+def test_cache_is_built_once_and_reused(workbook, workbook_reads, tmp_path):
+    cache_dir = tmp_path / "cache"
+    path = build_scc_cache(workbook, cache_dir)
+    assert path.parent == cache_dir
+    assert path.name == f"{workbook.stem}-{scc_version(workbook, cache_dir)}.parquet"
+    assert build_scc_cache(workbook, cache_dir) == path
+    assert scan_scc(workbook, cache_dir) is scan_scc(workbook, cache_dir)
+    assert len(workbook_reads) == 1
+    assert sorted(cache_dir.iterdir()) == [path]
+
+
+def test_edited_workbook_gets_a_new_cache_and_the_old_one_is_removed(workbook, workbook_reads, tmp_path):
+    cache_dir = tmp_path / "cache"
+    old_frame = scan_scc(workbook, cache_dir)
+    old_version = scc_version(workbook, cache_dir)
+    _edit(workbook)
+
+    new_frame = scan_scc(workbook, cache_dir)
+    new_version = scc_version(workbook, cache_dir)
+    assert new_frame is not old_frame
+    assert new_version != old_version
+    assert len(workbook_reads) == 2
+    assert [p.name for p in cache_dir.iterdir()] == [f"{workbook.stem}-{new_version}.parquet"]
+    assert new_frame.collect().equals(scan_scc(REEP_WORKBOOK, cache_dir / "reference").collect())
+
+
+def test_touched_workbook_is_rehashed_but_not_rebuilt(workbook, workbook_reads, tmp_path):
+    cache_dir = tmp_path / "cache"
+    old_frame = scan_scc(workbook, cache_dir)
+    stat = workbook.stat()
+    os.utime(workbook, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    assert scan_scc(workbook, cache_dir) is not old_frame
+    assert len(workbook_reads) == 1
+    assert len(list(cache_dir.iterdir())) == 1
+
+
+def test_scan_matches_the_workbook(workbook, tmp_path):
+    pytest.importorskip("openpyxl")  # pandas' xlsx reader
+    expected = pd.read_excel(workbook, sheet_name="Data", header=None, skiprows=3, usecols=list(scc._COLUMNS))
+    expected.columns = list(scc._COLUMNS.values())
+    frame = scan_scc(workbook, tmp_path / "cache").collect()
+
+    assert frame.schema == pl.Schema(scc.SCC_SCHEMA)
+    assert frame["study"].to_list() == expected["study"].ffill().to_list()
+    assert frame["ref"].to_list() == expected["ref"].ffill().to_list()
+    assert frame["peer_reviewed"].to_list() == expected["peer_reviewed"].astype(bool).to_list()
+    for name in ("year", "quality_weight", "weight", "scc", "prtp"):
+        np.testing.assert_array_equal(frame[name].fill_null(np.nan).to_numpy(), expected[name].to_numpy(float))
+
+
+def test_scan_reads_only_the_selected_columns(workbook, tmp_path):
+    plan = scan_scc(workbook, tmp_path / "cache").select("scc").explain()
+    assert f"PROJECT 1/{len(scc.SCC_SCHEMA)} COLUMNS" in plan
+
+
+def test_is_in_filters_with_the_same_printed_form_get_their_own_arrays(workbook, tmp_path, monkeypatch):
+    monkeypatch.setattr(shared, "SHARED_DIR", tmp_path / "shared")
+    cache_dir = tmp_path / "cache"
+    first = pl.col("prtp").is_in([0.0, 1.0, 1.5, 3.0])
+    second = pl.col("prtp").is_in([0.0, 1.0, 2.0, 3.0])
+    assert str(first) == str(second)
+
+    for predicate in (first, second):
+        arrays = scc_arrays(["scc", "prtp"], predicate, workbook, cache_dir)
+        expected = scan_scc(workbook, cache_dir).filter(predicate).select("prtp").collect()["prtp"].to_numpy()
+        np.testing.assert_array_equal(arrays["prtp"], expected)
+    assert 1.5 in scc_arrays(["prtp"], first, workbook, cache_dir)["prtp"]
+    assert 1.5 not in scc_arrays(["prtp"], second, workbook, cache_dir)["prtp"]
@@ -0,0 +1,26 @@
+import numpy as np
+import pytest
+
+from climate_finance.scenarios import GDP_PATHS, SCENARIO_YEARS, interpolate_paths
+
+
+@pytest.mark.parametrize("step", [1.0, 0.1, 2.5, 10.0])
+def test_grid_reaches_the_last_year_when_step_divides_the_span(step):
+    paths = interpolate_paths(SCENARIO_YEARS, GDP_PATHS, step)
+    assert paths.years[0] == 2020
+    assert paths.years[-1] == pytest.approx(2100)
+    np.testing.assert_allclose(np.diff(paths.years), step)
+
+
+@pytest.mark.parametrize("step", [3.0, 7.0, 30.0])
+def test_grid_stops_before_the_last_year_otherwise(step):
+    paths = interpolate_paths(SCENARIO_YEARS, GDP_PATHS, step)
+    assert paths.years[-1] <= 2100 < paths.years[-1] + step
+    np.testing.assert_allclose(np.diff(paths.years), step)
+    for name, values in GDP_PATHS.items():
+        np.testing.assert_allclose(paths.values[paths.scenarios.index(name)], np.interp(paths.years, SCENARIO_YEARS, values))
+
+
+def test_original_dates_are_reproduced():
+    paths = interpolate_paths(SCENARIO_YEARS, GDP_PATHS, 1.0)
+    np.testing.assert_allclose(paths.values[:, ::10], np.array(list(GDP_PATHS.values())))
@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+
+from climate_finance import sensitivity, shared
+from climate_finance.cache import LRUCache
+from climate_finance.pricing import scenario_price, state_price
+from climate_finance.sdf import crra_sdf
+from climate_finance.sensitivity import scenario_price_cube, state_price_cube
+
+GAMMA = np.linspace(0.0, 10.0, 11)
+DELTA = np.linspace(0.0, 0.1, 6)
+PROBABILITY = np.linspace(0.1, 0.9, 5)
+
+
+@pytest.fixture(autouse=True)
+def caches(tmp_path, monkeypatch):
+    monkeypatch.setattr(shared, "SHARED_DIR", tmp_path)
+    monkeypatch.setattr(sensitivity, "SURFACE_CACHE", LRUCache(maxsize=16))
+
+
+def test_state_price_cube_matches_scalar_pricing():
+    cube = state_price_cube(GAMMA, DELTA, PROBABILITY)
+    assert cube.values["price"].shape == (GAMMA.size, DELTA.size, PROBABILITY.size)
+    rng = np.random.default_rng(0)
+    for i, j, k in zip(rng.integers(GAMMA.size, size=20), rng.integers(DELTA.size, size=20),
+                       rng.integers(PROBABILITY.size, size=20)):
+        p = PROBABILITY[k]
+        expected = state_price([p, 1 - p], [crra_sdf(g, DELTA[j], GAMMA[i]) for g in (0.03, -0.02)], [2.0, 1.0])
+        for name in ("price", "risk_free", "risk_premium"):
+            assert cube.values[name][i, j, k] == pytest.approx(getattr(expected, name), rel=1e-12)
+
+
+def test_scenario_price_cube_matches_scalar_pricing():
+    rates = np.linspace(0.0, 0.1, 4)
+    cube = scenario_price_cube(PROBABILITY, rates, rates[::-1])
+    for k, p in enumerate(PROBABILITY):
+        for i, rate_a in enumerate(rates):
+            for j, rate_b in enumerate(rates[::-1]):
+                expected = scenario_price([p, 1 - p], [100.0, 50.0], [rate_a, rate_b]).price
+                assert cube.values["price"][k, i, j] == pytest.approx(expected, rel=1e-12)
+
+
+def test_slice_takes_the_nearest_grid_point_on_each_axis():
+    cube = state_price_cube(GAMMA, DELTA, PROBABILITY)
+    axes, surface = cube.slice("price", "gamma", 3.4)
+    assert list(axes) == ["delta", "probability"]
+    np.testing.assert_array_equal(surface, cube.values["price"][3])
+    _, surface = cube.slice("risk_free", "delta", 0.061)
+    np.testing.assert_array_equal(surface, cube.values["risk_free"][:, 3])
+    axes, surface = cube.slice("price", "probability", 0.47)
+    assert list(axes) == ["gamma", "delta"]
+    np.testing.assert_array_equal(surface, cube.values["price"][:, :, 2])
+
+
+def test_repeat_calls_reuse_the_cached_cube(monkeypatch):
+    calls = []
+
+    def counting(*args):
+        calls.append(1)
+        return state_price(*args)
+
+    monkeypatch.setattr(sensitivity, "state_price", counting)
+    cube = state_price_cube(GAMMA, DELTA, PROBABILITY)
+    assert state_price_cube(GAMMA.copy(), DELTA.copy(), PROBABILITY.copy()) is cube
+    assert len(calls) == 1 and len(sensitivity.SURFACE_CACHE) == 1
+    with pytest.raises(ValueError):
+        cube.values["price"][0, 0, 0] = 0.0
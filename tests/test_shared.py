@@ -0,0 +1,112 @@
+import multiprocessing
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from climate_finance import shared
+from climate_finance.shared import shared_arrays
+
+
+@pytest.fixture
+def builds():
+    calls = []
+
+    def build():
+        calls.append(1)
+        return {"weights": np.linspace(0.0, 1.0, 5), "counts": np.arange(3), "grid": np.ones((2, 3))}
+
+    build.calls = calls
+    return build
+
+
+def test_build_runs_once_across_calls_and_processes(tmp_path, builds):
+    first = shared_arrays("key", builds, tmp_path)
+    assert shared_arrays("key", builds, tmp_path) is first
+    # A second process starts with an empty mapping cache.
+    shared._map.cache_clear()
+    second = shared_arrays("key", builds, tmp_path)
+    assert second is not first
+    assert len(builds.calls) == 1
+    for name, array in builds().items():
+        np.testing.assert_array_equal(second[name], array)
+
+
+def test_arrays_are_read_only_maps_with_names_in_order(tmp_path, builds):
+    arrays = shared_arrays("key", builds, tmp_path)
+    assert list(arrays) == ["weights", "counts", "grid"]
+    for array in arrays.values():
+        assert isinstance(array, np.memmap)
+        with pytest.raises(ValueError):
+            array[0] = 0
+    assert arrays["grid"].shape == (2, 3) and arrays["counts"].dtype == np.arange(3).dtype
+
+
+def test_losing_the_rename_discards_its_copy(tmp_path):
+    def winner():
+        return {"x": np.full(4, 1.0)}
+
+    def loser():
+        # Another process stores the same key while this one builds.
+        shared_arrays("key", winner, tmp_path)
+        return {"x": np.full(4, 2.0)}
+
+    arrays = shared_arrays("key", loser, tmp_path)
+    np.testing.assert_array_equal(arrays["x"], np.full(4, 1.0))
+    assert [path.name for path in tmp_path.iterdir()] == [shared._directory("key", tmp_path, None).name]
+
+
+def test_a_new_scope_version_removes_only_the_other_versions(tmp_path, builds):
+    shared_arrays("a", builds, tmp_path, scope=("scc", "v1"))
+    shared_arrays("b", builds, tmp_path, scope=("scc", "v1"))
+    shared_arrays("a", builds, tmp_path, scope=("hazard", "v1"))
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["hazard@v1", "scc@v1"]
+    assert len(list((tmp_path / "scc@v1").iterdir())) == 2
+
+    shared_arrays("a", builds, tmp_path, scope=("scc", "v2"))
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["hazard@v1", "scc@v2"]
+
+
+def test_empty_arrays_fall_back_to_a_plain_load(tmp_path, monkeypatch):
+    load = np.load
+
+    def no_empty_maps(path, mmap_mode=None, **kwargs):
+        # Older numpy cannot memory-map a zero-size array.
+        if mmap_mode is not None and load(path).size == 0:
+            raise ValueError("cannot mmap an empty array")
+        return load(path, mmap_mode=mmap_mode, **kwargs)
+
+    monkeypatch.setattr(shared.np, "load", no_empty_maps)
+    arrays = shared_arrays("key", lambda: {"empty": np.empty((0, 3)), "full": np.ones(2)}, tmp_path)
+    assert arrays["empty"].shape == (0, 3) and not isinstance(arrays["empty"], np.memmap)
+    assert isinstance(arrays["full"], np.memmap)
+
+
+def _anonymous_rss_kb():
+    for line in Path("/proc/self/status").read_text().splitlines():
+        if line.startswith("RssAnon:"):
+            return int(line.split()[1])
+    return None
+
+
+def _map_and_read(cache_dir):
+    # Runs in a fresh process: map the arrays, touch every page, and report
+    # how much private memory that took.
+    before = _anonymous_rss_kb()
+    arrays = shared_arrays("large", lambda: pytest.fail("arrays were rebuilt"), cache_dir)
+    total = float(arrays["values"].sum())
+    return total, _anonymous_rss_kb() - before
+
+
+@pytest.mark.skipif(not Path("/proc/self/status").exists() or _anonymous_rss_kb() is None,
+                    reason="needs RssAnon from /proc")
+def test_processes_share_the_pages_of_mapped_arrays(tmp_path):
+    values = np.ones(8 << 20)  # 64 MiB
+    shared_arrays("large", lambda: {"values": values}, tmp_path)
+    context = multiprocessing.get_context("spawn")
+    with context.Pool(2) as pool:
+        results = pool.map(_map_and_read, [tmp_path, tmp_path])
+    for total, private_kb in results:
+        assert total == values.size
+        # The pages come from the page cache; a private copy would add 64 MiB.
+        assert private_kb < values.nbytes / 1024 / 8
@@ -0,0 +1,70 @@
+import pickle
+
+import numpy as np
+import pytest
+
+from climate_finance.spatial import EARTH_RADIUS_KM, SpatialIndex, aggregate_to_grid, coarsen_grid
+
+
+def _haversine(lat1, lon1, lat2, lon2):
+    lat1, lon1, lat2, lon2 = map(np.radians, (lat1, lon1, lat2, lon2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(a))
+
+
+@pytest.fixture
+def points():
+    rng = np.random.default_rng(0)
+    return rng.uniform(-90, 90, 2_000), rng.uniform(-180, 180, 2_000)
+
+
+def test_within_radius_matches_brute_force(points):
+    lat, lon = points
+    index = SpatialIndex(lat, lon)
+    hits = index.within_radius([48.85, -33.9], [2.35, 151.2], 1_500.0)
+    for hit, (q_lat, q_lon) in zip(hits, [(48.85, 2.35), (-33.9, 151.2)]):
+        np.testing.assert_array_equal(hit, np.flatnonzero(_haversine(q_lat, q_lon, lat, lon) <= 1_500.0))
+
+
+def test_save_and_load_round_trip(points, tmp_path):
+    lat, lon = points
+    index = SpatialIndex(lat, lon)
+    path = tmp_path / "index.npz"
+    index.save(path)
+    loaded = SpatialIndex.load(path)
+    assert loaded.size == index.size
+    query = ([10.0, -45.0], [20.0, 170.0])
+    for expected, actual in zip(index.nearest(*query, k=5), loaded.nearest(*query, k=5)):
+        np.testing.assert_array_equal(actual, expected)
+
+
+def test_load_rejects_pickles(points, tmp_path):
+    path = tmp_path / "index.npz"
+    with open(path, "wb") as fh:
+        np.savez(fh, points=np.array([object()]), leafsize=16)
+    with pytest.raises(ValueError):
+        SpatialIndex.load(path)
+    path.write_bytes(pickle.dumps(SpatialIndex(*points)))
+    with pytest.raises(ValueError):
+        SpatialIndex.load(path)
+
+
+def test_north_pole_falls_in_the_last_row():
+    lat = np.array([90.0, 89.0, -90.0])
+    lon = np.array([10.0, 10.0, 10.0])
+    cells = aggregate_to_grid(lat, lon, np.array([1.0, 3.0, 5.0]), 10.0)
+    np.testing.assert_array_equal(cells.lat, [-85.0, 85.0])
+    np.testing.assert_array_equal(cells.count, [1, 2])
+    np.testing.assert_array_equal(cells.mean, [5.0, 2.0])
+
+
+def test_coarsen_matches_direct_aggregation():
+    rng = np.random.default_rng(0)
+    lat = np.r_[rng.uniform(-90, 90, 5_000), 90.0]
+    lon = np.r_[rng.uniform(-180, 180, 5_000), 0.0]
+    values = rng.normal(size=lat.size)
+    direct = aggregate_to_grid(lat, lon, values, 20.0)
+    coarse = coarsen_grid(aggregate_to_grid(lat, lon, values, 5.0), 20.0)
+    for name in direct._fields:
+        np.testing.assert_allclose(getattr(coarse, name), getattr(direct, name))
+    assert direct.lat.max() < 90
@@ -0,0 +1,39 @@
+import numpy as np
+import pytest
+
+from climate_finance.scenarios import GDP_PATHS, SCENARIO_YEARS
+from climate_finance.term_structure import expected_discount_factors, term_structure
+
+
+def test_flat_curve_without_damages():
+    # No GDP loss: consumption grows at the trend g, so every rate is δ + γ g.
+    flat = {"Baseline": [0.0] * len(SCENARIO_YEARS)}
+    curves = term_structure(0.01, 3.0, gdp_paths=flat, trend=0.015)
+    np.testing.assert_allclose(curves.zero_rates, 0.01 + 3.0 * 0.015)
+    np.testing.assert_allclose(curves.forward_rates, 0.01 + 3.0 * 0.015)
+    np.testing.assert_allclose(curves.discount_factors, np.exp(-(0.01 + 3.0 * 0.015) * curves.maturities)[None])
+
+
+def test_matches_the_page_formula():
+    # Page 02: P_s(τ) = exp(-δ τ - γ (c_{s,τ} - c_{s,0})) with δ = 0.02, γ = 2.
+    delta, gamma, trend = 0.02, 2.0, 0.02
+    curves = term_structure(delta, gamma)
+    assert curves.scenarios == list(GDP_PATHS)
+    np.testing.assert_array_equal(curves.maturities, np.arange(1.0, 81.0))
+    years = 2020 + curves.maturities
+    for row, losses in enumerate(GDP_PATHS.values()):
+        log_c = trend * curves.maturities + np.log1p(np.interp(years, SCENARIO_YEARS, losses) / 100)
+        expected = np.exp(-delta * curves.maturities - gamma * log_c)
+        np.testing.assert_allclose(curves.discount_factors[row], expected, rtol=1e-12)
+        np.testing.assert_allclose(curves.zero_rates[row], -np.log(expected) / curves.maturities, rtol=1e-12)
+    log_p = np.log(curves.discount_factors)
+    np.testing.assert_allclose(curves.forward_rates[:, 1:], -np.diff(log_p, axis=1), rtol=1e-10)
+
+
+def test_curves_are_cached_and_read_only():
+    curves = term_structure(0.02, 2.0)
+    assert term_structure(0.02, 2.0) is curves
+    with pytest.raises(ValueError):
+        curves.zero_rates[0, 0] = 0.0
+    probabilities = np.full(len(curves.scenarios), 0.25)
+    np.testing.assert_allclose(expected_discount_factors(curves, probabilities), curves.discount_factors.mean(axis=0))
@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+
+from climate_finance.tree import ScenarioTree
+
+DELTA, GAMMA = 0.02, 2.0
+
+
+def _m(growth):
+    return np.exp(-DELTA - GAMMA * growth)
+
+
+@pytest.fixture
+def tree():
+    #            0 (c = 0)
+    #      0.6 /   \ 0.4
+    #   1 (0.1)     2 (-0.1)
+    #  0.5 / \ 0.5    | 1.0
+    # 3 (0.2) 4 (0.0) 5 (-0.15)
+    return ScenarioTree(
+        parent=[-1, 0, 0, 1, 1, 2],
+        probability=[1.0, 0.6, 0.4, 0.5, 0.5, 1.0],
+        consumption=[0.0, 0.1, -0.1, 0.2, 0.0, -0.15],
+        cashflow=[0.0, 1.0, 2.0, 3.0, 4.0, 5.0],
+    )
+
+
+def test_backward_induction_matches_hand_solution(tree):
+    v1 = 0.5 * _m(0.1) * 3.0 + 0.5 * _m(-0.1) * 4.0
+    v2 = 1.0 * _m(-0.05) * 5.0
+    v0 = 0.6 * _m(0.1) * (1.0 + v1) + 0.4 * _m(-0.1) * (2.0 + v2)
+    np.testing.assert_allclose(tree.price(DELTA, GAMMA), [v0, v1, v2, 0.0, 0.0, 0.0], rtol=1e-14)
+
+
+def test_state_prices_agree_with_backward_induction(tree):
+    prices = tree.state_prices(DELTA, GAMMA)
+    np.testing.assert_allclose(prices[3], 0.6 * _m(0.1) * 0.5 * _m(0.1), rtol=1e-14)
+    assert prices @ tree.cashflow == pytest.approx(tree.price(DELTA, GAMMA)[0], rel=1e-14)
+
+
+def test_risk_free_rates(tree):
+    rates = tree.risk_free_rates(DELTA, GAMMA)
+    np.testing.assert_allclose(rates[:3], [
+        1 / (0.6 * _m(0.1) + 0.4 * _m(-0.1)),
+        1 / (0.5 * _m(0.1) + 0.5 * _m(-0.1)),
+        1 / _m(-0.05),
+    ], rtol=1e-14)
+    assert np.isnan(rates[3:]).all()
+
+
+def test_branching_tree_prices_a_unit_payoff_like_a_bond():
+    tree = ScenarioTree.branching([0.5, 0.5], [0.03, -0.01], depth=4)
+    assert tree.size == 31 and tree.depth == 4
+    one_period = 0.5 * _m(0.03) + 0.5 * _m(-0.01)
+    leaves = tree.level(tree.depth)
+    assert tree.state_prices(DELTA, GAMMA)[leaves].sum() == pytest.approx(one_period**4, rel=1e-13)
+
+
+def test_rejects_nodes_out_of_order():
+    with pytest.raises(ValueError):
+        ScenarioTree(parent=[-1, 0, 1, 0], probability=[1.0] * 4, consumption=[0.0] * 4)